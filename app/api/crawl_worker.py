@@ -0,0 +1,199 @@
+# app/api/crawl_worker.py
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Process
+from services.crawl_queue import CrawlQueue
+from services.extraction_pool import get_extraction_pool
+from services.html_archive import get_html_archive
+from services.scrape_pipeline import categorized_extract
+from utils.logging_config import setup_logging
+import argparse
+import logging
+import os
+import socket
+import time
+
+logger = logging.getLogger(__name__)
+
+CRAWL_BATCH_SIZE = int(os.getenv("CRAWL_BATCH_SIZE", "32"))
+CRAWL_FETCH_WORKERS = int(os.getenv("CRAWL_FETCH_WORKERS", "8"))
+CRAWL_POLL_INTERVAL = float(os.getenv("CRAWL_POLL_INTERVAL", "1.0"))
+CRAWL_STATS_INTERVAL = int(os.getenv("CRAWL_STATS_INTERVAL_MINUTES", "5")) * 60
+CRAWL_PURGE_INTERVAL = 3600
+
+
+def process_feed_task(queue, worker_id, scrapers, task):
+    """
+    Polls a feed and queues an article task for each entry. The result records how many
+    entries were new and how long the poll took, for the coordinator's interval estimate.
+    """
+    payload = task["payload"]
+    module, _ = scrapers[task["source"]]
+    started_at = time.time()
+    try:
+        entries = list(module.poll_feed((payload["feed_name"], payload["feed_url"])))
+        new_count = queue.enqueue_articles(task["source"], entries)
+    except Exception as e:
+        logger.exception(f"Polling {payload['feed_name']} ({task['source']}) failed: {e}")
+        queue.fail(worker_id, task["id"], e)
+        return
+    duration = time.time() - started_at
+    queue.complete(worker_id, task["id"], {
+        "entries": len(entries), "new": new_count, "started_at": started_at, "duration": duration,
+    })
+    logger.info(f"Polled {payload['feed_name']} ({task['source']}): {new_count} new of {len(entries)} entries.")
+
+
+def fetch_and_extract(scrapers, fetch_page, task):
+    """
+    Downloads and extracts one article task. Returns (article or None, error or None).
+    """
+    module, _ = scrapers[task["source"]]
+    entry = fetch_page(task["payload"])
+    if entry is None:
+        return None, "Download failed."
+    archive = get_html_archive()
+    if archive is not None:
+        try:
+            archive.put(task["url"], task["source"], entry["html"], entry)
+        except Exception as e:
+            logger.error(f"Failed to archive {task['url']}: {e}")
+    try:
+        return categorized_extract(module.extract_article)(entry), None
+    except Exception as e:
+        logger.error(f"Extraction failed for {task['url']}: {e}")
+        return None, f"Extraction failed: {e}"
+
+
+def process_article_batch(queue, worker_id, scrapers, article_processor, fetch_pool, fetch_page, tasks):
+    """
+    Fetches and extracts a batch of leased article tasks concurrently, then vectorizes and
+    upserts the extracted articles together.
+    """
+    start = time.perf_counter()
+    outcomes = list(fetch_pool.map(lambda task: fetch_and_extract(scrapers, fetch_page, task), tasks))
+
+    # Fetching can take a while under rate limiting; make sure the leases are still ours
+    held = set(queue.renew(worker_id, [task["id"] for task in tasks]))
+    ready = []
+    for task, (article, error) in zip(tasks, outcomes):
+        if task["id"] not in held:
+            logger.warning(f"Lease on {task['url']} expired; leaving it to the worker that holds it now.")
+        elif error:
+            queue.fail(worker_id, task["id"], error)
+        elif article is None:
+            queue.complete(worker_id, task["id"], {"status": "skipped"})
+        else:
+            ready.append((task, article))
+
+    if not ready:
+        return 0
+
+    try:
+        records = article_processor.build_title_records([article for _, article in ready])
+        stored = [(task, record) for (task, _), record in zip(ready, records) if record is not None]
+        if stored:
+            article_processor.upsert_records([record for _, record in stored])
+    except Exception as e:
+        logger.exception("Failed to store crawled articles.")
+        for task, _ in ready:
+            queue.fail(worker_id, task["id"], e)
+        return 0
+
+    stored_ids = {task["id"] for task, _ in stored}
+    archive = get_html_archive()
+    for task, article in ready:
+        status = "stored" if task["id"] in stored_ids else "skipped"
+        queue.complete(worker_id, task["id"], {"status": status})
+        if archive is not None and status == "stored":
+            archive.record_content(task["url"], article["content"])
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Stored {len(stored)} of {len(tasks)} crawled articles in {elapsed:.2f}s "
+                f"({len(tasks) / elapsed:.1f} tasks/s).")
+    return len(stored)
+
+
+def run_worker(batch_size=CRAWL_BATCH_SIZE, fetch_workers=CRAWL_FETCH_WORKERS, poll_interval=CRAWL_POLL_INTERVAL):
+    """
+    Leases feed and article tasks from the shared crawl queue until stopped.
+    Workers are stateless: any number of them, in any container sharing the queue file, can run at once.
+    """
+    # Fork the extraction processes before the model loads and before any thread starts
+    get_extraction_pool()
+    # Imported here so each worker process loads its own model after it starts
+    from api.scrapers.registry import SCRAPERS
+    from services.article_processor import ArticleProcessor
+    from utils.scraper_helpers import fetch_page, rate_limiter
+
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    queue = CrawlQueue()
+    article_processor = ArticleProcessor()
+    fetch_pool = ThreadPoolExecutor(max_workers=fetch_workers)
+    last_purge = last_stats = time.time()
+    logger.info(f"Crawl worker {worker_id} started (batch size {batch_size}, {fetch_workers} fetch threads).")
+
+    while True:
+        try:
+            feed_tasks = queue.lease(worker_id, "feed", batch_size=1)
+            for task in feed_tasks:
+                process_feed_task(queue, worker_id, SCRAPERS, task)
+
+            article_tasks = queue.lease(worker_id, "article", batch_size=batch_size)
+            if article_tasks:
+                process_article_batch(queue, worker_id, SCRAPERS, article_processor, fetch_pool, fetch_page,
+                                      article_tasks)
+        except Exception as e:
+            logger.exception(f"Crawl worker iteration failed: {e}")
+            feed_tasks = article_tasks = []
+
+        now = time.time()
+        if now - last_stats > CRAWL_STATS_INTERVAL:
+            for host, stats in rate_limiter.stats().items():
+                logger.info(f"Crawl stats for {host}: {stats}")
+            last_stats = now
+        if now - last_purge > CRAWL_PURGE_INTERVAL:
+            purged = queue.purge_finished()
+            if purged:
+                logger.info(f"Purged {purged} finished article tasks.")
+            last_purge = now
+
+        if not feed_tasks and not article_tasks:
+            time.sleep(poll_interval)
+
+
+def _worker_main(batch_size, fetch_workers, poll_interval):
+    setup_logging()
+    run_worker(batch_size, fetch_workers, poll_interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run crawl workers that drain the shared crawl queue.")
+    parser.add_argument("--processes", type=int, default=int(os.getenv("CRAWL_WORKER_PROCESSES", "1")),
+                        help="Number of worker processes to start.")
+    parser.add_argument("--batch-size", type=int, default=CRAWL_BATCH_SIZE)
+    parser.add_argument("--fetch-workers", type=int, default=CRAWL_FETCH_WORKERS)
+    parser.add_argument("--poll-interval", type=float, default=CRAWL_POLL_INTERVAL)
+    args = parser.parse_args()
+
+    setup_logging()
+    if args.processes <= 1:
+        run_worker(args.batch_size, args.fetch_workers, args.poll_interval)
+        return
+
+    processes = [
+        # Not daemonic: each worker starts its own extraction process pool
+        Process(target=_worker_main, args=(args.batch_size, args.fetch_workers, args.poll_interval))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"Started {len(processes)} crawl worker processes.")
+    try:
+        for process in processes:
+            process.join()
+    except (KeyboardInterrupt, SystemExit):
+        logger.info("Crawl workers stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# app/api/embedding_server.py
+"""
+Standalone embedding service. Owns the only PhoBERT model, so the backend and the workers no
+longer each load their own copy; they call it through services/embedding_client.py.
+Concurrent requests are gathered into micro-batches (services/micro_batcher.py).
+"""
+from flask import Flask, request, jsonify, abort
+from services.micro_batcher import MicroBatcher
+from services.vectorizer_service import get_vectorizer
+from utils.logging_config import setup_logging
+import base64
+import logging
+import numpy as np
+import os
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_PORT = int(os.getenv("EMBEDDING_PORT", "8000"))
+EMBEDDING_MAX_BATCH_SIZE = int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", "32"))
+EMBEDDING_MAX_WAIT_MS = float(os.getenv("EMBEDDING_MAX_WAIT_MS", "5"))
+# Upper bound on texts in a single request
+EMBEDDING_MAX_REQUEST_TEXTS = int(os.getenv("EMBEDDING_MAX_REQUEST_TEXTS", "1024"))
+
+app = Flask(__name__)
+vectorizer = None
+batcher = None
+
+
+def encode_array(embeddings):
+    """
+    Serializes an embedding matrix as base64 float32, which is far smaller and faster than JSON floats.
+    """
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    return {
+        "shape": list(embeddings.shape),
+        "data": base64.b64encode(embeddings.tobytes()).decode("ascii"),
+    }
+
+
+@app.route('/embed', methods=['POST'])
+def embed():
+    """
+    Encodes {"texts": [...]} and returns {"embeddings": {"shape": [n, dim], "data": <base64 float32>}}.
+    """
+    data = request.get_json(silent=True) or {}
+    texts = data.get("texts")
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        abort(400, description="'texts' must be a list of strings.")
+    if len(texts) > EMBEDDING_MAX_REQUEST_TEXTS:
+        abort(400, description=f"At most {EMBEDDING_MAX_REQUEST_TEXTS} texts per request.")
+    if not texts:
+        return jsonify({"embeddings": encode_array(np.zeros((0, vectorizer.target_dim)))})
+
+    try:
+        embeddings = batcher.encode(texts)
+    except Exception as e:
+        logger.error(f"Embedding request failed: {e}")
+        abort(500, description="Encoding failed.")
+    return jsonify({"embeddings": encode_array(embeddings)})
+
+
+@app.route('/info', methods=['GET'])
+def info():
+    return jsonify({"target_dim": vectorizer.target_dim, "batcher": batcher.stats()})
+
+
+@app.route('/healthz', methods=['GET'])
+def healthz():
+    return jsonify({"status": "ok"})
+
+
+def main():
+    global vectorizer, batcher
+    setup_logging()
+    vectorizer = get_vectorizer()
+    batcher = MicroBatcher(
+        lambda texts: vectorizer.encode_batch(texts, batch_size=EMBEDDING_MAX_BATCH_SIZE),
+        max_batch_size=EMBEDDING_MAX_BATCH_SIZE, max_wait_ms=EMBEDDING_MAX_WAIT_MS,
+    )
+    logger.info(f"Embedding service listening on port {EMBEDDING_PORT} "
+                f"(micro-batches of up to {EMBEDDING_MAX_BATCH_SIZE} texts / {EMBEDDING_MAX_WAIT_MS} ms).")
+    app.run(host="0.0.0.0", port=EMBEDDING_PORT, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
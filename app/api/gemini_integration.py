@@ -4,7 +4,9 @@ import google.generativeai as genai
 from google.api_core import exceptions as google_exceptions
 import logging
 import time
+import hashlib
 from dotenv import load_dotenv
+from utils.cache import TTLCache
 
 # Load environment variables
 load_dotenv()
@@ -25,17 +27,37 @@ except Exception as e:
     logger.exception("Failed to configure Gemini API.")
     raise
 
+# Per-article summaries are reused by /summarize and the digest pipeline
+summary_cache = TTLCache(
+    max_size=int(os.getenv("SUMMARY_CACHE_SIZE", "2048")),
+    ttl=int(os.getenv("SUMMARY_CACHE_TTL", "86400")),
+)
+
+class SummaryError(str):
+    """
+    An error message returned by summarize_article in place of a summary. It is a str, so callers
+    can still show it, but failure is told by its type rather than by its wording.
+    """
+
+
+def is_failed_summary(summary):
+    """
+    Returns True if summarize_article (or get_or_create_summary) failed: the result is a
+    SummaryError or empty.
+    """
+    return isinstance(summary, SummaryError) or not (summary or "").strip()
+
 def summarize_article(article_text, max_retries=3, prompt=None):
     """
     Summarizes an article using the Gemini API.
     :param article_text: The full text of the article to summarize.
     :param max_retries: Number of retries in case of API errors.
     :param prompt: Custom prompt for summarization (optional).
-    :return: Summarized text or an error message.
+    :return: Summarized text, or a SummaryError with the error message.
     """
     if not article_text or len(article_text.strip()) == 0:
         logger.warning("Empty or invalid article text provided.")
-        return "No content to summarize."
+        return SummaryError("No content to summarize.")
 
     if prompt is None:
         # Default prompt for summarization
@@ -68,7 +90,7 @@ def summarize_article(article_text, max_retries=3, prompt=None):
         logger.info("Gemini GenerativeModel initialized successfully.")
     except Exception as e:
         logger.exception("Failed to initialize Gemini GenerativeModel.")
-        return "Failed to initialize Gemini API. Please check your configuration."
+        return SummaryError("Failed to initialize Gemini API. Please check your configuration.")
 
     for attempt in range(max_retries):
         try:
@@ -87,14 +109,38 @@ def summarize_article(article_text, max_retries=3, prompt=None):
             if attempt < max_retries - 1:
                 time.sleep(2 ** attempt)  # Exponential backoff
             else:
-                return f"API error: {str(e)}. Please try again later."
+                return SummaryError(f"API error: {str(e)}. Please try again later.")
 
         except Exception as e:
             logger.exception(f"Unexpected error during summarization (Attempt {attempt + 1}/{max_retries}): {str(e)}")
             if attempt < max_retries - 1:
                 time.sleep(2 ** attempt)
             else:
-                return "Unexpected error during summarization. Please try again later."
+                return SummaryError("Unexpected error during summarization. Please try again later.")
 
     logger.error("Failed to summarize the article after multiple attempts.")
-    return "Failed to summarize the article after multiple attempts."
+    return SummaryError("Failed to summarize the article after multiple attempts.")
+
+def summary_cache_key(article_id, article_text):
+    """
+    Cache key for an article summary. It includes a hash of the content so edited articles are summarized again.
+    """
+    return (article_id, hashlib.sha1((article_text or "").encode("utf-8")).hexdigest())
+
+def get_or_create_summary(article_id, article_text, max_retries=3, max_chars=None):
+    """
+    Returns the cached summary for an article, calling summarize_article on a cache miss.
+    :param max_chars: Optional limit on how much of the article is sent to Gemini.
+    Error messages are returned as-is and never cached.
+    """
+    key = summary_cache_key(article_id, article_text)
+    summary = summary_cache.get(key)
+    if summary is not None:
+        logger.info(f"Summary cache hit for article {article_id}.")
+        return summary
+
+    text = article_text[:max_chars] if max_chars else article_text
+    summary = summarize_article(text, max_retries=max_retries)
+    if not is_failed_summary(summary):
+        summary_cache.set(key, summary)
+    return summary
@@ -0,0 +1,23 @@
+# app/api/health.py
+from flask import Blueprint, jsonify
+from services.warmup import readiness, start_warmup
+
+health = Blueprint("health", __name__)
+
+
+@health.route("/healthz", methods=["GET"])
+def healthz():
+    """
+    Liveness: the process is up and serving requests.
+    """
+    return jsonify({"status": "ok"}), 200
+
+
+@health.route("/readyz", methods=["GET"])
+def readyz():
+    """
+    Readiness: 200 once the model is loaded and the Pinecone index is reachable, 503 until then.
+    """
+    start_warmup()  # No-op if the server already started it
+    ready, details = readiness()
+    return jsonify(dict(details, status="ready" if ready else "starting")), 200 if ready else 503
@@ -0,0 +1,120 @@
+# app/api/ingest_worker.py
+from multiprocessing import Process
+from services.job_queue import JobQueue
+from utils.logging_config import setup_logging
+import argparse
+import logging
+import os
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "64"))
+INGEST_POLL_INTERVAL = float(os.getenv("INGEST_POLL_INTERVAL", "1.0"))
+INGEST_PURGE_INTERVAL = 3600
+
+
+def run_worker(batch_size=INGEST_BATCH_SIZE, poll_interval=INGEST_POLL_INTERVAL):
+    """
+    Drains the ingest queue: leases a batch of jobs, vectorizes and upserts them in one
+    batched pass, and records each job's result.
+    """
+    # Imported here so each worker process loads its own model after it starts
+    from services.article_processor import ArticleProcessor
+
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    queue = JobQueue()
+    article_processor = ArticleProcessor()
+    last_purge = 0.0
+    logger.info(f"Ingest worker {worker_id} started (batch size {batch_size}).")
+
+    while True:
+        try:
+            jobs = queue.lease_batch(worker_id, batch_size=batch_size)
+        except Exception as e:
+            logger.error(f"Failed to lease jobs: {e}")
+            time.sleep(poll_interval)
+            continue
+
+        if not jobs:
+            if time.time() - last_purge > INGEST_PURGE_INTERVAL:
+                purged = queue.purge_finished()
+                if purged:
+                    logger.info(f"Purged {purged} finished jobs.")
+                last_purge = time.time()
+            time.sleep(poll_interval)
+            continue
+
+        start = time.perf_counter()
+        job_ids = [job_id for job_id, _ in jobs]
+        done = threading.Event()
+
+        def keep_leases():
+            # A batch can outlast the lease (e.g. long articles with many passages to embed)
+            while not done.wait(queue.lease_seconds / 3):
+                try:
+                    queue.renew(worker_id, job_ids)
+                except Exception as e:
+                    logger.error(f"Failed to renew ingest leases: {e}")
+
+        renewer = threading.Thread(target=keep_leases, daemon=True)
+        renewer.start()
+        try:
+            results = article_processor.process_and_store_articles([payload for _, payload in jobs])
+        except Exception as e:
+            logger.exception("Failed to process ingest batch.")
+            results = [{"status": "failed", "error": str(e)} for _ in jobs]
+        finally:
+            done.set()
+            renewer.join()
+
+        lost = 0
+        for (job_id, _), result in zip(jobs, results):
+            if result["status"] == "failed":
+                recorded = queue.fail(worker_id, job_id, result["error"])
+            else:
+                recorded = queue.complete(worker_id, job_id, result)
+            lost += not recorded
+        if lost:
+            logger.warning(f"Lost the lease of {lost} ingest jobs before finishing them; another worker owns them now.")
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Processed {len(jobs)} ingest jobs in {elapsed:.2f}s ({len(jobs) / elapsed:.1f} articles/s).")
+
+
+def _worker_main(batch_size, poll_interval):
+    setup_logging()
+    run_worker(batch_size, poll_interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run ingest queue workers.")
+    parser.add_argument("--processes", type=int, default=int(os.getenv("INGEST_WORKER_PROCESSES", "1")),
+                        help="Number of worker processes to start.")
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE)
+    parser.add_argument("--poll-interval", type=float, default=INGEST_POLL_INTERVAL)
+    args = parser.parse_args()
+
+    setup_logging()
+    if args.processes <= 1:
+        run_worker(args.batch_size, args.poll_interval)
+        return
+
+    processes = [
+        Process(target=_worker_main, args=(args.batch_size, args.poll_interval), daemon=True)
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"Started {len(processes)} ingest worker processes.")
+    try:
+        for process in processes:
+            process.join()
+    except (KeyboardInterrupt, SystemExit):
+        logger.info("Ingest workers stopped.")
+
+
+if __name__ == "__main__":
+    main()
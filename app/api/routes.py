@@ -1,13 +1,44 @@
 # app/api/routes.py
-from flask import Blueprint, jsonify, request, abort
+from flask import Blueprint, jsonify, request, abort, url_for
 from marshmallow import Schema, fields, ValidationError
+from werkzeug.exceptions import HTTPException
 from services.vector_db_service import VectorDBService
-from .gemini_integration import summarize_article
+from services.article_processor import ArticleProcessor
+from services.job_queue import JobQueue
+from services.digest_service import get_digest_service
+from services.summary_service import summarize_with_fallback, SUMMARY_MODES
+from services.article_processor import CONTENT_NAMESPACE
+from services.passage_search import group_passages, passage_top_k
+from services.latest_index import LATEST_MAX_LIMIT, get_latest_index
+from services.alerts import get_alert_store
+from services.trending import TRENDING_BASELINE_HOURS, TRENDING_KINDS, TRENDING_MAX_WINDOW_HOURS, get_trending_tracker
+from utils.cache import TTLCache
+from utils.common import parse_iso_datetime
+from .gemini_integration import is_failed_summary
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import json
 import logging
+import os
 
 api = Blueprint("api", __name__)
 logger = logging.getLogger(__name__)
 vector_db = VectorDBService()
+article_processor = ArticleProcessor()
+job_queue = JobQueue()
+
+# Bulk ingestion: valid lines are queued for the ingest workers in batches of this many
+BULK_ENQUEUE_BATCH_SIZE = int(os.getenv("BULK_ENQUEUE_BATCH_SIZE", "500"))
+BULK_MAX_RECORD_BYTES = int(os.getenv("BULK_MAX_RECORD_BYTES", str(1024 * 1024)))
+
+# Retrieval: search results are cached briefly, so repeated and batched queries skip the model and Pinecone
+RETRIEVE_CACHE_TTL = int(os.getenv("RETRIEVE_CACHE_TTL", "60"))
+retrieve_cache = TTLCache(max_size=int(os.getenv("RETRIEVE_CACHE_SIZE", "1024")), ttl=RETRIEVE_CACHE_TTL)
+RETRIEVE_BATCH_MAX_QUERIES = int(os.getenv("RETRIEVE_BATCH_MAX_QUERIES", "20"))
+retrieve_pool = ThreadPoolExecutor(max_workers=int(os.getenv("RETRIEVE_BATCH_WORKERS", "8")))
+
+# Trending topics change with each ingest batch; a short cache absorbs dashboard polling
+trending_cache = TTLCache(max_size=256, ttl=int(os.getenv("TRENDING_CACHE_TTL", "60")))
 
 # Schemas for input validation
 class ArticleSchema(Schema):
@@ -16,6 +47,7 @@ class ArticleSchema(Schema):
     date = fields.Str(required=True)  # Store date as a string in ISO 8601 format
     source_url = fields.Url(required=True)
     source = fields.Str(required=True)
+    category = fields.Str(missing="")
 
 class RetrieveSchema(Schema):
     query = fields.Str(required=True)
@@ -23,12 +55,56 @@ class RetrieveSchema(Schema):
     limit = fields.Int(missing=5, validate=lambda n: n > 0)
     sort_by = fields.Str(missing="score", validate=lambda x: x in ["score", "date"])
     order = fields.Str(missing="desc", validate=lambda x: x in ["asc", "desc"])
+    # "title" matches article titles; "passage" matches content passages and groups them by article
+    mode = fields.Str(missing="title", validate=lambda x: x in ["title", "passage"])
+    # Optional date range; only the monthly partitions that overlap it are searched
+    date_from = fields.DateTime(missing=None)
+    date_to = fields.DateTime(missing=None)
+
+class BatchRetrieveItemSchema(RetrieveSchema):
+    id = fields.Str(missing=None)  # Echoed back, e.g. to match results to dashboard panels
+
+class BatchRetrieveSchema(Schema):
+    queries = fields.List(fields.Nested(BatchRetrieveItemSchema), required=True,
+                          validate=lambda items: 0 < len(items) <= RETRIEVE_BATCH_MAX_QUERIES)
+
+class LatestSchema(Schema):
+    source = fields.List(fields.Str(), missing=list)
+    category = fields.List(fields.Str(), missing=list)
+    date_from = fields.DateTime(missing=None)
+    date_to = fields.DateTime(missing=None)
+    hours = fields.Int(missing=None, validate=lambda n: n > 0)  # Shorthand for date_from = now - hours
+    limit = fields.Int(missing=20, validate=lambda n: 0 < n <= LATEST_MAX_LIMIT)
+    cursor = fields.Str(missing=None)
+
+class AlertSchema(Schema):
+    query = fields.Str(required=True)
+    owner = fields.Str(missing="default")
+    # Cosine similarity a new title needs to match; ALERT_DEFAULT_THRESHOLD when omitted
+    threshold = fields.Float(missing=None, validate=lambda x: -1.0 <= x <= 1.0)
+    keywords = fields.List(fields.Str(), missing=list)  # All must appear in the article
+    source = fields.List(fields.Str(), missing=list)
+    category = fields.List(fields.Str(), missing=list)
+
+class TrendingSchema(Schema):
+    kind = fields.Str(missing="terms", validate=lambda x: x in TRENDING_KINDS)
+    hours = fields.Int(missing=6, validate=lambda n: 0 < n <= TRENDING_MAX_WINDOW_HOURS)
+    baseline_hours = fields.Int(missing=TRENDING_BASELINE_HOURS, validate=lambda n: 0 < n <= TRENDING_BASELINE_HOURS)
+    limit = fields.Int(missing=20, validate=lambda n: 0 < n <= 100)
+
+class DigestSchema(Schema):
+    topic = fields.Str(required=True)
+    date_from = fields.DateTime(missing=None)
+    date_to = fields.DateTime(missing=None)
+    hours = fields.Int(missing=24, validate=lambda n: 0 < n <= 24 * 31)
+    max_articles = fields.Int(missing=20, validate=lambda n: 0 < n <= 100)
 
 
 @api.route("/articles", methods=["POST"])
 def add_article():
     """
-    Adds a new article to Pinecone, vectorizing only the title and storing the content as metadata.
+    Queues a new article for ingestion and returns 202 with a job ID.
+    An ingest worker vectorizes the title and stores it in Pinecone with the content as metadata.
     """
     try:
         data = request.get_json()
@@ -40,41 +116,236 @@ def add_article():
         article_schema = ArticleSchema()
         validated_data = article_schema.load(data)
 
-        # Vectorize the title
-        title_vector = vector_db.vectorizer.encode_text(validated_data["title"])
-        if title_vector is None:
-            logger.error("Failed to vectorize the title.")
-            abort(400, description="Failed to vectorize the title.")
-
-        # Prepare metadata
-        metadata = {
-            "title": validated_data["title"],
-            "content": validated_data["content"],
-            "source_url": validated_data["source_url"],
-            "date": validated_data["date"],
-            "source": validated_data["source"],
-        }
-
-        # Create vector data for the title
-        vector = {
-            "id": f"{validated_data['source_url']}-title",
-            "values": title_vector.tolist(),
-            "metadata": metadata,
-        }
-
-        # Upsert the title vector
-        vector_db.upsert_vectors([vector], namespace="title")
-        logger.info(f"Article '{validated_data['title']}' added successfully.")
-        return jsonify({"message": "Article added successfully"}), 201
+        job_id = job_queue.enqueue(validated_data)
+        logger.info(f"Article '{validated_data['title']}' queued for ingestion as job {job_id}.")
+        response = jsonify({
+            "message": "Article queued for ingestion",
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": url_for("api.get_job", job_id=job_id),
+        })
+        response.headers["Location"] = response.json["status_url"]
+        return response, 202
 
     except ValidationError as ve:
         logger.error(f"Validation error: {ve.messages}")
         abort(400, description=ve.messages)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Failed to queue new article.")
+        abort(500, description="Internal server error.")
+
+
+@api.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """
+    Returns the status of an ingest job.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        logger.error(f"Job not found with ID: {job_id}")
+        abort(404, description="Job not found.")
+    return jsonify(job), 200
+
+
+def bounded_lines(stream, max_bytes):
+    """
+    Yields the lines of a stream, reading at most max_bytes + 1 bytes at a time. A line longer
+    than max_bytes is yielded as None; the rest of it is skipped in bounded reads.
+    """
+    while True:
+        line = stream.readline(max_bytes + 1)
+        if not line:
+            return
+        if len(line) > max_bytes and not line.endswith(b"\n"):
+            while line and not line.endswith(b"\n"):
+                line = stream.readline(max_bytes + 1)
+            yield None
+            continue
+        yield line
+
+
+@api.route("/articles/bulk", methods=["POST"])
+def add_articles_bulk():
+    """
+    Queues many articles from an NDJSON body (one ArticleSchema object per line) for ingestion.
+    The body is streamed line by line; valid records are added to the ingest queue in batches, so
+    the API worker never runs the model. Returns 202 with one result per non-empty line.
+    """
+    try:
+        article_schema = ArticleSchema()
+        results = []
+        batch = []  # (line number, validated article)
+
+        def flush():
+            job_ids = job_queue.enqueue_many([article for _, article in batch])
+            for (line_number, _), job_id in zip(batch, job_ids):
+                results.append({"line": line_number, "job_id": job_id, "status": "queued", "error": None})
+            batch.clear()
+
+        for line_number, raw_line in enumerate(bounded_lines(request.stream, BULK_MAX_RECORD_BYTES), start=1):
+            if raw_line is not None:
+                raw_line = raw_line.strip()
+                if not raw_line:
+                    continue
+            if raw_line is None or len(raw_line) > BULK_MAX_RECORD_BYTES:
+                results.append({"line": line_number, "job_id": None, "status": "invalid", "error": "Record too large."})
+                continue
+            try:
+                batch.append((line_number, article_schema.load(json.loads(raw_line))))
+            except ValidationError as ve:
+                results.append({"line": line_number, "job_id": None, "status": "invalid", "error": ve.messages})
+                continue
+            except ValueError as e:
+                results.append({"line": line_number, "job_id": None, "status": "invalid", "error": f"Invalid JSON: {e}"})
+                continue
+
+            if len(batch) >= BULK_ENQUEUE_BATCH_SIZE:
+                flush()
+
+        if batch:
+            flush()
+
+        if not results:
+            logger.error("No input data provided.")
+            abort(400, description="No input data provided.")
+
+        results.sort(key=lambda result: result["line"])
+        counts = {status: 0 for status in ("queued", "invalid")}
+        for result in results:
+            counts[result["status"]] += 1
+
+        logger.info(f"Bulk ingest queued: {counts}")
+        return jsonify({"received": len(results), **counts, "results": results}), 202
+
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.exception("Failed to add new article.")
+        logger.exception("Failed to bulk add articles.")
         abort(500, description="Internal server error.")
 
 
+def in_date_range(article, date_from, date_to):
+    """
+    True if the article's date lies in [date_from, date_to]; articles without a date only match open ranges.
+    """
+    if date_from is None and date_to is None:
+        return True
+    article_date = parse_iso_datetime(article.get("date"))
+    if article_date is None:
+        return False
+    return ((date_from is None or article_date >= parse_iso_datetime(date_from))
+            and (date_to is None or article_date <= parse_iso_datetime(date_to)))
+
+
+def query_namespace(query, namespace, top_k, date_from=None, date_to=None, query_vector=None):
+    """
+    Queries a namespace with the query text, or with its vector when it was already encoded.
+    """
+    if query_vector is None:
+        return vector_db.query_vectors(query, namespace=namespace, top_k=top_k, date_from=date_from, date_to=date_to)
+    return vector_db.query_vector(query_vector, namespace=namespace, top_k=top_k, date_from=date_from, date_to=date_to)
+
+
+def retrieve_by_title(query, top_k, date_from=None, date_to=None, query_vector=None):
+    """
+    Matches the query against title vectors. Returns article dicts in relevance order.
+    """
+    results = query_namespace(query, "title", top_k, date_from, date_to, query_vector)
+    return [
+        {
+            "id": result["id"],
+            "title": result["metadata"].get("title", "Untitled"),
+            "content": result["metadata"].get("content", ""),
+            "source_url": result["metadata"].get("source_url", ""),
+            "date": result["metadata"].get("date", ""),
+            "source": result["metadata"].get("source", "Unknown"),
+            "relevance_score": result["score"],
+        }
+        for result in results
+    ]
+
+
+def retrieve_by_passage(query, articles_wanted, date_from=None, date_to=None, query_vector=None):
+    """
+    Matches the query against content passages and groups the hits by article. Each article is
+    scored by its best passage and carries its best passages. The full content is left empty;
+    attach_title_content fills it in for the page that is returned.
+    """
+    matches = query_namespace(query, CONTENT_NAMESPACE, passage_top_k(articles_wanted), date_from, date_to, query_vector)
+    articles = []
+    for hit in group_passages(matches):
+        metadata = hit["metadata"]
+        articles.append({
+            "id": hit["article_id"],
+            "title": metadata.get("title", "Untitled"),
+            "content": "",
+            "source_url": metadata.get("source_url", ""),
+            "date": metadata.get("date", ""),
+            "source": metadata.get("source", "Unknown"),
+            "relevance_score": hit["score"],
+            "passages": hit["passages"],
+        })
+    return articles
+
+
+def attach_title_content(articles):
+    """
+    Fills in the full content of articles from their title records, in one fetch.
+    """
+    title_metadata = vector_db.fetch_metadata([article["id"] for article in articles], namespace="title")
+    for article in articles:
+        article["content"] = title_metadata.get(article["id"], {}).get("content", "")
+    return articles
+
+
+def search_key(spec):
+    """
+    Cache key of the vector search behind a validated retrieve request (everything but sorting and paging).
+    """
+    wanted = spec["page"] * spec["limit"] if spec["mode"] == "passage" else spec["limit"] * 2
+    date_from, date_to = spec["date_from"], spec["date_to"]
+    return (spec["mode"], spec["query"], wanted,
+            date_from.isoformat() if date_from else None, date_to.isoformat() if date_to else None)
+
+
+def search_articles(spec, query_vector=None):
+    """
+    Runs the vector search for a validated retrieve request and filters it by date.
+    Results are cached for RETRIEVE_CACHE_TTL seconds; callers get their own copies.
+    """
+    key = search_key(spec)
+    articles = retrieve_cache.get(key) if RETRIEVE_CACHE_TTL > 0 else None
+    if articles is None:
+        mode, query, wanted, _, _ = key
+        date_from, date_to = spec["date_from"], spec["date_to"]
+        if mode == "passage":
+            articles = retrieve_by_passage(query, wanted, date_from, date_to, query_vector)
+        else:
+            articles = retrieve_by_title(query, wanted, date_from, date_to, query_vector)
+        articles = [article for article in articles if in_date_range(article, date_from, date_to)]
+        if RETRIEVE_CACHE_TTL > 0:
+            retrieve_cache.set(key, articles)
+    return [dict(article) for article in articles]
+
+
+def page_of(articles, spec):
+    """
+    Sorts the articles and returns the requested page (with full content in passage mode).
+    """
+    if spec["sort_by"] == "date":
+        articles.sort(key=lambda x: x["date"], reverse=(spec["order"] == "desc"))
+    elif spec["sort_by"] == "score":
+        articles.sort(key=lambda x: x["relevance_score"], reverse=(spec["order"] == "desc"))
+
+    start_index = (spec["page"] - 1) * spec["limit"]
+    paginated_articles = articles[start_index: start_index + spec["limit"]]
+    if spec["mode"] == "passage" and paginated_articles:
+        attach_title_content(paginated_articles)
+    return paginated_articles
+
+
 @api.route("/retrieve", methods=["POST"])
 def retrieve():
     """
@@ -90,58 +361,225 @@ def retrieve():
         retrieve_schema = RetrieveSchema()
         validated_data = retrieve_schema.load(data)
 
-        query = validated_data["query"].strip()
+        query = validated_data["query"] = validated_data["query"].strip()
         if not query:
             logger.error("Empty query provided.")
             abort(400, description="Query cannot be empty.")
 
-        page = validated_data["page"]
-        limit = validated_data["limit"]
-        sort_by = validated_data["sort_by"]
-        order = validated_data["order"]
-
-        # Query only the title vectors
-        results = vector_db.query_vectors(query, namespace="title", top_k=limit * 2)
-
-        if not results:
+        articles = search_articles(validated_data)
+        if not articles:
             logger.info(f"No results found for query '{query}'.")
             return jsonify([]), 200
 
-        # Prepare articles with metadata
-        articles = [
-            {
-                "id": result["id"],
-                "title": result["metadata"].get("title", "Untitled"),
-                "content": result["metadata"].get("content", ""),
-                "source_url": result["metadata"].get("source_url", ""),
-                "date": result["metadata"].get("date", ""),
-                "source": result["metadata"].get("source", "Unknown"),
-                "relevance_score": result["score"],
-            }
-            for result in results
-        ]
-
-        # Sort articles
-        if sort_by == "date":
-            articles.sort(key=lambda x: x["date"], reverse=(order == "desc"))
-        elif sort_by == "score":
-            articles.sort(key=lambda x: x["relevance_score"], reverse=(order == "desc"))
-
-        # Pagination
-        start_index = (page - 1) * limit
-        paginated_articles = articles[start_index: start_index + limit]
-
+        paginated_articles = page_of(articles, validated_data)
         logger.info(f"Retrieved {len(paginated_articles)} articles for query '{query}'.")
         return jsonify(paginated_articles), 200
 
     except ValidationError as ve:
         logger.error(f"Validation error: {ve.messages}")
         abort(400, description=ve.messages)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("An error occurred during article retrieval.")
         abort(500, description="Internal server error.")
 
 
+@api.route("/retrieve/batch", methods=["POST"])
+def retrieve_batch():
+    """
+    Runs many retrieve requests in one call. Queries that are not cached are embedded in one
+    batched forward pass, and the vector searches run concurrently. Results are returned in
+    request order; a query that fails gets an error entry instead of failing the whole batch.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            logger.error("No input data provided.")
+            abort(400, description="No input data provided.")
+
+        specs = BatchRetrieveSchema().load(data)["queries"]
+        for spec in specs:
+            spec["query"] = spec["query"].strip()
+            if not spec["query"]:
+                logger.error("Empty query provided in batch.")
+                abort(400, description="Query cannot be empty.")
+
+        # One search per distinct key; one forward pass for every query text that is not cached
+        unique = {}
+        for spec in specs:
+            unique.setdefault(search_key(spec), spec)
+        uncached = sorted({
+            key[1] for key in unique if RETRIEVE_CACHE_TTL <= 0 or retrieve_cache.get(key) is None
+        })
+        query_vectors = dict(zip(uncached, vector_db.encode_queries(uncached))) if uncached else {}
+
+        def search(spec):
+            try:
+                return search_articles(spec, query_vectors.get(spec["query"]))
+            except Exception:
+                logger.exception(f"Batch retrieval failed for query '{spec['query']}'.")
+                return None
+
+        searched = dict(zip(unique, retrieve_pool.map(search, unique.values())))
+
+        def result(spec):
+            articles = searched[search_key(spec)]
+            entry = {"id": spec["id"], "query": spec["query"]}
+            if articles is None:
+                return dict(entry, error="Retrieval failed.")
+            try:
+                # Specs sharing a search each page their own copy
+                return dict(entry, results=page_of([dict(article) for article in articles], spec))
+            except Exception:
+                logger.exception(f"Batch retrieval failed for query '{spec['query']}'.")
+                return dict(entry, error="Retrieval failed.")
+
+        results = list(retrieve_pool.map(result, specs))
+        logger.info(f"Batch retrieved {len(specs)} queries ({len(unique)} searches, {len(uncached)} embedded).")
+        return jsonify({"results": results}), 200
+
+    except ValidationError as ve:
+        logger.error(f"Validation error: {ve.messages}")
+        abort(400, description=ve.messages)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("An error occurred during batch retrieval.")
+        abort(500, description="Internal server error.")
+
+
+@api.route("/latest", methods=["GET"])
+def latest():
+    """
+    Lists the newest stored articles, optionally filtered by source, category and time window,
+    from the local latest-articles index (no model pass, no Pinecone call). Pages are chained
+    with the returned next_cursor.
+    """
+    try:
+        args = {key: value for key, value in request.args.items() if key not in ("source", "category")}
+        args["source"] = request.args.getlist("source")
+        args["category"] = request.args.getlist("category")
+        validated_data = LatestSchema().load(args)
+
+        date_from = validated_data["date_from"]
+        if validated_data["hours"]:
+            date_from = datetime.now(timezone.utc) - timedelta(hours=validated_data["hours"])
+        articles, next_cursor = get_latest_index().latest(
+            source=validated_data["source"],
+            category=validated_data["category"],
+            date_from=date_from,
+            date_to=validated_data["date_to"],
+            limit=validated_data["limit"],
+            cursor=validated_data["cursor"],
+        )
+        return jsonify({"articles": articles, "next_cursor": next_cursor}), 200
+
+    except ValidationError as ve:
+        logger.error(f"Validation error: {ve.messages}")
+        abort(400, description=ve.messages)
+    except ValueError as e:
+        logger.error(f"Invalid latest request: {e}")
+        abort(400, description=str(e))
+    except Exception as e:
+        logger.exception("An error occurred while listing the latest articles.")
+        abort(500, description="Internal server error.")
+
+
+@api.route("/alerts", methods=["POST"])
+def create_alert():
+    """
+    Saves a query to be matched against every newly ingested article. The query is embedded once, here.
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            logger.error("No input data provided.")
+            abort(400, description="No input data provided.")
+
+        validated_data = AlertSchema().load(data)
+        query = validated_data["query"].strip()
+        if not query:
+            logger.error("Empty query provided.")
+            abort(400, description="Query cannot be empty.")
+
+        saved_query = get_alert_store().add(
+            validated_data["owner"], query, vector_db.encode_queries([query])[0],
+            threshold=validated_data["threshold"], keywords=validated_data["keywords"],
+            sources=validated_data["source"], categories=validated_data["category"],
+        )
+        logger.info(f"Saved alert query {saved_query['id']} for '{validated_data['owner']}': '{query}'.")
+        return jsonify(saved_query), 201
+
+    except ValidationError as ve:
+        logger.error(f"Validation error: {ve.messages}")
+        abort(400, description=ve.messages)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Failed to save the alert query.")
+        abort(500, description="Internal server error.")
+
+
+@api.route("/alerts", methods=["GET"])
+def list_alerts():
+    """
+    Lists saved alert queries, optionally for one owner.
+    """
+    return jsonify(get_alert_store().list(owner=request.args.get("owner"))), 200
+
+
+@api.route("/alerts/<int:query_id>", methods=["DELETE"])
+def delete_alert(query_id):
+    if not get_alert_store().delete(query_id):
+        logger.error(f"Alert query not found with ID: {query_id}")
+        abort(404, description="Alert query not found.")
+    return jsonify({"message": f"Alert query {query_id} deleted."}), 200
+
+
+@api.route("/alerts/notifications", methods=["GET"])
+def alert_notifications():
+    """
+    Reads the notification outbox: matches with an ID above ?after=, oldest first.
+    """
+    try:
+        after = int(request.args.get("after", 0))
+        limit = min(max(int(request.args.get("limit", 100)), 1), 1000)
+    except ValueError:
+        abort(400, description="'after' and 'limit' must be integers.")
+    notifications = get_alert_store().notifications(owner=request.args.get("owner"), after=after, limit=limit)
+    next_after = notifications[-1]["id"] if notifications else after
+    return jsonify({"notifications": notifications, "next_after": next_after}), 200
+
+
+@api.route("/trending", methods=["GET"])
+def trending():
+    """
+    Lists the terms or entities surging in the last hours compared with the baseline before,
+    from the streaming sketches ingestion keeps (services/trending.py).
+    """
+    try:
+        validated_data = TrendingSchema().load(request.args.to_dict())
+        key = tuple(sorted(validated_data.items()))
+        result = trending_cache.get(key)
+        if result is None:
+            result = get_trending_tracker().trending(
+                kind=validated_data["kind"],
+                window_hours=validated_data["hours"],
+                baseline_hours=validated_data["baseline_hours"],
+                limit=validated_data["limit"],
+            )
+            trending_cache.set(key, result)
+        return jsonify(result), 200
+
+    except ValidationError as ve:
+        logger.error(f"Validation error: {ve.messages}")
+        abort(400, description=ve.messages)
+    except Exception as e:
+        logger.exception("An error occurred while computing trending topics.")
+        abort(500, description="Internal server error.")
+
+
 @api.route("/clear", methods=["DELETE"])
 def clear_database():
     """
@@ -164,7 +602,8 @@ def clear_database():
 @api.route("/summarize", methods=["POST"])
 def summarize():
     """
-    Summarizes an article using the Gemini API.
+    Summarizes an article using the Gemini API, falling back to the local extractive
+    summarizer when Gemini fails or misses the latency SLO.
     """
     try:
         data = request.get_json()
@@ -179,6 +618,11 @@ def summarize():
             logger.error("No article ID provided in the request.")
             abort(400, description="No article ID provided.")
 
+        mode = data.get("mode", "auto")
+        if mode not in SUMMARY_MODES:
+            logger.error(f"Invalid summarization mode: {mode}")
+            abort(400, description=f"Mode must be one of {list(SUMMARY_MODES)}.")
+
         # Fetch metadata for the article by its ID
         logger.debug(f"Querying vector DB for article ID: {article_id}")
         results = vector_db.query_by_id(article_id, namespace="title")
@@ -194,14 +638,55 @@ def summarize():
 
         # Summarize the article
         logger.info(f"Summarizing article with ID: {article_id}...")
-        summary = summarize_article(article_content)
+        summary, engine = summarize_with_fallback(article_id, article_content, mode=mode)
 
-        if "error" in summary.lower():
+        # Gemini reports errors as SummaryError; the local extractive summary only fails by being empty
+        failed = is_failed_summary(summary) if engine == "gemini" else not (summary or "").strip()
+        if failed:
             logger.error(f"Failed to summarize article with ID: {article_id}. Response: {summary}")
-            return jsonify({"error": summary}), 500
+            return jsonify({"error": summary or "Could not summarize the article."}), 500
 
-        logger.info(f"Generated summary for article ID {article_id}: {summary}")
-        return jsonify({"summary": summary}), 200
+        logger.info(f"Generated {engine} summary for article ID {article_id}: {summary}")
+        return jsonify({"summary": summary, "engine": engine}), 200
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception("An error occurred during summarization.")
         abort(500, description="Internal server error.")
+
+
+@api.route("/digest", methods=["POST"])
+def digest():
+    """
+    Builds a multi-article digest for a topic and time window (map-reduce summarization).
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            logger.error("No input data provided.")
+            abort(400, description="No input data provided.")
+
+        validated_data = DigestSchema().load(data)
+        topic = validated_data["topic"].strip()
+        if not topic:
+            logger.error("Empty topic provided.")
+            abort(400, description="Topic cannot be empty.")
+
+        result = get_digest_service().build_digest(
+            topic,
+            date_from=validated_data["date_from"],
+            date_to=validated_data["date_to"],
+            hours=validated_data["hours"],
+            max_articles=validated_data["max_articles"],
+        )
+        logger.info(f"Built digest for topic '{topic}' from {len(result['articles'])} articles.")
+        return jsonify(result), 200
+
+    except ValidationError as ve:
+        logger.error(f"Validation error: {ve.messages}")
+        abort(400, description=ve.messages)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("An error occurred while building the digest.")
+        abort(500, description="Internal server error.")
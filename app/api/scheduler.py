@@ -1,29 +1,122 @@
 # app/api/scheduler.py
-from api.scrapers.vnexpress_scraper import scrape_vnexpress
-from api.scrapers.vietnamnet_rss_scraper import scrape_vietnamnet_rss
-from api.scrapers.tuoitre_scraper import scrape_tuoitre
-from api.scrapers.thanhnien_rss_scraper import scrape_thanhnien_rss
-from api.scrapers.dantri_rss_scraper import scrape_dantri_rss
+"""
+Crawl coordinator. Decides when each feed is polled and puts a poll task into the shared crawl
+queue; the crawl workers (api/crawl_worker.py) do the polling, fetching, extraction and storage.
+"""
+from api.scrapers.registry import iter_feeds
+from services.crawl_queue import CrawlQueue
+from services.feed_state import FeedStateStore, FEED_MIN_INTERVAL
+from services.partitions import TIME_PARTITIONS_ENABLED, TIME_PARTITION_RETENTION_MONTHS
 
 from apscheduler.schedulers.blocking import BlockingScheduler
+from datetime import datetime, timedelta
 import logging
+import os
+import random
+import time
 
 logger = logging.getLogger(__name__)
 
+# Random +/- fraction applied to every interval so polls of different feeds spread out
+FEED_JITTER = float(os.getenv("FEED_JITTER", "0.1"))
+# How soon to check again when a feed's previous poll has not finished yet
+FEED_BUSY_RECHECK_SECONDS = 30
+CRAWL_STATS_INTERVAL_MINUTES = int(os.getenv("CRAWL_STATS_INTERVAL_MINUTES", "5"))
+PARTITION_RETENTION_INTERVAL_HOURS = int(os.getenv("PARTITION_RETENTION_INTERVAL_HOURS", "24"))
+
+feed_states = FeedStateStore()
+crawl_queue = CrawlQueue()
+
+
+def dispatch_feed(scheduler, source, feed_name, feed_url):
+    """
+    Learns from a feed's last finished poll and queues the next one.
+    A poll is only queued once the previous one has finished, so polls of a feed never overlap.
+    """
+    feed_id = f"{source}:{feed_name}"
+    state = feed_states.get(feed_id)
+
+    task = crawl_queue.get_feed_task(feed_url)
+    if task is not None and task["status"] in ("queued", "processing"):
+        logger.info(f"Previous poll of {feed_id} has not finished; checking again later.")
+        schedule_feed(scheduler, source, feed_name, feed_url, FEED_BUSY_RECHECK_SECONDS)
+        return
+
+    result = task["result"] if task else None
+    if result and result.get("started_at") != state.last_poll:
+        state.record_run(result["new"], result["started_at"], result["duration"])
+        try:
+            feed_states.save()
+        except Exception as e:
+            logger.error(f"Failed to save feed state: {e}")
+        rate = f"{state.rate * 3600:.1f}/h" if state.rate is not None else "unknown"
+        logger.info(
+            f"{feed_id}: {result['new']} new articles in the last poll ({result['duration']:.1f}s), "
+            f"publish rate {rate}, next poll in {state.interval / 60:.1f} min."
+        )
+
+    try:
+        crawl_queue.enqueue_feed(source, feed_name, feed_url)
+    except Exception as e:
+        logger.error(f"Failed to queue a poll of {feed_id}: {e}")
+    schedule_feed(scheduler, source, feed_name, feed_url, state.interval)
+
+
+def schedule_feed(scheduler, source, feed_name, feed_url, delay):
+    """
+    Schedules the next dispatch of a feed after `delay` seconds, with jitter.
+    """
+    jittered = delay * random.uniform(1 - FEED_JITTER, 1 + FEED_JITTER)
+    scheduler.add_job(
+        dispatch_feed, 'date',
+        run_date=datetime.now() + timedelta(seconds=jittered),
+        args=[scheduler, source, feed_name, feed_url],
+        id=f"{source}:{feed_name}", replace_existing=True,
+        max_instances=1, misfire_grace_time=None, coalesce=True,
+    )
+
+
+def log_queue_stats():
+    logger.info(f"Crawl queue: {crawl_queue.counts()}")
+
+
+def apply_partition_retention():
+    """
+    Expires monthly partitions older than TIME_PARTITION_RETENTION_MONTHS.
+    """
+    # Imported here so the coordinator only loads the vector DB client when retention is on
+    from services.partitions import apply_retention
+    from services.vector_db_service import VectorDBService
+    try:
+        expired = apply_retention(VectorDBService())
+        logger.info(f"Partition retention expired {len(expired)} partitions.")
+    except Exception as e:
+        logger.error(f"Partition retention failed: {e}")
+
+
 def schedule_jobs():
     scheduler = BlockingScheduler()
 
-    scheduler.add_job(scrape_vnexpress, 'interval', minutes=5, id="vnexpress_scraper")
-    scheduler.add_job(scrape_vietnamnet_rss, 'interval', minutes=5, id="vietnamnet_scraper")
-    scheduler.add_job(scrape_tuoitre, 'interval', minutes=5, id="tuoitre_scraper")
-    scheduler.add_job(scrape_thanhnien_rss, 'interval', minutes=5, id="thanhnien_scraper")
-    scheduler.add_job(scrape_dantri_rss, 'interval', minutes=5, id="dantri_scraper")
+    feed_count = 0
+    for source, feed_name, feed_url in iter_feeds():
+        state = feed_states.get(f"{source}:{feed_name}")
+        # Spread the first polls over the minimum interval, or resume the learned schedule
+        if state.last_poll is None:
+            delay = random.uniform(0, FEED_MIN_INTERVAL)
+        else:
+            delay = max(0.0, state.last_poll + state.interval - time.time())
+        schedule_feed(scheduler, source, feed_name, feed_url, delay)
+        feed_count += 1
 
-    logger.info("Scheduled jobs started.")
+    logger.info(f"Scheduled adaptive polling for {feed_count} feeds.")
+    scheduler.add_job(log_queue_stats, 'interval', minutes=CRAWL_STATS_INTERVAL_MINUTES, id="queue_stats")
+    if TIME_PARTITIONS_ENABLED and TIME_PARTITION_RETENTION_MONTHS > 0:
+        scheduler.add_job(apply_partition_retention, 'interval', hours=PARTITION_RETENTION_INTERVAL_HOURS,
+                          id="partition_retention", next_run_time=datetime.now())
     try:
         scheduler.start()
     except (KeyboardInterrupt, SystemExit):
         logger.info("Scheduler stopped.")
 
 if __name__ == "__main__":
-    schedule_jobs()
\ No newline at end of file
+    schedule_jobs()
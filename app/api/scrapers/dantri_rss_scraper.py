@@ -1,12 +1,12 @@
 # app/api/scrapers/dantri_rss_scraper.py
-import feedparser
 import logging
 from datetime import datetime
 from services.article_processor import ArticleProcessor
+from services.scrape_pipeline import run_scrape_pipeline
 from models.article_model import Article
-from utils.scraper_helpers import clean_html, fetch_article_content_and_date
-from bs4 import BeautifulSoup
-import requests
+from utils.scraper_helpers import clean_html, fetch_page, fetch_feed
+from services.extraction_pool import extract_in_pool
+from utils.extraction import SOURCES
 
 logger = logging.getLogger(__name__)
 
@@ -48,10 +48,7 @@ RSS_FEEDS = {
 
 
 # CSS Selectors for Dân Trí Content
-CONTENT_SELECTORS = [
-    "div.singular-content",  # Primary
-    "div.e-magazine__body"   # Secondary fallback
-]
+CONTENT_SELECTORS = SOURCES["dantri.com.vn"]["content_selectors"]  # Primary, then secondary fallback
 
 def parse_vietnamese_date(date_string):
     """
@@ -73,83 +70,58 @@ def parse_vietnamese_date(date_string):
     return datetime.now()
 
 
-
-
-def fetch_full_article_content(url):
+def poll_feed(feed):
     """
-    Fetch the full article content by trying multiple selectors.
+    Polls one RSS feed and yields its entries with the parsed publication date.
     """
+    feed_name, feed_url = feed
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
+        parsed_feed = fetch_feed(feed_url)
+    except Exception as e:
+        logger.exception(f"Failed to fetch articles from RSS feed {feed_name}: {e}")
+        return
 
-        # Try each content selector
-        for selector in CONTENT_SELECTORS:
-            content_element = soup.select_one(selector)
-            if content_element:
-                return clean_html(content_element.get_text())
+    if not parsed_feed.entries:
+        logger.warning(f"No articles found in {feed_name} feed.")
 
-        logger.warning(f"No content found for {url} using selectors {CONTENT_SELECTORS}")
-        return None
-    except Exception as e:
-        logger.error(f"Failed to fetch content from {url}: {e}")
-        return None
+    for entry in parsed_feed.entries:
+        published_date = entry.get("published", None)
+        yield {
+            "feed_name": feed_name,
+            "title": clean_html(entry.title),
+            "link": entry.link,
+            # Parse publication date
+            "date": parse_vietnamese_date(published_date) if published_date else datetime.now(),
+        }
 
-def fetch_rss_articles(feed_name, feed_url):
+def extract_article(entry):
     """
-    Fetch articles from an RSS feed and process them for full content and date parsing.
+    Extract the full article content from a fetched page by trying multiple selectors.
     """
-    try:
-        feed = feedparser.parse(feed_url)
-        articles = []
-
-        for entry in feed.entries:
-            title = clean_html(entry.title)
-            link = entry.link
-            published_date = entry.get("published", None)
+    full_content = extract_in_pool("dantri.com.vn", entry["html"], entry["link"])["content"]
+    if not full_content:
+        logger.warning(f"No content found for {entry['link']} using selectors {CONTENT_SELECTORS}")
+        return None
 
-            # Parse publication date
-            date_obj = parse_vietnamese_date(published_date) if published_date else datetime.now()
-
-            # Fetch content and date from the article page
-            full_content = fetch_full_article_content(link)
-
-            if full_content:
-                article = Article(
-                    title=title,
-                    content=full_content,
-                    source_url=link,
-                    date=date_obj,
-                    source=f"Dân Trí"
-                )
-                articles.append(article.to_dict())
-
-        return articles
-    except Exception as e:
-        logger.exception(f"Failed to fetch articles from RSS feed {feed_name}: {e}")
-        return []
+    article = Article(
+        title=entry["title"],
+        content=full_content,
+        source_url=entry["link"],
+        date=entry["date"],
+        source=f"Dân Trí"
+    )
+    return article.to_dict()
 
 def scrape_dantri_rss():
     """
     Scrape Dân Trí articles using RSS feeds and store them in the vector database.
+    Feeds go through a streaming pipeline (poll -> fetch -> extract -> embed -> upsert).
     """
     logger.info("Starting Dân Trí RSS scraper...")
-    total_articles = 0
-
-    for feed_name, feed_url in RSS_FEEDS.items():
-        articles = fetch_rss_articles(feed_name, feed_url)
-
-        if articles:
-            for article in articles:
-                try:
-                    article_processor.process_and_store_article(article)
-                    logger.info(f"Processed and stored article '{article['title']}' in vector DB.")
-                except Exception as e:
-                    logger.error(f"Failed to process article '{article['title']}': {e}")
-            total_articles += len(articles)
-        else:
-            logger.warning(f"No articles found in {feed_name} feed.")
+    stats = run_scrape_pipeline(
+        "dantri", RSS_FEEDS.items(), poll_feed, extract_article, article_processor, fetch_page
+    )
+    total_articles = stats["upsert"]["processed"]
 
     if total_articles:
         logger.info(f"Total {total_articles} articles processed and stored from Dân Trí feeds.")
@@ -0,0 +1,25 @@
+# app/api/scrapers/registry.py
+from api.scrapers import vnexpress_scraper
+from api.scrapers import vietnamnet_rss_scraper
+from api.scrapers import tuoitre_scraper
+from api.scrapers import thanhnien_rss_scraper
+from api.scrapers import dantri_rss_scraper
+
+# Scraper modules and the feeds each one polls.
+# Every module provides poll_feed((feed_name, feed_url)) and extract_article(entry).
+SCRAPERS = {
+    "vnexpress": (vnexpress_scraper, {"Trang Chủ": vnexpress_scraper.BASE_URL}),
+    "vietnamnet": (vietnamnet_rss_scraper, vietnamnet_rss_scraper.RSS_FEEDS),
+    "tuoitre": (tuoitre_scraper, tuoitre_scraper.RSS_FEEDS),
+    "thanhnien": (thanhnien_rss_scraper, thanhnien_rss_scraper.RSS_FEEDS),
+    "dantri": (dantri_rss_scraper, dantri_rss_scraper.RSS_FEEDS),
+}
+
+
+def iter_feeds():
+    """
+    Yields (source, feed_name, feed_url) for every feed of every scraper.
+    """
+    for source, (_, feeds) in SCRAPERS.items():
+        for feed_name, feed_url in feeds.items():
+            yield source, feed_name, feed_url
@@ -1,12 +1,11 @@
 #app/api/scrapers/tuoitre_scraper.py
 import logging
-from bs4 import BeautifulSoup
-import feedparser
 from datetime import datetime
-import requests
 from services.article_processor import ArticleProcessor  # Import ArticleProcessor
+from services.scrape_pipeline import run_scrape_pipeline
+from services.extraction_pool import extract_in_pool
 from models.article_model import Article
-from utils.scraper_helpers import fetch_article_content_and_date, clean_html
+from utils.scraper_helpers import fetch_page, clean_html, fetch_feed
 
 logger = logging.getLogger(__name__)
 
@@ -37,85 +36,84 @@ RSS_FEEDS = {
 }
 
 
-def fetch_rss_articles(feed_name, feed_url):
+def poll_feed(feed):
     """
-    Fetch articles from an RSS feed and process each article for full content and date parsing.
+    Polls one RSS feed and yields its entries with the publication date from the feed, if any.
     """
+    feed_name, feed_url = feed
+    logger.info(f"Fetching articles from {feed_name} RSS feed...")
     try:
-        feed = feedparser.parse(feed_url)
-        articles = []
-
-        for entry in feed.entries:
-            title = clean_html(entry.title)
-            link = entry.link
-            published_date = entry.get("published", None)
-
-            # Attempt to parse the published date
-            article_date = None
-            if published_date:
-                # Replace "GMT+7" with "+0700" for compatibility
-                cleaned_date = published_date.replace("GMT+7", "+0700")
-                date_formats = [
-                    '%a, %d %b %Y %H:%M:%S %z',  # RSS common format with timezone
-                ]
-                for fmt in date_formats:
-                    try:
-                        article_date = datetime.strptime(cleaned_date.strip(), fmt)
-                        break
-                    except ValueError:
-                        continue
-                else:
-                    logger.warning(f"Failed to parse date for {link}: {published_date}")
-
-            logger.info(f"Processing article: Title: {title}, Link: {link}")
-
-            # Fetch content from the article link
-            full_content, content_date = fetch_article_content_and_date(link, "div.detail-content.afcbc-body")
-            if not full_content or full_content.strip() == "":
-                logger.warning(f"Skipping article with missing or empty content: {link}")
-                continue
-
-            # Use the publication date from RSS or fallback to the date extracted from the article
-            final_date = content_date or article_date or datetime.now()
-
-            if title and link and full_content:  # Ensure all essential fields are present
-                article = Article(
-                    title=title,
-                    content=full_content,
-                    source_url=link,
-                    date=final_date,
-                    source=f"Tuổi Trẻ",
-                )
-                articles.append(article.to_dict())
-            else:
-                logger.warning(f"Skipping article due to missing essential fields: {link}")
-
-        return articles
+        parsed_feed = fetch_feed(feed_url)
     except Exception as e:
         logger.error(f"Error fetching RSS feed {feed_name}: {e}")
-        return []
+        return
+
+    if not parsed_feed.entries:
+        logger.warning(f"No articles found in {feed_name} RSS feed.")
+
+    for entry in parsed_feed.entries:
+        title = clean_html(entry.title)
+        link = entry.link
+        published_date = entry.get("published", None)
+
+        # Attempt to parse the published date
+        article_date = None
+        if published_date:
+            # Replace "GMT+7" with "+0700" for compatibility
+            cleaned_date = published_date.replace("GMT+7", "+0700")
+            date_formats = [
+                '%a, %d %b %Y %H:%M:%S %z',  # RSS common format with timezone
+            ]
+            for fmt in date_formats:
+                try:
+                    article_date = datetime.strptime(cleaned_date.strip(), fmt)
+                    break
+                except ValueError:
+                    continue
+            else:
+                logger.warning(f"Failed to parse date for {link}: {published_date}")
+
+        if not title or not link:  # Ensure all essential fields are present
+            logger.warning(f"Skipping article due to missing essential fields: {link}")
+            continue
+
+        logger.info(f"Processing article: Title: {title}, Link: {link}")
+        yield {"feed_name": feed_name, "title": title, "link": link, "date": article_date}
+
+def extract_article(entry):
+    """
+    Extracts the content and date of a fetched article page.
+    """
+    link = entry["link"]
+    extracted = extract_in_pool("tuoitre.vn", entry["html"], link)
+    full_content, content_date = extracted["content"], extracted["date"]
+
+    if not full_content or full_content.strip() == "":
+        logger.warning(f"Skipping article with missing or empty content: {link}")
+        return None
+
+    # Use the publication date from RSS or fallback to the date extracted from the article
+    final_date = content_date or entry["date"] or datetime.now()
+
+    article = Article(
+        title=entry["title"],
+        content=full_content,
+        source_url=link,
+        date=final_date,
+        source=f"Tuổi Trẻ",
+    )
+    return article.to_dict()
 
 def scrape_tuoitre():
     """
     Scrape Tuổi Trẻ articles using RSS feeds and store them in the vector database.
+    Feeds go through a streaming pipeline (poll -> fetch -> extract -> embed -> upsert).
     """
     logger.info("Starting Tuổi Trẻ RSS scraper...")
-    total_articles = 0
-
-    for feed_name, feed_url in RSS_FEEDS.items():
-        logger.info(f"Fetching articles from {feed_name} RSS feed...")
-        articles = fetch_rss_articles(feed_name, feed_url)
-
-        if articles:
-            for article in articles:
-                try:
-                    article_processor.process_and_store_article(article)
-                    logger.info(f"Processed and stored article '{article['title']}' in vector DB.")
-                except Exception as e:
-                    logger.error(f"Failed to process article '{article['title']}': {e}")
-            total_articles += len(articles)
-        else:
-            logger.warning(f"No articles found in {feed_name} RSS feed.")
+    stats = run_scrape_pipeline(
+        "tuoitre", RSS_FEEDS.items(), poll_feed, extract_article, article_processor, fetch_page
+    )
+    total_articles = stats["upsert"]["processed"]
 
     if total_articles:
         logger.info(f"Total {total_articles} articles processed and stored from Tuổi Trẻ feeds.")
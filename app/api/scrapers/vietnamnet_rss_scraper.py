@@ -1,10 +1,11 @@
 # app/api/scrapers/vietnamnet_rss_scraper.py
-import feedparser
 import logging
 from datetime import datetime
 from services.article_processor import ArticleProcessor  # Import ArticleProcessor
+from services.scrape_pipeline import run_scrape_pipeline
+from services.extraction_pool import extract_in_pool
 from models.article_model import Article
-from utils.scraper_helpers import clean_html, fetch_article_content_and_date
+from utils.scraper_helpers import clean_html, fetch_page, fetch_feed
 
 logger = logging.getLogger(__name__)
 
@@ -22,66 +23,64 @@ RSS_FEEDS = {
     "Quân sự": "https://infonet.vietnamnet.vn/rss/quan-su.rss"
 }
 
-def fetch_rss_articles(feed_name, feed_url):
+def poll_feed(feed):
     """
-    Fetch articles from an RSS feed and process them for full content and date parsing.
+    Polls one RSS feed and yields its entries with the publication date from the feed, if any.
     """
+    feed_name, feed_url = feed
     try:
-        feed = feedparser.parse(feed_url)
-        articles = []
+        parsed_feed = fetch_feed(feed_url)
+    except Exception as e:
+        logger.exception(f"Failed to fetch articles from RSS feed {feed_name}: {e}")
+        return
 
-        for entry in feed.entries:
-            title = clean_html(entry.title)
-            link = entry.link
-            published_date = entry.get("published", None)
+    if not parsed_feed.entries:
+        logger.warning(f"No articles found in {feed_name} feed.")
 
-            # Parse publication date
-            date_obj = None
-            if published_date:
-                try:
-                    date_obj = datetime.strptime(published_date, '%a, %d %b %Y %H:%M:%S %z')
-                except ValueError as e:
-                    logger.error(f"RSS date parsing failed for {published_date}: {e}")
+    for entry in parsed_feed.entries:
+        published_date = entry.get("published", None)
 
-            # Fetch content and date from the article page
-            full_content, article_date = fetch_article_content_and_date(link, "div.contentDetail__main-reading")
-            final_date = article_date or date_obj or datetime.now()
+        # Parse publication date
+        date_obj = None
+        if published_date:
+            try:
+                date_obj = datetime.strptime(published_date, '%a, %d %b %Y %H:%M:%S %z')
+            except ValueError as e:
+                logger.error(f"RSS date parsing failed for {published_date}: {e}")
 
-            if full_content:
-                article = Article(
-                    title=title,
-                    content=full_content,
-                    source_url=link,
-                    date=final_date,
-                    source=f"VietnamNet"
-                )
-                articles.append(article.to_dict())
+        yield {"feed_name": feed_name, "title": clean_html(entry.title), "link": entry.link, "date": date_obj}
 
-        return articles
-    except Exception as e:
-        logger.exception(f"Failed to fetch articles from RSS feed {feed_name}: {e}")
-        return []
+def extract_article(entry):
+    """
+    Extracts the content and date of a fetched article page.
+    """
+    link = entry["link"]
+    extracted = extract_in_pool("vietnamnet.vn", entry["html"], link)
+    full_content, article_date = extracted["content"], extracted["date"]
+
+    if not full_content:
+        return None
+
+    final_date = article_date or entry["date"] or datetime.now()
+    article = Article(
+        title=entry["title"],
+        content=full_content,
+        source_url=link,
+        date=final_date,
+        source=f"VietnamNet"
+    )
+    return article.to_dict()
 
 def scrape_vietnamnet_rss():
     """
     Scrape VietnamNet articles using RSS feeds and store them in the vector database.
+    Feeds go through a streaming pipeline (poll -> fetch -> extract -> embed -> upsert).
     """
     logger.info("Starting VietnamNet RSS scraper...")
-    total_articles = 0
-
-    for feed_name, feed_url in RSS_FEEDS.items():
-        articles = fetch_rss_articles(feed_name, feed_url)
-
-        if articles:
-            for article in articles:
-                try:
-                    article_processor.process_and_store_article(article)
-                    logger.info(f"Processed and stored article '{article['title']}' in vector DB.")
-                except Exception as e:
-                    logger.error(f"Failed to process article '{article['title']}': {e}")
-            total_articles += len(articles)
-        else:
-            logger.warning(f"No articles found in {feed_name} feed.")
+    stats = run_scrape_pipeline(
+        "vietnamnet", RSS_FEEDS.items(), poll_feed, extract_article, article_processor, fetch_page
+    )
+    total_articles = stats["upsert"]["processed"]
 
     if total_articles:
         logger.info(f"Total {total_articles} articles processed and stored from VietnamNet feeds.")
@@ -1,68 +1,79 @@
 #app/api/scrapers/vnexpress_scraper.py
-import requests
 from bs4 import BeautifulSoup
 import logging
 from services.article_processor import ArticleProcessor  # Import ArticleProcessor
+from services.scrape_pipeline import run_scrape_pipeline
+from services.extraction_pool import extract_in_pool
 from models.article_model import Article
-from utils.scraper_helpers import fetch_article_content_and_date, extract_article_links
+from utils.scraper_helpers import HTML_PARSER, extract_article_links, fetch_page, polite_get
 
 logger = logging.getLogger(__name__)
 
 # Initialize ArticleProcessor
 article_processor = ArticleProcessor()
 
-def scrape_vnexpress():
+BASE_URL = "https://vnexpress.net/"
+
+def poll_feed(feed):
     """
-    Scrape VNExpress articles from the homepage and process them for vectorization.
+    Polls the VNExpress homepage and yields the linked articles.
     """
-    base_url = "https://vnexpress.net/"
+    feed_name, feed_url = feed
     try:
-        response = requests.get(base_url)
+        response = polite_get(feed_url, timeout=10)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(response.content, HTML_PARSER)
+    except Exception as e:
+        logger.error(f"Error while scraping VNExpress: {e}")
+        return
+
+    # Extract links and titles
+    articles = extract_article_links(soup, "article.item-news h3.title-news a", feed_url)
 
-        # Extract links and titles
-        articles = extract_article_links(soup, "article.item-news h3.title-news a", base_url)
+    if not articles:
+        logger.warning("No articles found on VNExpress homepage.")
+        return
 
-        if not articles:
-            logger.warning("No articles found on VNExpress homepage.")
-            return
+    for article in articles:
+        link = article['link']
 
-        new_articles = []
-        for article in articles:
-            link = article['link']
+        # Skip video articles based on URL
+        if "video" in link:
+            logger.info(f"Skipping video article: {link}")
+            continue
 
-            # Skip video articles based on URL
-            if "video" in link:
-                logger.info(f"Skipping video article: {link}")
-                continue
+        yield {"feed_name": feed_name, "title": article['title'], "link": link}
 
-            title = article['title']
-            content, article_date = fetch_article_content_and_date(link, "article.fck_detail p.Normal")
+def extract_article(entry):
+    """
+    Extracts the content and date of a fetched article page.
+    """
+    link = entry["link"]
+    extracted = extract_in_pool("vnexpress.net", entry["html"], link)
+    content, article_date = extracted["content"], extracted["date"]
 
-            if content:
-                article_obj = Article(
-                    title=title,
-                    content=content,
-                    source_url=link,
-                    date=article_date,
-                    source="VNExpress"
-                )
-                new_articles.append(article_obj.to_dict())
+    if not content:
+        return None
 
-        if new_articles:
-            # Process and store articles in vector database
-            for article in new_articles:
-                try:
-                    article_processor.process_and_store_article(article)
-                    logger.info(f"Processed and stored article '{article['title']}' in vector DB.")
-                except Exception as e:
-                    logger.error(f"Failed to process article '{article['title']}': {e}")
-        else:
-            logger.warning("No valid articles to process from VNExpress.")
+    article_obj = Article(
+        title=entry["title"],
+        content=content,
+        source_url=link,
+        date=article_date,
+        source="VNExpress"
+    )
+    return article_obj.to_dict()
 
-    except Exception as e:
-        logger.error(f"Error while scraping VNExpress: {e}")
+def scrape_vnexpress():
+    """
+    Scrape VNExpress articles from the homepage and process them for vectorization.
+    The homepage goes through the streaming scrape pipeline (poll -> fetch -> extract -> embed -> upsert).
+    """
+    stats = run_scrape_pipeline(
+        "vnexpress", [("Trang Chủ", BASE_URL)], poll_feed, extract_article, article_processor, fetch_page
+    )
+    if not stats["upsert"]["processed"]:
+        logger.warning("No valid articles to process from VNExpress.")
 
 if __name__ == "__main__":
     scrape_vnexpress()
@@ -0,0 +1,196 @@
+# app/api/stream_server.py
+"""
+Server-Sent Events service for newly ingested articles: GET /api/stream.
+
+Subscribers are held by one asyncio event loop, so an idle connection costs a socket and a
+suspended coroutine instead of a server thread (the gunicorn backend would tie up one of its few
+threads per open stream). One task tails the article change log (services/article_stream.py)
+every STREAM_POLL_SECONDS and wakes the subscribers, so the database is read once per poll
+however many clients are connected.
+
+Query parameters: source and category (repeatable) filter the articles. A reconnecting
+EventSource sends Last-Event-ID and receives everything it missed that is still in the log;
+?last_event_id= does the same for clients that cannot set headers.
+"""
+from collections import deque
+from services.article_stream import event_matches, format_event, get_article_change_log
+from urllib.parse import parse_qs, urlsplit
+from utils.logging_config import setup_logging
+import asyncio
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+STREAM_PORT = int(os.getenv("STREAM_PORT", "5001"))
+STREAM_POLL_SECONDS = float(os.getenv("STREAM_POLL_SECONDS", "1"))
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "15"))
+# Events kept in memory for subscribers that fall slightly behind; older ones are read from the log
+STREAM_BUFFER_SIZE = int(os.getenv("STREAM_BUFFER_SIZE", "1000"))
+# Events read from the log per step when replaying to a client that was away for long
+STREAM_REPLAY_BATCH = int(os.getenv("STREAM_REPLAY_BATCH", "500"))
+TAIL_BATCH = 500
+STREAM_BACKLOG = int(os.getenv("STREAM_BACKLOG", "1024"))
+MAX_REQUEST_HEAD_BYTES = 16384
+
+
+class StreamHub:
+    """
+    Tails the change log and lets subscriber coroutines wait for events after a sequence number.
+    """
+
+    def __init__(self, change_log):
+        self.change_log = change_log
+        self.events = deque(maxlen=STREAM_BUFFER_SIZE)
+        self.last_seq = 0
+        self.subscribers = 0
+        self._changed = None
+
+    async def start(self):
+        self._changed = asyncio.Condition()
+        loop = asyncio.get_running_loop()
+        self.last_seq = await loop.run_in_executor(None, self.change_log.last_seq)
+        asyncio.ensure_future(self._tail())
+
+    async def _tail(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                events = await loop.run_in_executor(None, self.change_log.read_since, self.last_seq, TAIL_BATCH)
+            except Exception as e:
+                logger.error(f"Reading the article change log failed: {e}")
+                events = []
+            if events:
+                async with self._changed:
+                    self.events.extend(events)
+                    self.last_seq = events[-1]["seq"]
+                    self._changed.notify_all()
+                if len(events) == TAIL_BATCH:
+                    continue  # A backlog; keep reading before sleeping
+            await asyncio.sleep(STREAM_POLL_SECONDS)
+
+    async def events_after(self, seq):
+        """
+        Returns the events after seq: from memory, or from the log for a client far behind.
+        """
+        if self.events and seq >= self.events[0]["seq"] - 1:
+            return [event for event in self.events if event["seq"] > seq]
+        if seq >= self.last_seq:
+            return []
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.change_log.read_since, seq, STREAM_REPLAY_BATCH)
+
+    async def wait(self, seq, timeout):
+        """
+        Waits until there are events after seq, or timeout seconds. Returns True if there are.
+        """
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait_for(lambda: self.last_seq > seq), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+
+hub = None
+
+
+async def read_request_head(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    if len(head) > MAX_REQUEST_HEAD_BYTES:
+        raise ValueError("Request head too large.")
+    lines = head.decode("latin-1").split("\r\n")
+    method, target, _ = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return method, target, headers
+
+
+async def respond(writer, status, body, content_type="application/json"):
+    payload = body.encode("utf-8")
+    writer.write(
+        f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(payload)}\r\n"
+        f"Access-Control-Allow-Origin: *\r\nConnection: close\r\n\r\n".encode("latin-1") + payload
+    )
+    await writer.drain()
+
+
+async def stream(writer, query, headers):
+    sources = set(query.get("source", []))
+    categories = set(query.get("category", []))
+    resume_from = headers.get("last-event-id") or (query.get("last_event_id") or [None])[0]
+    try:
+        # An ID ahead of the log (e.g. after the log was reset) resumes from now
+        seq = min(int(resume_from), hub.last_seq) if resume_from else hub.last_seq
+    except ValueError:
+        seq = hub.last_seq
+
+    writer.write(
+        b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream; charset=utf-8\r\nCache-Control: no-cache\r\n"
+        b"Connection: keep-alive\r\nAccess-Control-Allow-Origin: *\r\nX-Accel-Buffering: no\r\n\r\n"
+        b"retry: 5000\n\n"
+    )
+    await writer.drain()
+    hub.subscribers += 1
+    try:
+        while True:
+            events = await hub.events_after(seq)
+            if events:
+                chunk = "".join(format_event(event) for event in events if event_matches(event, sources, categories))
+                seq = events[-1]["seq"]
+                if chunk:
+                    writer.write(chunk.encode("utf-8"))
+                    await writer.drain()
+                continue
+            if not await hub.wait(seq, STREAM_HEARTBEAT_SECONDS):
+                # Keeps proxies from closing the idle connection and detects clients that left
+                writer.write(b": keepalive\n\n")
+                await writer.drain()
+    finally:
+        hub.subscribers -= 1
+
+
+async def handle(reader, writer):
+    try:
+        method, target, headers = await read_request_head(reader)
+        url = urlsplit(target)
+        if method != "GET":
+            await respond(writer, "405 Method Not Allowed", json.dumps({"error": "Method not allowed."}))
+        elif url.path == "/api/stream":
+            await stream(writer, parse_qs(url.query), headers)
+        elif url.path == "/healthz":
+            await respond(writer, "200 OK", json.dumps(
+                {"status": "ok", "subscribers": hub.subscribers, "last_event_id": hub.last_seq}
+            ))
+        else:
+            await respond(writer, "404 Not Found", json.dumps({"error": "Not found."}))
+    except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        pass  # The client went away
+    except Exception as e:
+        logger.error(f"Stream request failed: {e}")
+    finally:
+        writer.close()
+
+
+async def serve():
+    global hub
+    hub = StreamHub(get_article_change_log())
+    await hub.start()
+    server = await asyncio.start_server(handle, "0.0.0.0", STREAM_PORT, backlog=STREAM_BACKLOG,
+                                        limit=MAX_REQUEST_HEAD_BYTES)
+    logger.info(f"Article stream listening on port {STREAM_PORT} (last event {hub.last_seq}).")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    setup_logging()
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# app/benchmarks/bench_alerts.py
+"""
+Measures saved-query alert matching (services/alerts.py): the latency of scoring one ingest
+batch against N saved queries, and the memory the query matrix takes. Synthetic queries are
+random unit vectors. Each batch contains articles planted close to known queries. The script
+exits with status 1 if a planted match is missed or a far pair is matched.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python benchmarks/bench_alerts.py --queries 100000 --dim 768 --batch-sizes 1 32 128
+"""
+from services.alerts import QueryMatrix
+import argparse
+import sys
+import time
+import numpy as np
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark saved-query alert matching.")
+    parser.add_argument("--queries", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 128])
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    matrix = QueryMatrix(np.arange(args.queries), rng.standard_normal((args.queries, args.dim), dtype=np.float32),
+                         np.full(args.queries, args.threshold, dtype=np.float32))
+    print(f"{args.queries} saved queries x {args.dim}: {matrix.vectors.nbytes / 1e6:.0f} MB, "
+          f"built in {time.perf_counter() - start:.2f}s")
+
+    failures = 0
+    for batch_size in args.batch_sizes:
+        timings = []
+        for _ in range(args.repeats):
+            # Half the batch is planted next to random queries; random vectors in 768-d match nothing
+            planted = rng.choice(args.queries, size=max(batch_size // 2, 1), replace=False)
+            noise = rng.standard_normal((len(planted), args.dim), dtype=np.float32) * 0.01
+            articles = np.concatenate([
+                matrix.vectors[planted] + noise,
+                rng.standard_normal((batch_size - len(planted), args.dim), dtype=np.float32),
+            ])[:batch_size]
+            start = time.perf_counter()
+            rows, columns, _ = matrix.match(articles)
+            timings.append(time.perf_counter() - start)
+            found = set(zip(rows.tolist(), columns.tolist()))
+            expected = {(int(query), column) for column, query in enumerate(planted[:batch_size])}
+            failures += len(expected - found) + len(found - expected)
+        timings = np.array(timings) * 1000
+        print(f"batch {batch_size:>4}: p50 {np.percentile(timings, 50):7.1f} ms  p95 {np.percentile(timings, 95):7.1f} ms  "
+              f"({batch_size / np.median(timings) * 1000:.0f} articles/s)")
+
+    if failures:
+        print(f"FAILED: {failures} wrong or missing matches.")
+        sys.exit(1)
+    print("All planted matches found, no false matches.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# app/benchmarks/bench_extraction.py
+"""
+Compares HTML parse + extraction time per page across the five sources and parser backends,
+and measures extraction throughput through the process pool.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python benchmarks/bench_extraction.py --html-dir samples/          # saved pages
+    python benchmarks/bench_extraction.py --urls sample_urls.txt       # downloads the pages first
+"""
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from utils.extraction import SOURCES, extract_canonical_url, extract_page, make_soup, source_config_for_url
+import argparse
+import os
+import time
+import requests
+
+PARSERS = ["html.parser", "lxml"]
+
+
+def source_key_for_url(url):
+    config = source_config_for_url(url)
+    if config is None:
+        return None
+    return next(key for key, value in SOURCES.items() if value is config)
+
+
+def load_pages(args):
+    """
+    Returns a list of (source_key, url, html bytes).
+    """
+    pages = []
+    if args.html_dir:
+        for name in sorted(os.listdir(args.html_dir)):
+            with open(os.path.join(args.html_dir, name), "rb") as f:
+                html_content = f.read()
+            url = extract_canonical_url(make_soup(html_content))
+            pages.append((source_key_for_url(url), url, html_content))
+    else:
+        with open(args.urls, encoding="utf-8") as f:
+            urls = [line.strip() for line in f if line.strip()]
+        for url in urls:
+            try:
+                response = requests.get(url, timeout=15)
+                response.raise_for_status()
+                pages.append((source_key_for_url(url), url, response.content))
+            except Exception as e:
+                print(f"Skipping {url}: {e}")
+    return [page for page in pages if page[0]]
+
+
+def time_parser(pages, parser, repeat):
+    """
+    Returns {source_key: mean milliseconds per page} for one parser backend.
+    """
+    totals = defaultdict(float)
+    counts = defaultdict(int)
+    for source_key, url, html_content in pages:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            extract_page(source_key, html_content, url, parser=parser)
+        totals[source_key] += (time.perf_counter() - start) * 1000 / repeat
+        counts[source_key] += 1
+    return {key: totals[key] / counts[key] for key in totals}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML extraction per source and parser.")
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument("--html-dir", help="Directory of saved article pages.")
+    inputs.add_argument("--urls", help="File with one article URL per line.")
+    parser.add_argument("--repeat", type=int, default=3, help="Parses per page per parser.")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="Pool size for the throughput run.")
+    args = parser.parse_args()
+
+    pages = load_pages(args)
+    if not pages:
+        print("No pages from known sources found.")
+        return
+
+    results = {name: time_parser(pages, name, args.repeat) for name in PARSERS}
+    page_counts = defaultdict(int)
+    for source_key, _, _ in pages:
+        page_counts[source_key] += 1
+
+    print(f"{'source':<16}{'pages':>7}" + "".join(f"{name + ' ms':>16}" for name in PARSERS) + f"{'speedup':>10}")
+    for source_key in sorted(page_counts):
+        timings = [results[name][source_key] for name in PARSERS]
+        print(
+            f"{source_key:<16}{page_counts[source_key]:>7}"
+            + "".join(f"{t:>16.2f}" for t in timings)
+            + f"{timings[0] / timings[-1]:>9.1f}x"
+        )
+
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        pool.submit(os.getpid).result()
+        start = time.perf_counter()
+        list(pool.map(extract_page, *zip(*[(key, html_content, url) for key, url, html_content in pages]),
+                      chunksize=max(1, len(pages) // (args.processes * 4))))
+        elapsed = time.perf_counter() - start
+    print(f"Process pool ({args.processes} processes, lxml): {len(pages) / elapsed:.1f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# app/benchmarks/bench_extractive_summarizer.py
+"""
+Benchmarks the local extractive summarizer on a corpus of stored articles.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python benchmarks/bench_extractive_summarizer.py --namespace title --limit 500
+    python benchmarks/bench_extractive_summarizer.py --jsonl articles.jsonl
+"""
+import argparse
+import json
+import time
+import numpy as np
+from services.extractive_summarizer import ExtractiveSummarizer
+
+
+def load_corpus(args):
+    """
+    Loads article contents from a JSONL dump (one object with a "content" field per line)
+    or from the vector store metadata.
+    """
+    if args.jsonl:
+        with open(args.jsonl, encoding="utf-8") as f:
+            contents = [json.loads(line).get("content", "") for line in f if line.strip()]
+        return [c for c in contents if c][:args.limit]
+
+    from services.vector_db_service import VectorDBService
+    vector_db = VectorDBService()
+    return [
+        vector["metadata"].get("content", "")
+        for vector in vector_db.iter_vectors(namespace=args.namespace, limit=args.limit)
+        if vector["metadata"].get("content")
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the extractive summarizer.")
+    parser.add_argument("--jsonl", help="JSONL file of articles with a 'content' field.")
+    parser.add_argument("--namespace", default="title", help="Vector store namespace to read articles from.")
+    parser.add_argument("--limit", type=int, default=500, help="Maximum number of articles to benchmark.")
+    parser.add_argument("--sentences", type=int, default=4, help="Summary length in sentences.")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args)
+    if not corpus:
+        print("No articles found.")
+        return
+
+    summarizer = ExtractiveSummarizer()
+    summarizer.summarize(corpus[0], num_sentences=args.sentences)  # Warm-up
+
+    latencies = []
+    for content in corpus:
+        start = time.perf_counter()
+        summarizer.summarize(content, num_sentences=args.sentences)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies = np.array(latencies)
+    lengths = np.array([len(c) for c in corpus])
+    print(f"Articles: {len(corpus)} (mean {lengths.mean():.0f} chars, max {lengths.max()} chars)")
+    print(
+        f"Latency ms: mean {latencies.mean():.2f}, p50 {np.percentile(latencies, 50):.2f}, "
+        f"p95 {np.percentile(latencies, 95):.2f}, p99 {np.percentile(latencies, 99):.2f}, max {latencies.max():.2f}"
+    )
+    print(f"Throughput: {len(corpus) / (latencies.sum() / 1000):.1f} articles/s")
+
+
+if __name__ == "__main__":
+    main()
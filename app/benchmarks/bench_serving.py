@@ -0,0 +1,127 @@
+# app/benchmarks/bench_serving.py
+"""
+Measures API throughput of the prefork server as the number of gunicorn workers grows.
+
+For each worker count a server is started with gunicorn.conf.py, the benchmark waits for
+/readyz, sends concurrent POST /api/retrieve requests for a fixed duration and reports
+requests per second and latency percentiles, then stops the server.
+
+Usage (from the app directory, with PYTHONPATH=. and the usual Pinecone settings):
+    python benchmarks/bench_serving.py --workers 1 2 4 --concurrency 16 --duration 30
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import requests
+
+DEFAULT_QUERIES = [
+    "giá vàng hôm nay",
+    "kinh tế Việt Nam tăng trưởng",
+    "bóng đá đội tuyển quốc gia",
+    "thời tiết miền Bắc",
+    "chứng khoán thị trường",
+    "công nghệ trí tuệ nhân tạo",
+]
+
+
+def wait_ready(base_url, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{base_url}/readyz", timeout=2).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(1)
+    return False
+
+
+def load_test(base_url, queries, concurrency, duration):
+    """
+    Sends requests from `concurrency` threads for `duration` seconds.
+    Returns (latencies of successful requests, error count, elapsed seconds).
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(offset):
+        session = requests.Session()
+        i = offset
+        while time.monotonic() < stop_at:
+            query = queries[i % len(queries)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                response = session.post(f"{base_url}/api/retrieve", json={"query": query, "limit": 5}, timeout=60)
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    return latencies, errors[0], time.monotonic() - start
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/retrieve throughput per gunicorn worker count.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=4, help="Threads per worker (WEB_THREADS).")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client connections.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load per worker count.")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--startup-timeout", type=float, default=600.0)
+    parser.add_argument("--queries", help="Text file with one query per line.")
+    args = parser.parse_args()
+
+    queries = DEFAULT_QUERIES
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    results = []
+    for worker_count in args.workers:
+        env = dict(os.environ, WEB_WORKERS=str(worker_count), WEB_THREADS=str(args.threads),
+                   WEB_BIND=f"127.0.0.1:{args.port}")
+        env.setdefault("PYTHONPATH", os.getcwd())
+        server = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"], env=env)
+        try:
+            if not wait_ready(base_url, args.startup_timeout):
+                print(f"{worker_count} workers: server did not become ready.")
+                continue
+            load_test(base_url, queries, args.concurrency, min(5.0, args.duration))  # Warm-up round
+            latencies, errors, elapsed = load_test(base_url, queries, args.concurrency, args.duration)
+            results.append((worker_count, len(latencies) / elapsed, percentile(latencies, 0.5),
+                            percentile(latencies, 0.95), errors))
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+    print(f"{'workers':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    for worker_count, throughput, p50, p95, errors in results:
+        print(f"{worker_count:>8} {throughput:>8.1f} {p50 * 1000:>8.0f} {p95 * 1000:>8.0f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# app/benchmarks/bench_snapshot.py
+"""
+Measures snapshot write/read/restore throughput and size per vector for each vector dtype, against
+gzipped JSONL (the old partition archive format), on synthetic article records. Every snapshot is read
+back and checked; the script exits with status 1 if IDs, metadata or vectors do not round-trip.
+
+With --pinecone-namespace, the float32 snapshot is also restored into that (scratch) namespace with
+each --workers setting, then the namespace is deleted.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python benchmarks/bench_snapshot.py --count 50000 --dim 768
+    python benchmarks/bench_snapshot.py --count 5000 --pinecone-namespace bench-snapshot --workers 1 4 8
+"""
+from services.snapshot import SNAPSHOT_DTYPES, SnapshotReader, SnapshotWriter, restore_to_local_index, restore_to_pinecone
+import argparse
+import gzip
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+
+WORDS = "giá vàng hôm nay tăng mạnh thị trường chứng khoán ngân hàng nhà nước lãi suất xuất khẩu".split()
+
+
+def synthetic_records(count, dim, seed):
+    rng = np.random.default_rng(seed)
+    words = random.Random(seed)
+    vectors = rng.standard_normal((count, dim)).astype(np.float32)
+    for i in range(count):
+        title = " ".join(words.choice(WORDS) for _ in range(12))
+        yield {
+            "id": f"https://vnexpress.net/article-{i}.html-title",
+            "values": vectors[i].tolist(),
+            "metadata": {
+                "type": "title",
+                "title": title,
+                "content": " ".join(words.choice(WORDS) for _ in range(400)),
+                "source_url": f"https://vnexpress.net/article-{i}.html",
+                "date": f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}T08:00:00+07:00",
+                "source": "VnExpress",
+            },
+        }
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def report(name, count, seconds, size):
+    print(f"{name:<28} {count / max(seconds, 1e-9):>12.0f} vec/s {size / count:>10.0f} B/vec {size / 1e6:>9.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vector snapshots.")
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pinecone-namespace", default=None, help="Scratch namespace for the Pinecone restore.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8], help="Parallel upserts to compare.")
+    args = parser.parse_args()
+
+    records = list(synthetic_records(args.count, args.dim, args.seed))
+    expected = {record["id"]: record for record in records}
+    workdir = tempfile.mkdtemp(prefix="bench-snapshot-")
+    failures = 0
+    try:
+        start = time.perf_counter()
+        path = os.path.join(workdir, "baseline.jsonl.gz")
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        report("jsonl.gz write", args.count, time.perf_counter() - start, os.path.getsize(path))
+        start = time.perf_counter()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            read_back = sum(1 for line in f if json.loads(line))
+        report("jsonl.gz read", read_back, time.perf_counter() - start, os.path.getsize(path))
+
+        for dtype in SNAPSHOT_DTYPES:
+            path = os.path.join(workdir, dtype)
+            start = time.perf_counter()
+            writer = SnapshotWriter(path, dtype=dtype, chunk_size=args.chunk_size)
+            writer.add(records)
+            writer.close()
+            size = directory_size(path)
+            report(f"snapshot {dtype} write", args.count, time.perf_counter() - start, size)
+
+            start = time.perf_counter()
+            seen = 0
+            for ids, vectors, metadata in SnapshotReader(path).iter_chunks(workers=4):
+                for vector_id, vector, fields in zip(ids, vectors, metadata):
+                    original = expected.get(vector_id)
+                    values = np.asarray(original["values"], dtype=np.float32) if original else None
+                    cosine = float(vector @ values / (np.linalg.norm(vector) * np.linalg.norm(values))) if original else 0
+                    exact = dtype != "float32" or np.array_equal(vector, values)
+                    if original is None or fields != original["metadata"] or cosine < 0.999 or not exact:
+                        failures += 1
+                seen += len(ids)
+            report(f"snapshot {dtype} read", seen, time.perf_counter() - start, size)
+            if seen != args.count:
+                print(f"  {dtype}: read {seen} of {args.count} vectors")
+                failures += 1
+
+            start = time.perf_counter()
+            index, _ = restore_to_local_index(path, dtype=dtype)
+            report(f"restore {dtype} -> local", len(index), time.perf_counter() - start, index.nbytes)
+
+        if args.pinecone_namespace:
+            from services.vector_db_service import VectorDBService
+            vector_db = VectorDBService()
+            if vector_db.dimension != args.dim:
+                parser.error(f"--dim must match PINECONE_DIMENSION ({vector_db.dimension}) for a Pinecone restore.")
+            path = os.path.join(workdir, "float32")
+            try:
+                for workers in args.workers:
+                    start = time.perf_counter()
+                    restored = restore_to_pinecone(vector_db, path, args.pinecone_namespace, workers=workers)
+                    report(f"restore -> pinecone x{workers}", restored, time.perf_counter() - start, directory_size(path))
+            finally:
+                vector_db.delete_namespace(args.pinecone_namespace, index_name=vector_db.index_name)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if failures:
+        print(f"FAILED: {failures} records did not round-trip.")
+        sys.exit(1)
+    print("All snapshots round-tripped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# app/benchmarks/bench_tokenization.py
+"""
+Measures PhoBERT tokenization throughput separately from model inference.
+
+Reports texts/s and tokens/s for the slow tokenizer (one text at a time), the fast tokenizer
+(one text at a time and batched), and the model forward pass over already tokenized batches.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python benchmarks/bench_tokenization.py --namespace title --limit 2000
+    python benchmarks/bench_tokenization.py --jsonl articles.jsonl --field content
+"""
+from transformers import AutoTokenizer
+from services.phobert_tokenizer import convert_slow_tokenizer
+from services.vectorizer_service import PhoBERTVectorizer
+import argparse
+import json
+import time
+
+MAX_LENGTH = 256
+
+
+def load_texts(args):
+    if args.jsonl:
+        with open(args.jsonl, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()][:args.limit]
+    else:
+        from services.vector_db_service import VectorDBService
+        records = [vector["metadata"] for vector in
+                   VectorDBService().iter_vectors(namespace=args.namespace, limit=args.limit)]
+    return [PhoBERTVectorizer.preprocess(record[args.field]) for record in records if record.get(args.field)]
+
+
+def report(name, seconds, texts, tokens):
+    print(f"{name:<28} {seconds:8.3f}s {texts / seconds:10.1f} texts/s {tokens / seconds:12.0f} tokens/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PhoBERT tokenization and inference separately.")
+    parser.add_argument("--model", default="vinai/phobert-base")
+    parser.add_argument("--jsonl", help="JSONL file of articles.")
+    parser.add_argument("--namespace", default="title", help="Vector store namespace to read articles from.")
+    parser.add_argument("--field", default="title", choices=["title", "content"])
+    parser.add_argument("--limit", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--skip-model", action="store_true", help="Only benchmark the tokenizers.")
+    args = parser.parse_args()
+
+    texts = load_texts(args)
+    if not texts:
+        print("No articles found.")
+        return
+
+    slow_tokenizer = AutoTokenizer.from_pretrained(args.model, use_fast=False)
+    fast_tokenizer = convert_slow_tokenizer(slow_tokenizer)
+
+    start = time.perf_counter()
+    slow_ids = [slow_tokenizer(text, truncation=True, max_length=MAX_LENGTH)["input_ids"] for text in texts]
+    slow_seconds = time.perf_counter() - start
+    tokens = sum(len(ids) for ids in slow_ids)
+    print(f"{len(texts)} texts, {tokens} tokens ({args.field})")
+    report("slow, one at a time", slow_seconds, len(texts), tokens)
+
+    start = time.perf_counter()
+    for text in texts:
+        fast_tokenizer(text, truncation=True, max_length=MAX_LENGTH)
+    report("fast, one at a time", time.perf_counter() - start, len(texts), tokens)
+
+    start = time.perf_counter()
+    fast_tokenizer(texts, truncation=True, max_length=MAX_LENGTH)
+    report("fast, batched", time.perf_counter() - start, len(texts), tokens)
+
+    if args.skip_model:
+        return
+
+    vectorizer = PhoBERTVectorizer(args.model)
+    input_ids = vectorizer.tokenize_batch(texts)
+    vectorizer.encode_tokenized(input_ids[:args.batch_size], batch_size=args.batch_size)  # Warm-up
+    start = time.perf_counter()
+    vectorizer.encode_tokenized(input_ids, batch_size=args.batch_size)
+    report(f"model, batches of {args.batch_size}", time.perf_counter() - start, len(texts), tokens)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# app/benchmarks/bench_trending.py
+"""
+Measures the trending-topics sketches (services/trending.py): ingest throughput, /api/trending
+query latency and the bytes of sketches stored as the number of articles grows. Synthetic
+articles are drawn from a large background vocabulary. A planted story appears only in the
+last few hours. The script exits with status 1 if the planted story is not the top term, or
+if the stored state keeps growing once the baseline window is full.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python benchmarks/bench_trending.py --hours 192 --articles-per-hour 200
+"""
+from datetime import datetime, timezone
+from services.trending import TrendingTracker
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+def synthetic_title(rng, vocabulary):
+    return " ".join(rng.choice(vocabulary) for _ in range(rng.randint(6, 12)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the trending-topics sketches.")
+    parser.add_argument("--hours", type=int, default=192)
+    parser.add_argument("--articles-per-hour", type=int, default=200)
+    parser.add_argument("--burst-hours", type=int, default=3)
+    parser.add_argument("--burst-share", type=float, default=0.05)
+    parser.add_argument("--vocabulary", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    syllables = [f"{a}{b}" for a in "bcdghklmnpqrstvx" for b in ("an", "ao", "inh", "uong", "iet", "oa", "ung", "em")]
+    vocabulary = [f"{rng.choice(syllables)}{rng.choice(syllables)}" for _ in range(args.vocabulary)]
+    planted = "vỡ đê"
+
+    with tempfile.TemporaryDirectory() as directory:
+        tracker = TrendingTracker(path=os.path.join(directory, "trending.db"))
+        # Simulated clock: hour h of the run ends at now - (hours - h) hours, as if ingested live
+        now = time.time()
+        ingest_seconds = 0.0
+        sizes = {}
+        for hour in range(args.hours - 1, -1, -1):
+            hour_end = now - hour * 3600
+            records = []
+            for i in range(args.articles_per_hour):
+                title = synthetic_title(rng, vocabulary)
+                if hour < args.burst_hours and rng.random() < args.burst_share:
+                    title = f"{planted} {title}"
+                date = datetime.fromtimestamp(hour_end - rng.random() * 3600, timezone.utc)
+                records.append({"id": f"{hour}-{i}", "metadata": {"title": title, "content": "", "date": date.isoformat()}})
+            start = time.perf_counter()
+            for offset in range(0, len(records), args.batch_size):
+                tracker.record(records[offset:offset + args.batch_size], now=hour_end)
+            ingest_seconds += time.perf_counter() - start
+            tracker._next_prune = 0.0  # Prune every hour so the size reflects the retained buckets
+            sizes[args.hours - hour] = tracker._conn().execute(
+                "SELECT COALESCE(SUM(LENGTH(sketch) + LENGTH(heavy)), 0) FROM trending_buckets"
+            ).fetchone()[0]
+
+        total = args.hours * args.articles_per_hour
+        print(f"{total} articles in {ingest_seconds:.1f}s ({total / ingest_seconds:.0f} articles/s)")
+        for hours in sorted(sizes)[::max(len(sizes) // 6, 1)] + [max(sizes)]:
+            print(f"after {hours:>4}h ({hours * args.articles_per_hour:>7} articles): {sizes[hours] / 1e6:6.1f} MB")
+
+        timings = []
+        for _ in range(10):
+            start = time.perf_counter()
+            result = tracker.trending("terms", window_hours=6, limit=10, now=now)
+            timings.append(time.perf_counter() - start)
+        print(f"trending query: {min(timings) * 1000:.1f} ms, "
+              f"{result['window_articles']} window / {result['baseline_articles']} baseline articles")
+        for topic in result["topics"][:5]:
+            print(f"  {topic['topic']:<20} count {topic['count']:>4}  expected {topic['expected']:>6}  score {topic['score']}")
+
+    failures = []
+    if not result["topics"] or result["topics"][0]["topic"] != planted:
+        failures.append(f"planted topic '{planted}' is not the top term")
+    horizon = tracker.horizon_seconds // 3600
+    if args.hours > horizon + 24 and sizes[args.hours] > sizes[horizon + 24] * 1.1:
+        failures.append("the stored sketches kept growing after the baseline window was full")
+    if failures:
+        print(f"FAILED: {'; '.join(failures)}.")
+        sys.exit(1)
+    print("Planted burst found; storage bounded.")
+
+
+if __name__ == "__main__":
+    main()
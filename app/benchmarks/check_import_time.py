@@ -0,0 +1,106 @@
+# app/benchmarks/check_import_time.py
+"""
+Checks that importing the service entry points stays fast and loads neither the model nor the
+Pinecone index. Each module is imported in a fresh interpreter; the best of several runs is
+compared with its budget. Exits with status 1 if any budget is exceeded, so it can run in CI.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --profile api.routes   # slowest imports of one module
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Seconds allowed for a cold import of each module
+IMPORT_BUDGETS = {
+    "main": 3.0,
+    "api.routes": 3.0,
+    "api.scheduler": 3.0,
+    "api.crawl_worker": 1.0,
+    "api.ingest_worker": 1.0,
+}
+
+# Modules that must stay unloaded until the model is actually needed
+HEAVY_MODULES = ["torch", "transformers"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, env):
+    """
+    Imports a module in a new interpreter. Returns (seconds, heavy modules that got loaded).
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        env=env, capture_output=True, text=True, timeout=600,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip()}")
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    return probe["seconds"], probe["loaded"]
+
+
+def profile(module, env, top=15):
+    """
+    Prints the slowest imports of a module, from python -X importtime.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env, capture_output=True, text=True, timeout=600,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line[len("import time:"):].split("|", 2)]
+        rows.append((int(cumulative_us), int(self_us), name))
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative_us / 1e6:8.3f}s cumulative {self_us / 1e6:8.3f}s self  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check import-time budgets of the service entry points.")
+    parser.add_argument("--runs", type=int, default=3, help="Imports per module; the fastest counts.")
+    parser.add_argument("--profile", metavar="MODULE", help="Print the slowest imports of one module instead.")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("PYTHONPATH", os.getcwd())
+    # Importing must not need a reachable Pinecone or a real key
+    env.setdefault("PINECONE_API_KEY", "import-time-check")
+
+    if args.profile:
+        profile(args.profile, env)
+        return
+
+    failures = []
+    for module, budget in IMPORT_BUDGETS.items():
+        try:
+            runs = [measure(module, env) for _ in range(args.runs)]
+        except Exception as e:
+            failures.append(module)
+            print(f"FAIL {module}: {e}")
+            continue
+        seconds = min(run[0] for run in runs)
+        loaded = sorted({name for run in runs for name in run[1]})
+        ok = seconds <= budget and not loaded
+        if not ok:
+            failures.append(module)
+        note = f", loaded {', '.join(loaded)}" if loaded else ""
+        print(f"{'ok  ' if ok else 'FAIL'} {module}: {seconds:.2f}s (budget {budget:.1f}s{note})")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# app/benchmarks/check_tokenizer_parity.py
+"""
+Checks that the converted fast PhoBERT tokenizer produces exactly the same input IDs as the slow
+Python tokenizer on a sample of stored Vietnamese articles (titles and contents, preprocessed as
+the vectorizer does). Exits with status 1 on any mismatch, so it can run in CI.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python benchmarks/check_tokenizer_parity.py --namespace title --limit 1000
+    python benchmarks/check_tokenizer_parity.py --jsonl articles.jsonl
+"""
+from transformers import AutoTokenizer, PreTrainedTokenizerFast
+from services.phobert_tokenizer import compare_tokenizers, convert_slow_tokenizer, fast_tokenizer_dir
+from services.vectorizer_service import PhoBERTVectorizer
+import argparse
+import json
+import os
+import sys
+
+MAX_LENGTH = 256
+
+
+def load_texts(args):
+    """
+    Loads article titles and contents from a JSONL dump or from the vector store metadata.
+    """
+    if args.jsonl:
+        with open(args.jsonl, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()][:args.limit]
+    else:
+        from services.vector_db_service import VectorDBService
+        records = [vector["metadata"] for vector in
+                   VectorDBService().iter_vectors(namespace=args.namespace, limit=args.limit)]
+    texts = []
+    for record in records:
+        texts.extend(text for text in (record.get("title"), record.get("content")) if text)
+    return [PhoBERTVectorizer.preprocess(text) for text in texts]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check fast vs slow PhoBERT tokenizer parity.")
+    parser.add_argument("--model", default="vinai/phobert-base")
+    parser.add_argument("--jsonl", help="JSONL file of articles with 'title' and 'content' fields.")
+    parser.add_argument("--namespace", default="title", help="Vector store namespace to read articles from.")
+    parser.add_argument("--limit", type=int, default=1000, help="Maximum number of articles.")
+    args = parser.parse_args()
+
+    texts = load_texts(args)
+    if not texts:
+        print("No articles found.")
+        return
+
+    slow_tokenizer = AutoTokenizer.from_pretrained(args.model, use_fast=False)
+    candidates = {"converted": convert_slow_tokenizer(slow_tokenizer)}
+    saved_dir = fast_tokenizer_dir(args.model)
+    if os.path.exists(os.path.join(saved_dir, "tokenizer.json")):
+        candidates["saved"] = PreTrainedTokenizerFast.from_pretrained(saved_dir)
+
+    failed = False
+    for name, fast_tokenizer in candidates.items():
+        mismatches = compare_tokenizers(slow_tokenizer, fast_tokenizer, texts, max_length=MAX_LENGTH)
+        print(f"{name}: {len(texts) - len(mismatches)}/{len(texts)} texts identical")
+        for text in mismatches[:5]:
+            print(f"  mismatch: {text[:120]!r}")
+        failed = failed or bool(mismatches)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
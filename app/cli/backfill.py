@@ -0,0 +1,274 @@
+# app/cli/backfill.py
+"""
+Offline backfill of historical articles.
+
+Reads archived article URLs, saved HTML pages or JSONL dumps, extracts them with the per-source
+selectors in a process pool, vectorizes titles in large batches and upserts them in chunks.
+Progress is checkpointed after every chunk so an interrupted run resumes where it stopped,
+and each stage reports its throughput in articles per second.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python cli/backfill.py --urls archive_urls.txt
+    python cli/backfill.py --html-dir dumps/html/
+    python cli/backfill.py --jsonl dumps/articles.jsonl --chunk-size 2048
+
+JSONL records need "source_url" (or "url") and either "html" (a saved page) or the
+already extracted "title", "content", "date" and "source" fields.
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from utils.extraction import extract_article
+from utils.logging_config import setup_logging
+from utils.scraper_helpers import polite_get, rate_limiter
+from utils.sqlite_helpers import data_path
+import argparse
+import hashlib
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+HTML_EXTENSIONS = (".html", ".htm")
+
+
+class StageStats:
+    """
+    Accumulates item counts and busy time per pipeline stage.
+    """
+
+    def __init__(self, stages):
+        self.stages = stages
+        self.counts = {stage: 0 for stage in stages}
+        self.seconds = {stage: 0.0 for stage in stages}
+
+    def record(self, stage, count, seconds):
+        self.counts[stage] += count
+        self.seconds[stage] += seconds
+
+    def report(self):
+        parts = []
+        for stage in self.stages:
+            if not self.counts[stage]:
+                continue
+            rate = self.counts[stage] / self.seconds[stage] if self.seconds[stage] else float("inf")
+            parts.append(f"{stage}: {self.counts[stage]} in {self.seconds[stage]:.1f}s ({rate:.1f}/s)")
+        return ", ".join(parts)
+
+
+def iter_inputs(args):
+    """
+    Yields input items in a deterministic order, so a checkpointed position can be skipped to on resume.
+    """
+    if args.urls:
+        with open(args.urls, encoding="utf-8") as f:
+            for line in f:
+                url = line.strip()
+                if url and not url.startswith("#"):
+                    yield {"url": url}
+    elif args.html_dir:
+        for root, dirs, files in os.walk(args.html_dir):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(HTML_EXTENSIONS):
+                    yield {"path": os.path.join(root, name)}
+    else:
+        with open(args.jsonl, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    logger.warning(f"Skipping invalid JSONL record: {e}")
+                    yield {}
+                    continue
+                url = record.get("source_url") or record.get("url")
+                if record.get("html"):
+                    yield {"url": url, "html": record["html"]}
+                else:
+                    yield {"url": url, "article": record}
+
+
+def fetch_html(item):
+    """
+    Downloads an archived URL through the per-host rate limiter. Runs in the fetch thread pool.
+    """
+    try:
+        response = polite_get(item["url"], timeout=15)
+        response.raise_for_status()
+        return dict(item, html=response.text)
+    except Exception as e:
+        logger.error(f"Failed to fetch {item['url']}: {e}")
+        return item
+
+
+def extract_item(item):
+    """
+    Turns an input item into an article dict, or None. Runs in the extraction process pool.
+    """
+    if "article" in item:
+        record = item["article"]
+        if not record.get("title") or not record.get("content") or not item.get("url"):
+            return None
+        return {
+            "title": record["title"],
+            "content": record["content"],
+            "date": record.get("date"),
+            "source": record.get("source", "Unknown"),
+            "source_url": item["url"],
+        }
+
+    html_content = item.get("html")
+    if html_content is None and item.get("path"):
+        with open(item["path"], "rb") as f:
+            html_content = f.read()
+    if not html_content:
+        return None
+
+    article = extract_article(html_content, item.get("url"))
+    if article is None or not article.get("title"):
+        return None
+    return article
+
+
+def input_signature(args):
+    key = json.dumps({"urls": args.urls, "html_dir": args.html_dir, "jsonl": args.jsonl}, sort_keys=True)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def load_checkpoint(path, signature):
+    if not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("signature") != signature:
+        raise ValueError(f"Checkpoint {path} belongs to different inputs. Use --restart or another --checkpoint.")
+    return checkpoint.get("next_index", 0)
+
+
+def save_checkpoint(path, signature, next_index, totals):
+    """
+    Writes the checkpoint atomically so a crash never leaves a half-written file.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"signature": signature, "next_index": next_index, "totals": totals,
+                   "updated_at": datetime.now().isoformat()}, f)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill historical articles into the vector database.")
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument("--urls", help="Text file with one archived article URL per line.")
+    inputs.add_argument("--html-dir", help="Directory of saved article pages (.html).")
+    inputs.add_argument("--jsonl", help="JSONL dump of articles or saved pages.")
+    parser.add_argument("--chunk-size", type=int, default=1024, help="Articles per checkpointed chunk.")
+    parser.add_argument("--fetch-workers", type=int, default=16, help="Threads used to download URLs.")
+    parser.add_argument("--extract-workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes used for HTML extraction.")
+    parser.add_argument("--embed-batch-size", type=int, default=64, help="Titles per model forward pass.")
+    parser.add_argument("--upsert-batch-size", type=int, default=100, help="Vectors per upsert request.")
+    parser.add_argument("--namespace", default="title", help="Namespace to upsert into.")
+    parser.add_argument("--content-namespace", default="content",
+                        help="Namespace for content passages ('' to skip them).")
+    parser.add_argument("--checkpoint", help="Checkpoint file (defaults to one per input under DATA_DIR).")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint.")
+    args = parser.parse_args()
+
+    setup_logging()
+    signature = input_signature(args)
+    checkpoint_path = args.checkpoint or data_path(f"backfill-{signature[:12]}.json")
+    start_index = 0 if args.restart else load_checkpoint(checkpoint_path, signature)
+    if start_index:
+        logger.info(f"Resuming backfill from input #{start_index} ({checkpoint_path}).")
+
+    stats = StageStats(["fetch", "extract", "embed", "upsert"])
+    totals = {"inputs": start_index, "stored": 0, "skipped": 0}
+
+    # The process pool is created before the model is loaded so workers do not inherit it
+    extract_pool = ProcessPoolExecutor(max_workers=args.extract_workers)
+    extract_pool.submit(os.getpid).result()  # Starts the worker processes now
+    fetch_pool = ThreadPoolExecutor(max_workers=args.fetch_workers)
+
+    from services.article_processor import ArticleProcessor
+    article_processor = ArticleProcessor()
+
+    items_iter = islice(iter_inputs(args), start_index, None)
+    next_index = start_index
+    run_start = time.perf_counter()
+
+    try:
+        while True:
+            items = list(islice(items_iter, args.chunk_size))
+            if not items:
+                break
+
+            to_fetch = [i for i, item in enumerate(items) if item.get("url") and "html" not in item
+                        and "article" not in item]
+            if to_fetch:
+                start = time.perf_counter()
+                for i, fetched in zip(to_fetch, fetch_pool.map(fetch_html, [items[i] for i in to_fetch])):
+                    items[i] = fetched
+                stats.record("fetch", len(to_fetch), time.perf_counter() - start)
+
+            start = time.perf_counter()
+            chunksize = max(1, len(items) // (args.extract_workers * 4))
+            extracted = list(extract_pool.map(extract_item, items, chunksize=chunksize))
+            stats.record("extract", len(items), time.perf_counter() - start)
+
+            articles = [article for article in extracted if article]
+            totals["skipped"] += len(items) - len(articles)
+            for article in articles:
+                if not article.get("date"):
+                    article["date"] = datetime.now()
+
+            if articles:
+                start = time.perf_counter()
+                titles = [article_processor.clean_text(article["title"]) for article in articles]
+                vectors = article_processor.vectorizer.encode_batch(titles, batch_size=args.embed_batch_size)
+                records = [
+                    article_processor.build_title_record(article, title, article["content"], vector)
+                    for article, title, vector in zip(articles, titles, vectors)
+                ]
+                stats.record("embed", len(records), time.perf_counter() - start)
+
+                start = time.perf_counter()
+                try:
+                    article_processor.upsert_records(
+                        records, namespace=args.namespace, batch_size=args.upsert_batch_size,
+                        content_namespace=args.content_namespace,
+                    )
+                    totals["stored"] += len(records)
+                except Exception as e:
+                    logger.error(f"Upsert failed for chunk starting at input #{next_index}: {e}")
+                    raise
+                stats.record("upsert", len(records), time.perf_counter() - start)
+
+            next_index += len(items)
+            totals["inputs"] = next_index
+            save_checkpoint(checkpoint_path, signature, next_index, totals)
+
+            elapsed = time.perf_counter() - run_start
+            if to_fetch:
+                logger.info(f"Crawl stats per host: {rate_limiter.stats()}")
+            logger.info(
+                f"Backfill progress: {next_index} inputs, {totals['stored']} stored, {totals['skipped']} skipped "
+                f"({totals['stored'] / elapsed:.1f} stored articles/s overall). {stats.report()}"
+            )
+    except (KeyboardInterrupt, SystemExit):
+        logger.info(f"Backfill interrupted. Resume from input #{next_index} by re-running the same command.")
+        raise
+    finally:
+        fetch_pool.shutdown(wait=False)
+        extract_pool.shutdown(wait=False)
+
+    logger.info(f"Backfill finished: {totals}. Stage throughput: {stats.report()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# app/cli/build_latest_index.py
+"""
+Fills the latest-articles index (services/latest_index.py) from the title records already in
+Pinecone, for articles stored before the index existed. Ingestion keeps it current afterwards.
+Stored vectors are only read; nothing is embedded.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python cli/build_latest_index.py
+    python cli/build_latest_index.py --namespace title --batch-size 500
+"""
+from services.latest_index import get_latest_index
+from services.vector_db_service import VectorDBService
+from utils.logging_config import setup_logging
+import argparse
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the latest-articles index from stored title records.")
+    parser.add_argument("--namespace", default="title", help="Logical title namespace to read.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Records written per transaction.")
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many records.")
+    args = parser.parse_args()
+
+    setup_logging()
+    latest_index = get_latest_index()
+    start = time.perf_counter()
+    batch, read, added = [], 0, 0
+    for vector in VectorDBService().iter_vectors(namespace=args.namespace, limit=args.limit):
+        if vector["metadata"].get("type", "title") != "title":
+            continue
+        batch.append(vector)
+        read += 1
+        if len(batch) >= args.batch_size:
+            added += len(latest_index.add_records(batch))
+            batch = []
+            logger.info(f"Indexed {read} articles ({added} new).")
+    if batch:
+        added += len(latest_index.add_records(batch))
+    logger.info(f"Indexed {read} articles ({added} new) in {time.perf_counter() - start:.1f}s; "
+                f"the index holds {latest_index.count()} articles.")
+
+
+if __name__ == "__main__":
+    main()
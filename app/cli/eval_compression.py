@@ -0,0 +1,111 @@
+# app/cli/eval_compression.py
+"""
+Measures how much recall compact embeddings give up against full-precision search.
+
+A sample of stored vectors is loaded and a held-out part of it is used as queries. The exact
+top-k neighbours under full-precision float32 cosine similarity are the ground truth. Each
+combination of projected dimension and storage type is then searched with a LocalVectorIndex
+and reported with its recall@k, bytes per vector and query latency.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python cli/eval_compression.py --limit 50000 --dims 0 384 256 --dtypes float32 float16 int8
+    python cli/eval_compression.py --projection data/projection-256.npz
+"""
+from services.local_index import STORAGE_DTYPES, LocalVectorIndex
+from services.projection import EmbeddingProjection, PCAAccumulator
+from services.vector_db_service import VectorDBService
+from utils.logging_config import setup_logging
+import argparse
+import logging
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def recall_at_k(results, truth, k):
+    """
+    Mean fraction of the true top-k IDs found in the returned top-k, over all queries.
+    """
+    hits = [len({vector_id for vector_id, _ in result[:k]} & set(expected)) for result, expected in zip(results, truth)]
+    return sum(hits) / float(k * len(truth))
+
+
+def evaluate(ids, corpus, queries, truth, projection, dtype, k):
+    """
+    Builds a compact index of the corpus and searches it. Returns a dict of measurements.
+    """
+    if projection is not None:
+        corpus, queries = projection.transform(corpus), projection.transform(queries)
+    index = LocalVectorIndex(corpus.shape[1], dtype=dtype)
+    index.add(ids, corpus)
+    start = time.perf_counter()
+    results = index.search(queries, top_k=k)
+    elapsed = time.perf_counter() - start
+    return {
+        "dim": corpus.shape[1],
+        "dtype": dtype,
+        "recall": recall_at_k(results, truth, k),
+        "bytes_per_vector": index.nbytes / max(len(index), 1),
+        "query_ms": elapsed * 1000 / max(len(queries), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report recall@k of projected and quantized embeddings.")
+    parser.add_argument("--namespace", default="title", help="Namespace whose vectors are sampled.")
+    parser.add_argument("--limit", type=int, default=50000, help="Vectors loaded from the namespace.")
+    parser.add_argument("--queries", type=int, default=500, help="Held-out vectors used as queries.")
+    parser.add_argument("-k", type=int, default=10, help="Neighbours compared per query.")
+    parser.add_argument("--dims", type=int, nargs="+", default=[0, 384, 256],
+                        help="Projected dimensions to try; 0 means no projection.")
+    parser.add_argument("--dtypes", nargs="+", default=list(STORAGE_DTYPES), choices=STORAGE_DTYPES)
+    parser.add_argument("--projection", help="Evaluate this fitted projection instead of fitting one per --dims.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup_logging()
+    vector_db = VectorDBService()
+    loaded = list(vector_db.iter_vectors(namespace=args.namespace, limit=args.limit))
+    if len(loaded) <= args.queries:
+        logger.error(f"Need more than {args.queries} vectors in namespace '{args.namespace}', found {len(loaded)}.")
+        raise SystemExit(1)
+
+    vectors = np.array([vector["values"] for vector in loaded], dtype=np.float32)
+    all_ids = [vector["id"] for vector in loaded]
+    del loaded
+    permutation = np.random.default_rng(args.seed).permutation(len(vectors))
+    query_rows, corpus_rows = permutation[:args.queries], permutation[args.queries:]
+    queries, corpus = vectors[query_rows], vectors[corpus_rows]
+    ids = [all_ids[row] for row in corpus_rows]
+
+    # Ground truth: exact full-precision cosine search
+    exact = LocalVectorIndex(corpus.shape[1], dtype="float32")
+    exact.add(ids, corpus)
+    truth = [[vector_id for vector_id, _ in result] for result in exact.search(queries, top_k=args.k)]
+    del exact
+
+    if args.projection:
+        projections = [EmbeddingProjection.load(args.projection)]
+    else:
+        projections = []
+        if any(dim for dim in args.dims):
+            # Fitted on the corpus only, so the held-out queries stay unseen
+            accumulator = PCAAccumulator(corpus.shape[1])
+            accumulator.add(corpus)
+        for dim in args.dims:
+            projections.append(accumulator.fit(dim) if dim else None)
+
+    print(f"{len(corpus)} vectors, {len(queries)} queries, recall@{args.k} against float32 {corpus.shape[1]}-d search")
+    print(f"{'dim':>5} {'dtype':>8} {'recall':>8} {'bytes/vec':>10} {'vs full':>8} {'ms/query':>9} {'variance':>9}")
+    full_bytes = corpus.shape[1] * 4
+    for projection in projections:
+        for dtype in args.dtypes:
+            result = evaluate(ids, corpus, queries, truth, projection, dtype, args.k)
+            variance = f"{projection.explained_variance:.1%}" if projection is not None else "100%"
+            print(f"{result['dim']:>5} {dtype:>8} {result['recall']:>8.3f} {result['bytes_per_vector']:>10.0f} "
+                  f"{result['bytes_per_vector'] / full_bytes:>8.1%} {result['query_ms']:>9.2f} {variance:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# app/cli/fit_projection.py
+"""
+Fits a PCA projection of the stored embeddings, for smaller vectors in Pinecone and local indexes.
+
+Vectors are streamed out of a namespace into running PCA statistics, so memory does not grow
+with the corpus. The projection is saved as an .npz file; point EMBEDDING_PROJECTION_PATH at it
+(and PINECONE_DIMENSION at its output dimension) to project every new embedding. Measure the
+recall cost first with cli/eval_compression.py.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python cli/fit_projection.py --dim 256
+    python cli/fit_projection.py --dim 384 --namespace title --limit 200000 --output data/projection-384.npz
+"""
+from services.projection import PCAAccumulator, default_projection_path
+from services.vector_db_service import VectorDBService
+from utils.logging_config import setup_logging
+import argparse
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit a PCA projection of stored embeddings.")
+    parser.add_argument("--dim", type=int, required=True, help="Output dimension (e.g. 256 or 384).")
+    parser.add_argument("--namespace", default="title", help="Namespace whose vectors are used.")
+    parser.add_argument("--limit", type=int, help="Use at most this many vectors.")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Vectors accumulated at a time.")
+    parser.add_argument("--output", help="Output file (default: DATA_DIR/projection-<dim>.npz).")
+    args = parser.parse_args()
+
+    setup_logging()
+    vector_db = VectorDBService()
+    accumulator = None
+    batch = []
+
+    for vector in vector_db.iter_vectors(namespace=args.namespace, limit=args.limit):
+        batch.append(vector["values"])
+        if len(batch) >= args.batch_size:
+            accumulator = accumulator or PCAAccumulator(len(batch[0]))
+            accumulator.add(np.array(batch, dtype=np.float32))
+            batch = []
+            logger.info(f"Accumulated {accumulator.count} vectors.")
+    if batch:
+        accumulator = accumulator or PCAAccumulator(len(batch[0]))
+        accumulator.add(np.array(batch, dtype=np.float32))
+
+    if accumulator is None:
+        logger.error(f"No vectors found in namespace '{args.namespace}'.")
+        raise SystemExit(1)
+    if args.dim >= len(accumulator.total):
+        logger.error(f"--dim must be below the stored dimension ({len(accumulator.total)}).")
+        raise SystemExit(1)
+
+    projection = accumulator.fit(args.dim)
+    output = args.output or default_projection_path(args.dim)
+    projection.save(output)
+    logger.info(f"Fitted a {projection.input_dim} -> {projection.output_dim} projection on {accumulator.count} "
+                f"vectors, keeping {projection.explained_variance:.1%} of the variance. Saved to {output}.")
+
+
+if __name__ == "__main__":
+    main()
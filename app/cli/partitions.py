@@ -0,0 +1,63 @@
+# app/cli/partitions.py
+"""
+Manages the monthly partitions of time-partitioned namespaces (services/partitions.py).
+
+    list       show every partition with its status
+    retention  drop (or archive, then drop) partitions older than the retention window
+    migrate    move vectors written before partitioning was enabled into their monthly partitions
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python cli/partitions.py list
+    python cli/partitions.py retention --months 12 --archive-dir /backups/partitions --dry-run
+    python cli/partitions.py migrate --namespace title
+"""
+from services.namespace_registry import get_namespace_registry
+from services.partitions import (
+    TIME_PARTITION_ARCHIVE_DIR, TIME_PARTITION_RETENTION_MONTHS, apply_retention, is_partitioned,
+    migrate_unpartitioned,
+)
+from services.vector_db_service import VectorDBService
+from utils.logging_config import setup_logging
+import argparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage monthly namespace partitions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List partitions.")
+    retention = commands.add_parser("retention", help="Expire partitions older than the retention window.")
+    retention.add_argument("--months", type=int, default=TIME_PARTITION_RETENTION_MONTHS,
+                           help="Months kept, counting the current one.")
+    retention.add_argument("--archive-dir", default=TIME_PARTITION_ARCHIVE_DIR,
+                           help="Write expired partitions here before dropping them.")
+    retention.add_argument("--dry-run", action="store_true")
+    migrate = commands.add_parser("migrate", help="Move unpartitioned vectors into monthly partitions.")
+    migrate.add_argument("--namespace", default="title", help="Logical namespace to migrate.")
+    args = parser.parse_args()
+
+    setup_logging()
+    registry = get_namespace_registry()
+    vector_db = VectorDBService()
+
+    if args.command == "list":
+        for index_name, base in registry.partitioned_bases():
+            for partition in registry.partitions(index_name, base, status=None):
+                print(f"{index_name:<20} {base:<24} {partition['month']}  {partition['namespace']:<32} {partition['status']}")
+    elif args.command == "retention":
+        if args.months <= 0:
+            parser.error("Set --months or TIME_PARTITION_RETENTION_MONTHS to a positive number.")
+        expired = apply_retention(vector_db, months=args.months, archive_dir=args.archive_dir, dry_run=args.dry_run)
+        logger.info(f"{len(expired)} partitions expired{' (dry run)' if args.dry_run else ''}.")
+    elif args.command == "migrate":
+        index_name, base = vector_db.resolve(args.namespace)
+        if not is_partitioned(base):
+            parser.error(f"'{base}' is not time-partitioned; set TIME_PARTITIONS_ENABLED=true first.")
+        moved = migrate_unpartitioned(vector_db, index_name, base)
+        logger.info(f"Moved {moved} vectors from {base} into monthly partitions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# app/cli/reextract.py
+"""
+Re-extracts archived pages after a source's selectors change.
+
+Reads every page in the raw HTML archive (services/html_archive.py), runs the current scraper
+extraction over it in the extraction process pool and compares the result with the content
+stored when the page was crawled. Only articles whose content changed are re-vectorized and
+upserted. No page is downloaded again.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python cli/reextract.py --source thanhnien
+    python cli/reextract.py --dry-run
+"""
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from services.extraction_pool import EXTRACT_PROCESSES, get_extraction_pool
+from services.html_archive import HtmlArchive, content_hash
+from utils.logging_config import setup_logging
+import argparse
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def reextract_page(archive, scrapers, page):
+    """
+    Rebuilds the article of an archived page with the current extraction rules.
+    Returns the article dict, or None if nothing could be extracted.
+    """
+    module, _ = scrapers[page["source"]]
+    html_content = archive.get(page["sha256"])
+    if html_content is None:
+        logger.warning(f"Archived page of {page['url']} is missing.")
+        return None
+    entry = dict(page["entry"], link=page["url"], html=html_content)
+    return module.extract_article(entry)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-run source extraction over the raw HTML archive.")
+    parser.add_argument("--source", help="Only re-extract pages of this scraper (e.g. thanhnien).")
+    parser.add_argument("--since", type=float, help="Only pages fetched after this Unix timestamp.")
+    parser.add_argument("--chunk-size", type=int, default=512, help="Pages per batch.")
+    parser.add_argument("--workers", type=int, default=EXTRACT_PROCESSES,
+                        help="Pages extracted at once (each is parsed in the extraction process pool).")
+    parser.add_argument("--namespace", default="title", help="Namespace to upsert into.")
+    parser.add_argument("--content-namespace", default="content",
+                        help="Namespace for content passages ('' to skip them).")
+    parser.add_argument("--dry-run", action="store_true", help="Only report which articles changed.")
+    args = parser.parse_args()
+
+    setup_logging()
+    # Start the extraction processes before the model is loaded
+    get_extraction_pool()
+    from api.scrapers.registry import SCRAPERS
+    from services.article_processor import ArticleProcessor
+
+    if args.source and args.source not in SCRAPERS:
+        parser.error(f"Unknown source {args.source}. Choose from: {', '.join(SCRAPERS)}")
+
+    archive = HtmlArchive()
+    article_processor = None if args.dry_run else ArticleProcessor()
+    pool = ThreadPoolExecutor(max_workers=args.workers)
+    totals = {"pages": 0, "unchanged": 0, "changed": 0, "empty": 0, "updated": 0}
+    start = time.perf_counter()
+
+    pages = (page for page in archive.iter_pages(args.source, args.since) if page["source"] in SCRAPERS)
+    try:
+        while True:
+            chunk = list(islice(pages, args.chunk_size))
+            if not chunk:
+                break
+            totals["pages"] += len(chunk)
+
+            articles = list(pool.map(lambda page: reextract_page(archive, SCRAPERS, page), chunk))
+            changed = []
+            for page, article in zip(chunk, articles):
+                if not article or not article.get("content"):
+                    totals["empty"] += 1
+                elif content_hash(article["content"]) == page["content_sha1"]:
+                    totals["unchanged"] += 1
+                else:
+                    changed.append((page, article))
+            totals["changed"] += len(changed)
+
+            if changed and not args.dry_run:
+                records = article_processor.build_title_records([article for _, article in changed])
+                stored = [(page, article, record) for (page, article), record in zip(changed, records) if record]
+                if stored:
+                    # Passages of the old content are replaced, including any beyond the new count
+                    article_processor.upsert_records([record for _, _, record in stored], namespace=args.namespace,
+                                                     content_namespace=args.content_namespace, replace_chunks=True)
+                for page, article, _ in stored:
+                    archive.record_content(page["url"], article["content"])
+                totals["updated"] += len(stored)
+            elif changed:
+                for page, _ in changed:
+                    logger.info(f"Content changed: {page['url']}")
+
+            elapsed = time.perf_counter() - start
+            logger.info(f"Re-extraction progress: {totals} ({totals['pages'] / elapsed:.1f} pages/s).")
+    finally:
+        pool.shutdown(wait=False)
+
+    logger.info(f"Re-extraction finished: {totals}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# app/cli/reindex.py
+"""
+Blue/green re-index, for a new embedding model, new cleaning rules or a new dimension.
+
+The articles stored in the namespace currently serving an alias (titles with their content as
+metadata) are re-embedded into new namespaces, "<alias>-<version>", while search keeps using
+the old ones. Reading, batched embedding and parallel upserts run as a pipeline. Articles
+added while the copy ran are caught up, then the copy is verified: the new namespace must hold
+every article and a sample of titles must find their own article. Finally the title and content
+aliases are switched together in the namespace registry (services/namespace_registry.py). Every
+process picks up the switch within NAMESPACE_REGISTRY_TTL_SECONDS. The old namespaces are left
+in place for --rollback.
+
+For a new dimension, run this with the new settings (e.g. EMBEDDING_PROJECTION_PATH) and a new
+PINECONE_INDEX_NAME; the new index is created and the aliases point into it. Processes still on
+the old settings keep using the previous namespaces until they are restarted.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python cli/reindex.py
+    python cli/reindex.py --version v2 --embed-batch-size 128 --upsert-workers 8
+    python cli/reindex.py --rollback
+"""
+from services.namespace_registry import NAMESPACE_REGISTRY_TTL_SECONDS, get_namespace_registry
+from services.scrape_pipeline import Pipeline
+from utils.logging_config import setup_logging
+from datetime import datetime
+import argparse
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def article_from_metadata(metadata):
+    """
+    Rebuilds the article dict stored in a title record's metadata.
+    """
+    return {
+        "title": metadata.get("title", ""),
+        "content": metadata.get("content", ""),
+        "source_url": metadata.get("source_url", ""),
+        "date": metadata.get("date", ""),
+        "source": metadata.get("source", ""),
+    }
+
+
+class Reindexer:
+    """
+    Copies the articles of a source title namespace into target title and content namespaces,
+    re-embedding them on the way.
+    """
+
+    def __init__(self, article_processor, source, target, content_target, args):
+        self.article_processor = article_processor
+        self.vector_db = article_processor.vector_db
+        self.source_index, self.source_namespace = source
+        self.target = target
+        self.content_target = content_target
+        self.args = args
+        self.copied = set()
+        self.skipped = set()
+        self._lock = threading.Lock()
+
+    def iter_source(self, ids=None):
+        """
+        Yields source vectors: all of them, or only the given IDs.
+        """
+        if ids is None:
+            yield from self.vector_db.iter_vectors(namespace=self.source_namespace, index_name=self.source_index)
+            return
+        ids = list(ids)
+        for start in range(0, len(ids), 100):
+            batch = ids[start:start + 100]
+            metadata = self.vector_db.fetch_metadata(batch, namespace=self.source_namespace,
+                                                     index_name=self.source_index)
+            for vector_id in batch:
+                if vector_id in metadata:
+                    yield {"id": vector_id, "metadata": metadata[vector_id]}
+
+    def embed(self, vectors):
+        records = self.article_processor.build_title_records(
+            [article_from_metadata(vector["metadata"]) for vector in vectors],
+            embed_batch_size=self.args.embed_batch_size,
+        )
+        with self._lock:
+            self.skipped.update(vector["id"] for vector, record in zip(vectors, records) if record is None)
+        return [record for record in records if record is not None]
+
+    def upsert(self, records):
+        self.article_processor.upsert_records(records, namespace=self.target, content_namespace=self.content_target,
+                                              run_hooks=False)
+        with self._lock:
+            self.copied.update(record["id"] for record in records)
+        return None
+
+    def copy(self, ids=None):
+        """
+        Runs the copy pipeline over the source (or the given IDs). Returns per-stage statistics.
+        """
+        pipeline = Pipeline("reindex")
+        pipeline.add_stage("embed", self.embed, batch_size=self.args.embed_batch_size, batch_timeout=2.0)
+        pipeline.add_stage("upsert", self.upsert, workers=self.args.upsert_workers,
+                           batch_size=self.args.upsert_batch_size, batch_timeout=2.0)
+        return pipeline.run(self.iter_source(ids))
+
+    def catch_up(self):
+        """
+        Copies source articles that are not in the target yet (added while copying).
+        Returns the number of source IDs that were missing.
+        """
+        source_ids = set(self.vector_db.list_ids(namespace=self.source_namespace, index_name=self.source_index))
+        missing = source_ids - self.copied - self.skipped
+        if missing:
+            logger.info(f"Catching up {len(missing)} articles added during the re-index.")
+            self.copy(missing)
+        return len(source_ids)
+
+    def verify(self, source_count):
+        """
+        Checks the target's article count and the sampled self-recall of titles.
+        Returns (ok, report).
+        """
+        target_count = len(self.vector_db.list_ids(namespace=self.target))
+        expected = source_count - len(self.skipped)
+        count_ok = target_count >= expected * (1 - self.args.count_tolerance)
+
+        sample_ids = random.Random(0).sample(sorted(self.copied), min(self.args.sample, len(self.copied)))
+        metadata = self.vector_db.fetch_metadata(sample_ids, namespace=self.target) if sample_ids else {}
+        hits = 0
+        for vector_id, fields in metadata.items():
+            matches = self.vector_db.query_vectors(fields.get("title", ""), namespace=self.target,
+                                                   top_k=self.args.recall_k)
+            hits += any(match["id"] == vector_id for match in matches)
+        recall = hits / float(len(metadata)) if metadata else 0.0
+        recall_ok = recall >= self.args.min_recall
+
+        report = {
+            "source_count": source_count, "skipped": len(self.skipped), "target_count": target_count,
+            f"recall@{self.args.recall_k}": round(recall, 3), "sampled": len(metadata),
+        }
+        return count_ok and recall_ok, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-embed stored articles into new namespaces and switch to them.")
+    parser.add_argument("--alias", default="title", help="Logical title namespace to re-index.")
+    parser.add_argument("--content-alias", default="content",
+                        help="Logical content-passage namespace switched with it ('' to skip passages).")
+    parser.add_argument("--version", default=datetime.now().strftime("v%Y%m%d%H%M%S"),
+                        help="Suffix of the new namespaces.")
+    parser.add_argument("--embed-batch-size", type=int, default=128, help="Titles per model forward pass.")
+    parser.add_argument("--upsert-batch-size", type=int, default=100, help="Vectors per upsert request.")
+    parser.add_argument("--upsert-workers", type=int, default=4,
+                        help="Parallel upserts (each also embeds the passages of its articles).")
+    parser.add_argument("--sample", type=int, default=200, help="Titles queried to check recall.")
+    parser.add_argument("--recall-k", type=int, default=5)
+    parser.add_argument("--min-recall", type=float, default=0.9, help="Required share of titles finding themselves.")
+    parser.add_argument("--count-tolerance", type=float, default=0.0, help="Allowed share of missing articles.")
+    parser.add_argument("--no-switch", action="store_true", help="Copy and verify, but keep serving the old namespaces.")
+    parser.add_argument("--rollback", action="store_true", help="Point the aliases back at their previous namespaces.")
+    args = parser.parse_args()
+
+    setup_logging()
+    registry = get_namespace_registry()
+    aliases = [alias for alias in (args.alias, args.content_alias) if alias]
+    if args.rollback:
+        registry.rollback(aliases)
+        logger.info(f"Rolled back {aliases}: {[registry.resolve(alias) for alias in aliases]}")
+        return
+
+    from services.article_processor import ArticleProcessor
+    article_processor = ArticleProcessor()
+    vector_db = article_processor.vector_db
+    dimension = vector_db.vectorizer.target_dim
+    if dimension != vector_db.dimension:
+        logger.error(f"The embedder produces {dimension}-d vectors but PINECONE_DIMENSION is {vector_db.dimension}.")
+        raise SystemExit(1)
+
+    source_index, source_namespace = registry.resolve(args.alias)
+    source_index = source_index or vector_db.index_name
+    if source_index != vector_db.index_name:
+        # Moving to another index (e.g. a new dimension): make sure the target index exists
+        vector_db.create_index(vector_db.index_name, dimension)
+    target = f"{args.alias}-{args.version}"
+    content_target = f"{args.content_alias}-{args.version}" if args.content_alias else None
+    logger.info(f"Re-indexing {source_namespace} ({source_index}) into {target} and {content_target} "
+                f"({vector_db.index_name}).")
+
+    reindexer = Reindexer(article_processor, (source_index, source_namespace), target, content_target, args)
+    start = time.perf_counter()
+    stats = reindexer.copy()
+    source_count = reindexer.catch_up()
+    elapsed = time.perf_counter() - start
+    logger.info(f"Copied {len(reindexer.copied)} articles in {elapsed:.0f}s "
+                f"({len(reindexer.copied) / max(elapsed, 1e-9):.1f} articles/s): {stats}")
+
+    ok, report = reindexer.verify(source_count)
+    logger.info(f"Verification: {report}")
+    if not ok:
+        logger.error(f"Verification failed; still serving {source_namespace}. New namespaces kept for inspection.")
+        raise SystemExit(1)
+    if args.no_switch:
+        logger.info("Verified; not switching (--no-switch).")
+        return
+
+    targets = {args.alias: (vector_db.index_name, target, dimension)}
+    if args.content_alias:
+        targets[args.content_alias] = (vector_db.index_name, content_target, dimension)
+    registry.switch(targets, details=report)
+
+    # Writers that resolved the old namespace just before the switch may still add to it
+    time.sleep(NAMESPACE_REGISTRY_TTL_SECONDS * 2)
+    reindexer.catch_up()
+    logger.info(f"Switched {list(targets)} to {target}. Roll back with: python cli/reindex.py --rollback")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# app/cli/snapshot.py
+"""
+Exports a namespace to a compact snapshot and restores it (services/snapshot.py).
+
+    export   write every vector of a namespace (all its monthly partitions) to a snapshot directory
+    restore  bulk-load a snapshot into a namespace, or into a local index file (--local-index)
+    info     print a snapshot's manifest summary
+
+Restoring into a logical namespace goes through the namespace registry and time partitioning like
+any other write, so archived partitions (TIME_PARTITION_ARCHIVE_DIR) can be restored the same way.
+
+Usage (from the app directory, with PYTHONPATH=. as in the containers):
+    python cli/snapshot.py export --namespace title --output /backups/title-2024-06
+    python cli/snapshot.py export --namespace content --output /backups/content --dtype float16
+    python cli/snapshot.py restore --input /backups/title-2024-06 --namespace title --workers 8
+    python cli/snapshot.py restore --input /backups/title-2024-06 --local-index data/title-int8.npz --dtype int8
+"""
+from services.snapshot import (
+    SNAPSHOT_CHUNK_SIZE, SNAPSHOT_DTYPES, SnapshotReader, export_namespace, restore_to_local_index,
+    restore_to_pinecone,
+)
+from utils.logging_config import setup_logging
+import argparse
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export and restore vector snapshots.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Write a namespace to a snapshot.")
+    export.add_argument("--namespace", default="title", help="Logical namespace (or physical, with --index-name).")
+    export.add_argument("--index-name", default=None, help="Read a physical namespace of this index.")
+    export.add_argument("--output", required=True, help="Snapshot directory.")
+    export.add_argument("--dtype", choices=SNAPSHOT_DTYPES, default="float32",
+                        help="Vector storage; float32 is exact, float16 and int8 are smaller.")
+    export.add_argument("--chunk-size", type=int, default=SNAPSHOT_CHUNK_SIZE, help="Vectors per chunk file.")
+    export.add_argument("--workers", type=int, default=8, help="Parallel fetch requests.")
+    restore = commands.add_parser("restore", help="Load a snapshot.")
+    restore.add_argument("--input", required=True, help="Snapshot directory.")
+    restore.add_argument("--namespace", default=None, help="Target namespace (default: the exported one).")
+    restore.add_argument("--workers", type=int, default=4, help="Parallel upsert requests or chunk decoders.")
+    restore.add_argument("--batch-size", type=int, default=100, help="Vectors per upsert request.")
+    restore.add_argument("--local-index", default=None, help="Build a local index file instead of upserting.")
+    restore.add_argument("--dtype", choices=SNAPSHOT_DTYPES, default="float32", help="Local index storage.")
+    info = commands.add_parser("info", help="Summarize a snapshot.")
+    info.add_argument("--input", required=True)
+    args = parser.parse_args()
+
+    setup_logging()
+    start = time.perf_counter()
+
+    if args.command == "info":
+        manifest = SnapshotReader(args.input).manifest
+        print(f"{manifest['count']} vectors, {manifest['dim']}-d {manifest['dtype']}, {len(manifest['chunks'])} chunks, "
+              f"{manifest['bytes'] / 1e6:.1f} MB ({manifest['bytes'] / max(manifest['count'], 1):.0f} B/vector), "
+              f"source {manifest['source']}, created {manifest['created_at']}")
+        return
+
+    if args.command == "export":
+        from services.vector_db_service import VectorDBService
+        manifest = export_namespace(VectorDBService(), args.namespace, args.output, dtype=args.dtype,
+                                    chunk_size=args.chunk_size, fetch_workers=args.workers,
+                                    index_name=args.index_name)
+        count, size = manifest["count"], manifest["bytes"]
+        elapsed = time.perf_counter() - start
+        logger.info(f"Exported {count} vectors to {args.output} in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.0f} "
+                    f"vectors/s), {size / 1e6:.1f} MB ({size / max(count, 1):.0f} B/vector).")
+        return
+
+    if args.local_index:
+        index, _ = restore_to_local_index(args.input, dtype=args.dtype, workers=args.workers)
+        index.save(args.local_index)
+        count = len(index.ids)
+        target = args.local_index
+    else:
+        from services.vector_db_service import VectorDBService
+        namespace = args.namespace or SnapshotReader(args.input).manifest["source"].get("namespace", "title")
+        count = restore_to_pinecone(VectorDBService(), args.input, namespace, workers=args.workers,
+                                    batch_size=args.batch_size)
+        target = f"namespace {namespace}"
+    elapsed = time.perf_counter() - start
+    logger.info(f"Restored {count} vectors into {target} in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.0f} vectors/s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# app/gunicorn.conf.py
+"""
+Production server settings: gunicorn -c gunicorn.conf.py main:app
+
+The app and, unless the shared embedding service is used, the PhoBERT model are loaded once in
+the master before the workers are forked, so every worker shares the weights copy-on-write
+instead of loading its own copy.
+"""
+import gc
+import logging
+import os
+
+logger = logging.getLogger("gunicorn.error")
+
+bind = os.getenv("WEB_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_WORKERS", "2"))
+# Threads per worker; requests mostly wait on Pinecone and Gemini
+worker_class = "gthread"
+threads = int(os.getenv("WEB_THREADS", "4"))
+timeout = int(os.getenv("WEB_TIMEOUT", "120"))
+preload_app = True
+
+# Torch threads per worker, so workers x threads does not exceed the cores
+TORCH_THREADS_PER_WORKER = int(os.getenv("TORCH_THREADS_PER_WORKER", str(max(1, (os.cpu_count() or 1) // workers))))
+
+
+def on_starting(server):
+    """
+    Runs in the master after the app is preloaded: loads the model before any worker is forked.
+    """
+    if os.getenv("EMBEDDING_SERVICE_URL"):
+        return
+    import torch
+    from services.vectorizer_service import get_vectorizer
+
+    # A single intra-op thread in the master means no OpenMP thread pool exists at fork time
+    torch.set_num_threads(1)
+    vectorizer = get_vectorizer()
+    vectorizer.encode_text("tin tức mới nhất")
+    # Move everything allocated so far out of the collector's reach, so garbage collection in the
+    # workers does not touch (and copy) the shared pages
+    gc.freeze()
+    logger.info("PhoBERT preloaded in the master; workers will share it copy-on-write.")
+
+
+def post_fork(server, worker):
+    if not os.getenv("EMBEDDING_SERVICE_URL"):
+        import torch
+        torch.set_num_threads(TORCH_THREADS_PER_WORKER)
+    # The model is already loaded; this connects each worker to the Pinecone index
+    from services.warmup import start_warmup
+    start_warmup()
+    logger.info(f"Worker {worker.pid} started with {TORCH_THREADS_PER_WORKER} torch threads.")
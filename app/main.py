@@ -2,6 +2,8 @@
 from flask import Flask
 from flask_cors import CORS  # type: ignore
 from api.routes import api
+from api.health import health
+from services.warmup import start_warmup
 from utils.logging_config import setup_logging
 
 # Initialize logging
@@ -12,11 +14,14 @@ CORS(app)
 
 # Register Blueprints for API
 app.register_blueprint(api, url_prefix='/api')
+app.register_blueprint(health)
 
 @app.route('/')
 def home():
     return "RAG AI News Aggregator Backend"
 
 if __name__ == "__main__":
+    # Load the model and check the index in the background; /readyz reports when both are done
+    start_warmup()
     print("Starting Flask server...")
     app.run(host="0.0.0.0", port=5000)
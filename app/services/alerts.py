@@ -0,0 +1,303 @@
+# app/services/alerts.py
+"""
+Saved-query alerts, matched at ingest time by reverse search. Each saved query is embedded once
+and kept, normalized, as a row of an in-memory matrix. Every batch of stored title records is
+scored against all saved queries with one matrix product and compared with per-query thresholds.
+Only the few (query, article) pairs above threshold are checked against keyword, source and
+category filters, then written to a notification outbox that delivery jobs read.
+"""
+from contextlib import closing
+from services.local_index import normalize_rows
+from utils.sqlite_helpers import connect, data_path
+import json
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ALERTS_ENABLED = os.getenv("ALERTS_ENABLED", "true").lower() in ("1", "true", "yes")
+# Cosine similarity a title needs to trigger a saved query without its own threshold
+ALERT_DEFAULT_THRESHOLD = float(os.getenv("ALERT_DEFAULT_THRESHOLD", "0.85"))
+# How long a process keeps its query matrix before checking for added or removed queries
+ALERT_RELOAD_SECONDS = float(os.getenv("ALERT_RELOAD_SECONDS", "5"))
+# Saved queries scored per matrix product, bounding the temporary score matrix
+ALERT_MATCH_BLOCK_ROWS = int(os.getenv("ALERT_MATCH_BLOCK_ROWS", "65536"))
+
+
+class QueryMatrix:
+    """
+    Saved-query vectors of one dimension, normalized, with their thresholds.
+    """
+
+    def __init__(self, query_ids, vectors, thresholds):
+        self.query_ids = np.asarray(query_ids, dtype=np.int64)
+        self.vectors = normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(len(query_ids), -1))
+        self.thresholds = np.asarray(thresholds, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.query_ids)
+
+    def match(self, article_vectors):
+        """
+        Scores articles against every saved query. Returns (query row, article index, score)
+        arrays for the pairs at or above the query's threshold.
+        """
+        articles = normalize_rows(np.asarray(article_vectors, dtype=np.float32))
+        rows, columns, scores = [], [], []
+        for start in range(0, len(self.query_ids), ALERT_MATCH_BLOCK_ROWS):
+            block = self.vectors[start:start + ALERT_MATCH_BLOCK_ROWS] @ articles.T
+            hit_rows, hit_columns = np.nonzero(block >= self.thresholds[start:start + ALERT_MATCH_BLOCK_ROWS, None])
+            rows.append(hit_rows + start)
+            columns.append(hit_columns)
+            scores.append(block[hit_rows, hit_columns])
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        return np.concatenate(rows), np.concatenate(columns), np.concatenate(scores)
+
+
+def fold_text(text):
+    """
+    Lowercases text and reduces punctuation to spaces, padded so " keyword " matches whole words.
+    Diacritics are kept: they distinguish Vietnamese words.
+    """
+    text = re.sub(r"[^\w\s]", " ", unicodedata.normalize("NFC", text or "").lower())
+    return f" {' '.join(text.split())} "
+
+
+def passes_filters(saved_query, metadata, article_text=None):
+    """
+    Checks a candidate article against a saved query's source, category and keyword filters.
+    Keywords must all appear as whole words in the title or content (ignoring case).
+    """
+    if saved_query["sources"] and metadata.get("source") not in saved_query["sources"]:
+        return False
+    if saved_query["categories"] and metadata.get("category") not in saved_query["categories"]:
+        return False
+    if saved_query["keywords"]:
+        if article_text is None:
+            article_text = fold_text(f"{metadata.get('title', '')} {metadata.get('content', '')}")
+        return all(f" {keyword} " in article_text for keyword in saved_query["keywords"])
+    return True
+
+
+class AlertStore:
+    """
+    Saved queries, their vectors and the notification outbox, in a SQLite file shared by the
+    API (which manages saved queries) and every ingesting process (which matches them).
+    """
+
+    def __init__(self, path=None, reload_seconds=ALERT_RELOAD_SECONDS):
+        self.path = path or os.getenv("ALERTS_PATH") or data_path("alerts.db")
+        self.reload_seconds = reload_seconds
+        self._lock = threading.Lock()
+        self._matrices = {}  # dim -> QueryMatrix
+        self._queries = {}  # id -> saved query dict (filters only)
+        self._version = None
+        self._next_check = 0.0
+        with closing(connect(self.path)) as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS saved_queries (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    owner TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    threshold REAL NOT NULL,
+                    keywords TEXT NOT NULL,
+                    sources TEXT NOT NULL,
+                    categories TEXT NOT NULL,
+                    dimension INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS saved_queries_owner ON saved_queries (owner);
+                CREATE TABLE IF NOT EXISTS alert_outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    saved_query_id INTEGER NOT NULL,
+                    owner TEXT NOT NULL,
+                    article_id TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    UNIQUE (saved_query_id, article_id)
+                );
+                CREATE INDEX IF NOT EXISTS alert_outbox_owner ON alert_outbox (owner, id);
+                CREATE TABLE IF NOT EXISTS alert_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+                INSERT OR IGNORE INTO alert_meta (key, value) VALUES ('version', 0);
+            """)
+
+    @staticmethod
+    def _bump_version(conn):
+        conn.execute("UPDATE alert_meta SET value = value + 1 WHERE key = 'version'")
+
+    def add(self, owner, query, vector, threshold=None, keywords=None, sources=None, categories=None):
+        """
+        Saves a query with its embedding. Returns the saved query (without its vector).
+        """
+        vector = np.asarray(vector, dtype=np.float32)
+        row = (
+            owner, query, ALERT_DEFAULT_THRESHOLD if threshold is None else float(threshold),
+            json.dumps([fold_text(keyword).strip() for keyword in keywords or [] if fold_text(keyword).strip()],
+                       ensure_ascii=False),
+            json.dumps(list(sources or []), ensure_ascii=False), json.dumps(list(categories or []), ensure_ascii=False),
+            len(vector), vector.tobytes(), time.time(),
+        )
+        with closing(connect(self.path)) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = conn.execute(
+                    "INSERT INTO saved_queries (owner, query, threshold, keywords, sources, categories, dimension, "
+                    "vector, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    row,
+                )
+                self._bump_version(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        self.invalidate()
+        return self.get(cursor.lastrowid)
+
+    @staticmethod
+    def _saved_query(row):
+        return {
+            "id": row["id"], "owner": row["owner"], "query": row["query"], "threshold": row["threshold"],
+            "keywords": json.loads(row["keywords"]), "sources": json.loads(row["sources"]),
+            "categories": json.loads(row["categories"]), "created_at": row["created_at"],
+        }
+
+    def get(self, query_id):
+        with closing(connect(self.path)) as conn:
+            row = conn.execute("SELECT * FROM saved_queries WHERE id = ?", (query_id,)).fetchone()
+        return self._saved_query(row) if row else None
+
+    def list(self, owner=None):
+        query, params = "SELECT * FROM saved_queries", ()
+        if owner is not None:
+            query, params = query + " WHERE owner = ?", (owner,)
+        with closing(connect(self.path)) as conn:
+            return [self._saved_query(row) for row in conn.execute(query + " ORDER BY id", params).fetchall()]
+
+    def delete(self, query_id):
+        """
+        Deletes a saved query and its pending notifications. Returns False if it did not exist.
+        """
+        with closing(connect(self.path)) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                deleted = conn.execute("DELETE FROM saved_queries WHERE id = ?", (query_id,)).rowcount
+                conn.execute("DELETE FROM alert_outbox WHERE saved_query_id = ?", (query_id,))
+                self._bump_version(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        self.invalidate()
+        return bool(deleted)
+
+    def notifications(self, owner=None, after=0, limit=100):
+        """
+        Returns outbox entries with an ID above after, oldest first, for delivery or display.
+        """
+        query = "SELECT * FROM alert_outbox WHERE id > ?"
+        params = (after,)
+        if owner is not None:
+            query += " AND owner = ?"
+            params += (owner,)
+        with closing(connect(self.path)) as conn:
+            rows = conn.execute(query + " ORDER BY id LIMIT ?", params + (limit,)).fetchall()
+        return [
+            {"id": row["id"], "saved_query_id": row["saved_query_id"], "owner": row["owner"],
+             "article_id": row["article_id"], "score": row["score"], "article": json.loads(row["payload"]),
+             "created_at": row["created_at"]}
+            for row in rows
+        ]
+
+    def invalidate(self):
+        with self._lock:
+            self._next_check = 0.0
+
+    def _load(self):
+        """
+        Reloads the query matrices when saved queries changed (checked every reload_seconds).
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + self.reload_seconds
+        with closing(connect(self.path)) as conn:
+            version = conn.execute("SELECT value FROM alert_meta WHERE key = 'version'").fetchone()[0]
+            if version == self._version:
+                return
+            rows = conn.execute("SELECT * FROM saved_queries ORDER BY id").fetchall()
+        groups = {}
+        for row in rows:
+            ids, vectors, thresholds = groups.setdefault(row["dimension"], ([], [], []))
+            ids.append(row["id"])
+            vectors.append(np.frombuffer(row["vector"], dtype=np.float32))
+            thresholds.append(row["threshold"])
+        matrices = {
+            dim: QueryMatrix(ids, np.stack(vectors), thresholds) for dim, (ids, vectors, thresholds) in groups.items()
+        }
+        queries = {row["id"]: self._saved_query(row) for row in rows}
+        with self._lock:
+            self._matrices, self._queries, self._version = matrices, queries, version
+        logger.info(f"Loaded {len(rows)} saved queries for alert matching.")
+
+    def match_records(self, records):
+        """
+        Matches stored title records against every saved query and writes the matches to the
+        outbox (once per query and article). Returns the number of new notifications.
+        """
+        if not records:
+            return 0
+        self._load()
+        with self._lock:
+            matrix = self._matrices.get(len(records[0]["values"]))
+            queries = self._queries
+        if matrix is None or not len(matrix):
+            return 0
+
+        rows, columns, scores = matrix.match([record["values"] for record in records])
+        texts = {}
+        now = time.time()
+        outbox = []
+        for row, column, score in zip(rows.tolist(), columns.tolist(), scores.tolist()):
+            saved_query = queries[int(matrix.query_ids[row])]
+            metadata = records[column]["metadata"]
+            if saved_query["keywords"] and column not in texts:
+                texts[column] = fold_text(f"{metadata.get('title', '')} {metadata.get('content', '')}")
+            if not passes_filters(saved_query, metadata, texts.get(column)):
+                continue
+            payload = {key: metadata.get(key, "") for key in ("title", "source_url", "date", "source", "category")}
+            outbox.append((saved_query["id"], saved_query["owner"], records[column]["id"], round(score, 4),
+                           json.dumps(payload, ensure_ascii=False), now))
+        if not outbox:
+            return 0
+        with closing(connect(self.path)) as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO alert_outbox (saved_query_id, owner, article_id, score, payload, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                outbox,
+            )
+            added = conn.total_changes - before
+        logger.info(f"{added} alert notifications for {len(records)} articles ({len(matrix)} saved queries).")
+        return added
+
+
+# Module-level singleton instance
+_alert_store_instance = None
+_alert_store_lock = threading.Lock()
+
+
+def get_alert_store():
+    global _alert_store_instance
+    with _alert_store_lock:
+        if _alert_store_instance is None:
+            _alert_store_instance = AlertStore()
+    return _alert_store_instance
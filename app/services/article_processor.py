@@ -1,16 +1,62 @@
 # app/services/article_processor.py
-from services.vector_db_service import VectorDBService, get_vectorizer
+from services.alerts import ALERTS_ENABLED, get_alert_store
+from services.article_stream import ARTICLE_STREAM_ENABLED, get_article_change_log
+from services.latest_index import LATEST_INDEX_ENABLED, get_latest_index
+from services.trending import TRENDING_ENABLED, get_trending_tracker
+from services.vector_db_service import VectorDBService
+from utils.chunking import iter_chunks
+from itertools import islice
+from utils.common import parse_iso_datetime
 import logging
+import os
 import re
+import time
 
 logger = logging.getLogger(__name__)
 
+# Full content is embedded as overlapping passages in a separate namespace
+CONTENT_NAMESPACE = os.getenv("CONTENT_NAMESPACE", "content")
+CONTENT_CHUNKS_ENABLED = os.getenv("CONTENT_CHUNKS_ENABLED", "true").lower() in ("1", "true", "yes")
+CONTENT_EMBED_BATCH_SIZE = int(os.getenv("CONTENT_EMBED_BATCH_SIZE", "32"))
+# Articles dated further back are stored silently: not streamed and not matched against alerts (e.g. backfills)
+NEW_ARTICLE_MAX_AGE_HOURS = float(os.getenv("NEW_ARTICLE_MAX_AGE_HOURS", "48"))
+
+
+def recent_records(records, max_age_hours=NEW_ARTICLE_MAX_AGE_HOURS):
+    """
+    Returns the title records whose article date is within max_age_hours (undated ones count as recent).
+    """
+    if max_age_hours <= 0:
+        return records
+    cutoff = time.time() - max_age_hours * 3600
+    recent = []
+    for record in records:
+        parsed = parse_iso_datetime(record["metadata"].get("date"))
+        if parsed is None or parsed.timestamp() >= cutoff:
+            recent.append(record)
+    return recent
+
+
 class ArticleProcessor:
     def __init__(self):
         # Use singleton instances - these will be shared across all ArticleProcessor instances
         self.vector_db = VectorDBService()  # Singleton - creates vectorizer internally
-        # Get the shared vectorizer instance from VectorDBService
-        self.vectorizer = self.vector_db.vectorizer
+        # Called with every batch of stored title records, after the upsert (see run_ingest_hooks)
+        self.ingest_hooks = []
+        # Called with only the records stored for the first time: announcing or counting an
+        # article twice would be wrong. Announcements also skip old articles (recent_records).
+        self.new_article_hooks = []
+        if ARTICLE_STREAM_ENABLED:
+            self.new_article_hooks.append(lambda records: get_article_change_log().publish(recent_records(records)))
+        if ALERTS_ENABLED:
+            self.new_article_hooks.append(lambda records: get_alert_store().match_records(recent_records(records)))
+        if TRENDING_ENABLED:
+            self.new_article_hooks.append(lambda records: get_trending_tracker().record(records))
+
+    @property
+    def vectorizer(self):
+        # The shared vectorizer instance from VectorDBService, loaded on first use
+        return self.vector_db.vectorizer
 
     def process_and_store_article(self, article):
         """
@@ -30,7 +76,7 @@ class ArticleProcessor:
             title_vector = self.create_title_vector(article, title, content)
             if title_vector:
                 logger.debug(f"Upserting vector with metadata: {title_vector['metadata']}")
-                self.vector_db.upsert_vectors([title_vector], namespace="title")
+                self.upsert_records([title_vector])
             else:
                 logger.warning(f"Failed to create vector for title of article {article['source_url']}.")
         except Exception as e:
@@ -65,23 +111,215 @@ class ArticleProcessor:
             if title_vector is None or len(title_vector) != self.vectorizer.target_dim:
                 logger.error(f"Invalid vector for title. Expected dimension: {self.vectorizer.target_dim}.")
                 return None
-            metadata = {
-                'type': 'title',
-                'title': title,
-                'content': content,  # Full content stored in metadata
-                'source_url': article['source_url'],
-                # Ensure Pinecone metadata values are JSON-serializable primitives
-                'date': (
-                    article['date'].isoformat() if hasattr(article.get('date'), 'isoformat') else str(article.get('date'))
-                ),
-                'source': article['source'],
-            }
-            logger.debug(f"Generated metadata: {metadata}")
-            return {
-                'id': f"{article['source_url']}-title",
-                'values': title_vector.tolist(),
-                'metadata': metadata
-            }
+            return self.build_title_record(article, title, content, title_vector)
         except Exception as e:
             logger.error(f"Failed to vectorize title for article {article['source_url']}: {e}")
             return None
+
+    def build_title_record(self, article, title, content, title_vector):
+        """
+        Builds the Pinecone record (id, values, metadata) for an article's title vector.
+        """
+        metadata = {
+            'type': 'title',
+            'title': title,
+            'content': content,  # Full content stored in metadata
+            'source_url': article['source_url'],
+            # Ensure Pinecone metadata values are JSON-serializable primitives
+            'date': (
+                article['date'].isoformat() if hasattr(article.get('date'), 'isoformat') else str(article.get('date'))
+            ),
+            'source': article['source'],
+            'category': article.get('category') or '',  # Name of the feed the article came from, if any
+        }
+        logger.debug(f"Generated metadata: {metadata}")
+        return {
+            'id': f"{article['source_url']}-title",
+            'values': title_vector.tolist(),
+            'metadata': metadata
+        }
+
+    def build_title_records(self, articles, embed_batch_size=32):
+        """
+        Vectorizes the titles of many articles with batched forward passes.
+        Returns a list aligned with `articles` holding the Pinecone record for each article,
+        or None where the article is missing its title or content.
+        """
+        records = [None] * len(articles)
+        pending = []
+        for i, article in enumerate(articles):
+            if not article.get('title') or not article.get('content'):
+                logger.warning(f"Skipping article {article.get('source_url', 'unknown')} due to missing title or content.")
+            else:
+                pending.append(i)
+
+        if not pending:
+            return records
+
+        titles = [self.clean_text(articles[i]['title']) for i in pending]
+        logger.info(f"Vectorizing {len(titles)} titles in batches of {embed_batch_size}.")
+        title_vectors = self.vectorizer.encode_batch(titles, batch_size=embed_batch_size)
+
+        for i, title, title_vector in zip(pending, titles, title_vectors):
+            try:
+                records[i] = self.build_title_record(articles[i], title, articles[i]['content'], title_vector)
+            except Exception as e:
+                logger.error(f"Failed to build record for article {articles[i].get('source_url', 'unknown')}: {e}")
+        return records
+
+    def build_chunk_record(self, metadata, chunk_index, passage, vector):
+        """
+        Builds the Pinecone record for one passage of an article, from the article's title record metadata.
+        """
+        return {
+            'id': f"{metadata['source_url']}-chunk-{chunk_index}",
+            'values': vector.tolist(),
+            'metadata': {
+                'type': 'chunk',
+                'article_id': f"{metadata['source_url']}-title",
+                'chunk_index': chunk_index,
+                'title': metadata.get('title', ''),
+                'text': passage,
+                'source_url': metadata['source_url'],
+                'date': metadata.get('date', ''),
+                'source': metadata.get('source', ''),
+            }
+        }
+
+    def iter_chunk_records(self, title_records, embed_batch_size=CONTENT_EMBED_BATCH_SIZE):
+        """
+        Streams passage records for the content of title records. Passages of all the articles
+        are embedded together, a few batches at a time, and yielded as one list per embedding
+        call, so memory is bounded no matter how long the articles are.
+        """
+        def passages():
+            for record in title_records:
+                metadata = record['metadata']
+                for chunk_index, passage in enumerate(iter_chunks(metadata.get('content', ''))):
+                    yield metadata, chunk_index, passage
+
+        pending = passages()
+        while True:
+            batch = list(islice(pending, embed_batch_size * 4))
+            if not batch:
+                return
+            vectors = self.vectorizer.encode_batch([passage for _, _, passage in batch], batch_size=embed_batch_size)
+            yield [
+                self.build_chunk_record(metadata, chunk_index, passage, vector)
+                for (metadata, chunk_index, passage), vector in zip(batch, vectors)
+            ]
+
+    def store_content_chunks(self, title_records, namespace=CONTENT_NAMESPACE, replace=False):
+        """
+        Embeds and upserts the content passages of title records. With replace=True, passages
+        left over from a longer earlier version of an article are deleted; replace may also be a
+        set of source URLs, to do this only for those articles.
+        Returns the number of passages stored.
+        """
+        chunk_counts = {record['metadata']['source_url']: 0 for record in title_records}
+        stored = 0
+        for records in self.iter_chunk_records(title_records):
+            self.vector_db.upsert_vectors(records, namespace=namespace)
+            for record in records:
+                source_url = record['metadata']['source_url']
+                chunk_counts[source_url] = max(chunk_counts[source_url], record['metadata']['chunk_index'] + 1)
+            stored += len(records)
+
+        if replace:
+            for source_url, count in chunk_counts.items():
+                if replace is not True and source_url not in replace:
+                    continue
+                prefix = f"{source_url}-chunk-"
+                stale = [vector_id for vector_id in self.vector_db.list_ids(prefix, namespace=namespace)
+                         if vector_id[len(prefix):].isdigit() and int(vector_id[len(prefix):]) >= count]
+                self.vector_db.delete_vectors(stale, namespace=namespace)
+        logger.info(f"Stored {stored} content passages for {len(title_records)} articles in namespace '{namespace}'.")
+        return stored
+
+    def upsert_records(self, records, namespace="title", batch_size=None, content_namespace=CONTENT_NAMESPACE,
+                       replace_chunks=None, run_hooks=True):
+        """
+        Upserts title records built by build_title_records, then the passages of their content
+        into content_namespace (skipped when it is empty or CONTENT_CHUNKS_ENABLED is off), then
+        runs the ingest hooks unless run_hooks is False (copies such as a re-index).
+        Passages left over from a longer earlier version are deleted for the articles whose
+        title was already stored (looked up with one fetch before the upsert); replace_chunks
+        True or False does this for every article or for none without the lookup.
+        A failure to store passages or in a hook is logged; the titles stay stored.
+        """
+        chunks_enabled = bool(content_namespace) and CONTENT_CHUNKS_ENABLED
+        if chunks_enabled and replace_chunks is None:
+            try:
+                existing = self.vector_db.fetch_metadata([record['id'] for record in records], namespace=namespace)
+                replace_chunks = {record['metadata']['source_url'] for record in records if record['id'] in existing}
+            except Exception as e:
+                logger.error(f"Could not look up stored titles; stale passages are kept: {e}")
+                replace_chunks = False
+        self.vector_db.upsert_vectors(records, namespace=namespace, batch_size=batch_size)
+        if chunks_enabled:
+            try:
+                self.store_content_chunks(records, namespace=content_namespace, replace=replace_chunks)
+            except Exception as e:
+                logger.error(f"Failed to store content passages of {len(records)} articles: {e}")
+        if run_hooks:
+            self.run_ingest_hooks(records)
+
+    def run_ingest_hooks(self, records):
+        """
+        Passes stored title records to every ingest hook (local indexes that follow ingestion).
+        The latest-articles index is updated first and tells which records are new; only those
+        reach the new-article hooks (all records when the index is disabled or fails).
+        """
+        new_records = records
+        if LATEST_INDEX_ENABLED:
+            try:
+                new_records = get_latest_index().add_records(records)
+            except Exception as e:
+                logger.error(f"Latest index update failed for {len(records)} articles: {e}")
+        for hook in self.ingest_hooks:
+            try:
+                hook(records)
+            except Exception as e:
+                logger.error(f"Ingest hook failed for {len(records)} articles: {e}")
+        if not new_records:
+            return
+        for hook in self.new_article_hooks:
+            try:
+                hook(new_records)
+            except Exception as e:
+                logger.error(f"New-article hook failed for {len(new_records)} articles: {e}")
+
+    def process_and_store_articles(self, articles, embed_batch_size=32, upsert_batch_size=50):
+        """
+        Batch variant of process_and_store_article: titles are vectorized with batched forward passes
+        and upserted in chunks. Returns one result dict per input article, in order, with a
+        status of "stored", "skipped" or "failed".
+        """
+        try:
+            records = self.build_title_records(articles, embed_batch_size=embed_batch_size)
+        except Exception as e:
+            logger.error(f"Batch vectorization failed: {e}")
+            return [{'id': None, 'status': 'failed', 'error': 'Failed to vectorize the title.'} for _ in articles]
+
+        results = [None] * len(articles)
+        indexed_records = []
+        for i, (article, record) in enumerate(zip(articles, records)):
+            if record is not None:
+                indexed_records.append((i, record))
+            elif not article.get('title') or not article.get('content'):
+                results[i] = {'id': None, 'status': 'skipped', 'error': 'Missing title or content.'}
+            else:
+                results[i] = {'id': None, 'status': 'failed', 'error': 'Failed to build the vector record.'}
+
+        for start in range(0, len(indexed_records), upsert_batch_size):
+            chunk = indexed_records[start:start + upsert_batch_size]
+            try:
+                self.upsert_records([record for _, record in chunk])
+                for i, record in chunk:
+                    results[i] = {'id': record['id'], 'status': 'stored', 'error': None}
+            except Exception as e:
+                logger.error(f"Failed to upsert chunk of {len(chunk)} vectors: {e}")
+                for i, record in chunk:
+                    results[i] = {'id': record['id'], 'status': 'failed', 'error': 'Upsert failed.'}
+
+        return results
@@ -0,0 +1,147 @@
+# app/services/article_stream.py
+from contextlib import closing
+from utils.sqlite_helpers import connect, data_path
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_STREAM_ENABLED = os.getenv("ARTICLE_STREAM_ENABLED", "true").lower() in ("1", "true", "yes")
+# Events older than this are pruned; a client reconnecting later resumes from the oldest one kept
+ARTICLE_STREAM_RETENTION_HOURS = float(os.getenv("ARTICLE_STREAM_RETENTION_HOURS", "24"))
+ARTICLE_STREAM_SNIPPET_CHARS = int(os.getenv("ARTICLE_STREAM_SNIPPET_CHARS", "300"))
+PRUNE_INTERVAL_SECONDS = 600
+
+
+class ArticleChangeLog:
+    """
+    Append-only log of newly stored articles in a SQLite file shared by every process. Ingestion
+    (the scheduler, the workers, the API) appends through publish; the stream server
+    (api/stream_server.py) tails it by sequence number, which doubles as the SSE event ID.
+    An article is published once: records already in the log are ignored, so re-extraction and
+    repeated upserts do not announce the same article again.
+    """
+
+    def __init__(self, path=None, retention_hours=ARTICLE_STREAM_RETENTION_HOURS):
+        self.path = path or os.getenv("ARTICLE_STREAM_PATH") or data_path("article_stream.db")
+        self.retention_hours = retention_hours
+        self._next_prune = 0.0
+        self._local = threading.local()
+        with closing(connect(self.path)) as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS article_events (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    article_id TEXT NOT NULL UNIQUE,
+                    source TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS article_events_created ON article_events (created_at);
+            """)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    @staticmethod
+    def event_payload(record):
+        metadata = record["metadata"]
+        return {
+            "id": record["id"],
+            "title": metadata.get("title", ""),
+            "source_url": metadata.get("source_url", ""),
+            "date": metadata.get("date", ""),
+            "source": metadata.get("source", ""),
+            "category": metadata.get("category", ""),
+            "snippet": (metadata.get("content") or "")[:ARTICLE_STREAM_SNIPPET_CHARS],
+        }
+
+    def publish(self, records):
+        """
+        Appends an event for every title record not published before. Returns the number appended.
+        """
+        if not records:
+            return 0
+        now = time.time()
+        rows = []
+        for record in records:
+            payload = self.event_payload(record)
+            rows.append((record["id"], payload["source"], payload["category"],
+                         json.dumps(payload, ensure_ascii=False), now))
+        conn = self._conn()
+        before = conn.total_changes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR IGNORE INTO article_events (article_id, source, category, payload, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if now >= self._next_prune:
+            self._next_prune = now + PRUNE_INTERVAL_SECONDS
+            self.prune(now)
+        return conn.total_changes - before
+
+    def read_since(self, seq, limit=500):
+        """
+        Returns up to limit events with a sequence number above seq, oldest first, as dicts
+        with seq, source, category and payload (the parsed article).
+        """
+        rows = self._conn().execute(
+            "SELECT seq, source, category, payload FROM article_events WHERE seq > ? ORDER BY seq LIMIT ?",
+            (seq, limit),
+        ).fetchall()
+        return [
+            {"seq": row["seq"], "source": row["source"], "category": row["category"],
+             "payload": json.loads(row["payload"])}
+            for row in rows
+        ]
+
+    def last_seq(self):
+        return self._conn().execute("SELECT COALESCE(MAX(seq), 0) FROM article_events").fetchone()[0]
+
+    def prune(self, now=None):
+        if self.retention_hours <= 0:
+            return 0
+        cutoff = (now or time.time()) - self.retention_hours * 3600
+        cursor = self._conn().execute("DELETE FROM article_events WHERE created_at < ?", (cutoff,))
+        if cursor.rowcount:
+            logger.info(f"Pruned {cursor.rowcount} stream events older than {self.retention_hours}h.")
+        return cursor.rowcount
+
+
+def event_matches(event, sources=None, categories=None):
+    """
+    True if an event passes a subscriber's filters (empty filters match everything).
+    """
+    return (not sources or event["source"] in sources) and (not categories or event["category"] in categories)
+
+
+def format_event(event):
+    """
+    Serializes an event in the Server-Sent Events wire format.
+    """
+    return f"id: {event['seq']}\nevent: article\ndata: {json.dumps(event['payload'], ensure_ascii=False)}\n\n"
+
+
+# Module-level singleton instance
+_change_log_instance = None
+_change_log_lock = threading.Lock()
+
+
+def get_article_change_log():
+    global _change_log_instance
+    with _change_log_lock:
+        if _change_log_instance is None:
+            _change_log_instance = ArticleChangeLog()
+    return _change_log_instance
@@ -0,0 +1,227 @@
+# app/services/crawl_queue.py
+from contextlib import closing
+from utils.sqlite_helpers import connect, data_path
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+TASK_KINDS = ("feed", "article")
+TASK_STATUSES = ("queued", "processing", "done", "failed")
+
+
+def _json_default(value):
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+class CrawlQueue:
+    """
+    Shared crawl work queue backed by a local SQLite file.
+    The coordinator enqueues feed tasks; crawl workers lease them, poll the feed and enqueue one
+    article task per entry. Each URL has exactly one row per kind, so an article is enqueued once
+    however many feeds list it, and a leased task cannot be leased by another worker until its
+    lease expires. Expired leases are retried up to max_attempts.
+    """
+
+    def __init__(self, path=None, lease_seconds=300, max_attempts=3):
+        self.path = path or os.getenv("CRAWL_QUEUE_PATH") or data_path("crawl_queue.db")
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        with closing(connect(self.path)) as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS crawl_tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    UNIQUE (kind, url)
+                );
+                CREATE INDEX IF NOT EXISTS idx_crawl_tasks_kind_status ON crawl_tasks (kind, status, created_at);
+            """)
+
+    def enqueue_feed(self, source, feed_name, feed_url):
+        """
+        Queues a poll of a feed. Does nothing while the previous poll is still queued or running.
+        Returns True if the feed was queued.
+        """
+        now = time.time()
+        payload = json.dumps({"source": source, "feed_name": feed_name, "feed_url": feed_url}, ensure_ascii=False)
+        with closing(connect(self.path)) as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO crawl_tasks (kind, url, source, status, payload, created_at, updated_at)
+                VALUES ('feed', ?, ?, 'queued', ?, ?, ?)
+                ON CONFLICT (kind, url) DO UPDATE SET
+                    status = 'queued', payload = excluded.payload, attempts = 0, error = NULL,
+                    lease_owner = NULL, lease_expires = NULL, created_at = excluded.created_at,
+                    updated_at = excluded.updated_at
+                WHERE crawl_tasks.status IN ('done', 'failed')
+                """,
+                (feed_url, source, payload, now, now),
+            )
+        return cursor.rowcount > 0
+
+    def enqueue_articles(self, source, entries):
+        """
+        Queues article tasks for feed entries (dicts with at least a "link").
+        Links that were queued before are ignored. Returns the number of new articles.
+        """
+        now = time.time()
+        rows = [
+            (entry["link"], source, json.dumps(entry, ensure_ascii=False, default=_json_default), now, now)
+            for entry in entries if entry.get("link")
+        ]
+        if not rows:
+            return 0
+        with closing(connect(self.path)) as conn:
+            before = conn.total_changes
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO crawl_tasks (kind, url, source, status, payload, created_at, updated_at)
+                VALUES ('article', ?, ?, 'queued', ?, ?, ?)
+                """,
+                rows,
+            )
+            return conn.total_changes - before
+
+    def lease(self, worker_id, kind, batch_size=32):
+        """
+        Atomically leases up to batch_size queued (or lease-expired) tasks of one kind.
+        Lease-expired tasks that have used up max_attempts are marked failed instead.
+        Returns a list of task dicts with id, url, source and payload.
+        """
+        now = time.time()
+        with closing(connect(self.path)) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # A task whose lease expired on its last attempt most likely killed or hung its worker
+                conn.execute(
+                    """
+                    UPDATE crawl_tasks SET status = 'failed', error = 'Lease expired after the last attempt.',
+                                           lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                    WHERE kind = ? AND status = 'processing' AND lease_expires < ? AND attempts >= ?
+                    """,
+                    (now, kind, now, self.max_attempts),
+                )
+                rows = conn.execute(
+                    """
+                    SELECT id, url, source, payload FROM crawl_tasks
+                    WHERE kind = ? AND (status = 'queued'
+                                        OR (status = 'processing' AND lease_expires < ? AND attempts < ?))
+                    ORDER BY created_at
+                    LIMIT ?
+                    """,
+                    (kind, now, self.max_attempts, batch_size),
+                ).fetchall()
+                conn.executemany(
+                    """
+                    UPDATE crawl_tasks SET status = 'processing', lease_owner = ?, lease_expires = ?,
+                                           attempts = attempts + 1, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    [(worker_id, now + self.lease_seconds, now, row["id"]) for row in rows],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return [
+            {"id": row["id"], "url": row["url"], "source": row["source"], "payload": json.loads(row["payload"])}
+            for row in rows
+        ]
+
+    def renew(self, worker_id, task_ids):
+        """
+        Extends the leases a worker still holds. Returns the IDs that are still leased to it.
+        """
+        now = time.time()
+        held = []
+        with closing(connect(self.path)) as conn:
+            for task_id in task_ids:
+                cursor = conn.execute(
+                    """
+                    UPDATE crawl_tasks SET lease_expires = ?, updated_at = ?
+                    WHERE id = ? AND status = 'processing' AND lease_owner = ?
+                    """,
+                    (now + self.lease_seconds, now, task_id, worker_id),
+                )
+                if cursor.rowcount:
+                    held.append(task_id)
+        return held
+
+    def complete(self, worker_id, task_id, result=None):
+        """
+        Marks a task leased by this worker as done. Returns False if the lease was lost.
+        """
+        with closing(connect(self.path)) as conn:
+            cursor = conn.execute(
+                """
+                UPDATE crawl_tasks SET status = 'done', result = ?, error = NULL, lease_expires = NULL, updated_at = ?
+                WHERE id = ? AND lease_owner = ? AND status = 'processing'
+                """,
+                (json.dumps(result, ensure_ascii=False, default=_json_default), time.time(), task_id, worker_id),
+            )
+        return cursor.rowcount > 0
+
+    def fail(self, worker_id, task_id, error):
+        """
+        Records a failure. The task is queued again unless it has used up max_attempts.
+        """
+        with closing(connect(self.path)) as conn:
+            conn.execute(
+                """
+                UPDATE crawl_tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END,
+                                       error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                WHERE id = ? AND lease_owner = ? AND status = 'processing'
+                """,
+                (self.max_attempts, str(error), time.time(), task_id, worker_id),
+            )
+
+    def get_feed_task(self, feed_url):
+        """
+        Returns the latest poll task of a feed as a dict, or None if it was never queued.
+        """
+        with closing(connect(self.path)) as conn:
+            row = conn.execute(
+                "SELECT status, result, error, attempts, updated_at FROM crawl_tasks WHERE kind = 'feed' AND url = ?",
+                (feed_url,),
+            ).fetchone()
+        if row is None:
+            return None
+        task = dict(row)
+        task["result"] = json.loads(task["result"]) if task["result"] else None
+        return task
+
+    def counts(self):
+        """
+        Returns the number of tasks per kind and status.
+        """
+        with closing(connect(self.path)) as conn:
+            rows = conn.execute("SELECT kind, status, COUNT(*) AS n FROM crawl_tasks GROUP BY kind, status").fetchall()
+        counts = {kind: {status: 0 for status in TASK_STATUSES} for kind in TASK_KINDS}
+        for row in rows:
+            counts.setdefault(row["kind"], {})[row["status"]] = row["n"]
+        return counts
+
+    def purge_finished(self, older_than_seconds=30 * 24 * 3600):
+        """
+        Deletes finished article tasks older than the given age. Until then their rows keep the
+        articles from being crawled again when a feed still lists them.
+        """
+        with closing(connect(self.path)) as conn:
+            cursor = conn.execute(
+                "DELETE FROM crawl_tasks WHERE kind = 'article' AND status IN ('done', 'failed') AND updated_at < ?",
+                (time.time() - older_than_seconds,),
+            )
+        return cursor.rowcount
@@ -0,0 +1,214 @@
+# app/services/digest_service.py
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from services.vector_db_service import VectorDBService
+from api.gemini_integration import (
+    get_or_create_summary, summarize_article, summary_cache, summary_cache_key, is_failed_summary
+)
+from utils.cache import TTLCache
+from utils.common import parse_iso_datetime
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Rough token estimate for Vietnamese text sent to Gemini
+CHARS_PER_TOKEN = float(os.getenv("DIGEST_CHARS_PER_TOKEN", "3"))
+# Upper bound on output tokens per Gemini call (matches max_output_tokens in gemini_integration)
+MAX_OUTPUT_TOKENS = 512
+
+DIGEST_PROMPT = (
+    "Dưới đây là tóm tắt của các bài báo về chủ đề \"{topic}\" từ {start} đến {end}. "
+    "Hãy viết một bản tin tổng hợp bằng tiếng Việt, khách quan và ngắn gọn, "
+    "nhóm các sự kiện liên quan lại với nhau và nêu bật những diễn biến quan trọng nhất. "
+    "Không thêm suy đoán hoặc ý kiến cá nhân."
+)
+
+
+def estimate_tokens(text):
+    """
+    Estimates the number of Gemini tokens needed for a piece of text.
+    """
+    return int(len(text or "") / CHARS_PER_TOKEN) + 1
+
+
+class DigestService:
+    def __init__(self, max_concurrency=None, token_budget=None, max_article_chars=None, cache_ttl=None):
+        self.vector_db = VectorDBService()
+        self.max_concurrency = max_concurrency or int(os.getenv("DIGEST_MAX_CONCURRENCY", "4"))
+        self.token_budget = token_budget or int(os.getenv("DIGEST_TOKEN_BUDGET", "60000"))
+        self.max_article_chars = max_article_chars or int(os.getenv("DIGEST_MAX_ARTICLE_CHARS", "6000"))
+        self.cache = TTLCache(max_size=256, ttl=cache_ttl or int(os.getenv("DIGEST_CACHE_TTL", "3600")))
+
+    @staticmethod
+    def resolve_window(date_from=None, date_to=None, hours=24):
+        """
+        Resolves the digest time window. When no explicit end is given the window ends at the
+        top of the next hour, so repeated requests within the same hour share one cached digest.
+        """
+        if date_to is None:
+            now = datetime.now(timezone.utc)
+            date_to = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        date_to = parse_iso_datetime(date_to)
+        date_from = parse_iso_datetime(date_from) if date_from else date_to - timedelta(hours=hours)
+        return date_from, date_to
+
+    def build_digest(self, topic, date_from=None, date_to=None, hours=24, max_articles=20, namespace="title"):
+        """
+        Builds a digest for a topic and time window:
+        selects the top articles, summarizes them in parallel (map), then combines the
+        summaries into one digest with a single Gemini call (reduce).
+        """
+        start, end = self.resolve_window(date_from, date_to, hours)
+        cache_key = (topic.strip().lower(), start.isoformat(), end.isoformat(), max_articles, namespace)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Digest cache hit for topic '{topic}' ({start.isoformat()} - {end.isoformat()}).")
+            return dict(cached, cached=True)
+
+        articles = self.select_articles(topic, start, end, max_articles, namespace)
+        if not articles:
+            logger.info(f"No articles found for digest topic '{topic}'.")
+            return {
+                "topic": topic,
+                "window": {"from": start.isoformat(), "to": end.isoformat()},
+                "digest": "",
+                "articles": [],
+                "skipped": [],
+                "tokens_used": 0,
+                "cached": False,
+            }
+
+        summaries, skipped, tokens_used = self.map_summaries(articles)
+        if not summaries:
+            raise RuntimeError("Failed to summarize any article for the digest.")
+
+        digest, reduce_tokens = self.reduce_summaries(topic, start, end, summaries)
+        result = {
+            "topic": topic,
+            "window": {"from": start.isoformat(), "to": end.isoformat()},
+            "digest": digest,
+            "articles": [
+                {
+                    "id": item["article"]["id"],
+                    "title": item["article"]["title"],
+                    "source": item["article"]["source"],
+                    "source_url": item["article"]["source_url"],
+                    "date": item["article"]["date"],
+                    "summary": item["summary"],
+                }
+                for item in summaries
+            ],
+            "skipped": skipped,
+            "tokens_used": tokens_used + reduce_tokens,
+            "cached": False,
+        }
+        self.cache.set(cache_key, result)
+        return result
+
+    def select_articles(self, topic, start, end, max_articles, namespace="title"):
+        """
+        Selects the most relevant articles for the topic whose date falls inside the window.
+        """
+        candidate_k = min(max(max_articles * 5, 50), 1000)
+        # Only the monthly partitions overlapping the window are searched
+        matches = self.vector_db.query_vectors(topic, namespace=namespace, top_k=candidate_k, date_from=start, date_to=end)
+
+        selected = []
+        seen_urls = set()
+        for match in matches:
+            metadata = match.get("metadata") or {}
+            article_date = parse_iso_datetime(metadata.get("date"))
+            if article_date is None or not (start <= article_date < end):
+                continue
+            source_url = metadata.get("source_url", "")
+            if source_url in seen_urls or not metadata.get("content"):
+                continue
+            seen_urls.add(source_url)
+            selected.append({
+                "id": match["id"],
+                "title": metadata.get("title", "Untitled"),
+                "content": metadata.get("content", ""),
+                "source_url": source_url,
+                "date": metadata.get("date", ""),
+                "source": metadata.get("source", "Unknown"),
+                "score": match["score"],
+            })
+            if len(selected) >= max_articles:
+                break
+
+        logger.info(f"Selected {len(selected)} of {len(matches)} candidates for digest topic '{topic}'.")
+        return selected
+
+    def map_summaries(self, articles):
+        """
+        Summarizes articles in parallel, reusing cached summaries.
+        Articles that would exceed the token budget (keeping room for the reduce call) are skipped.
+        """
+        map_budget = self.token_budget - MAX_OUTPUT_TOKENS - estimate_tokens(DIGEST_PROMPT)
+        tokens_used = 0
+        to_summarize = []
+        skipped = []
+
+        for article in articles:
+            if summary_cache.get(summary_cache_key(article["id"], article["content"])) is not None:
+                to_summarize.append((article, 0))
+                continue
+            cost = estimate_tokens(article["content"][:self.max_article_chars]) + MAX_OUTPUT_TOKENS
+            # The reduce call also has to fit the summaries, so reserve their size up front
+            if tokens_used + cost + MAX_OUTPUT_TOKENS * (len(to_summarize) + 1) > map_budget:
+                skipped.append({"id": article["id"], "reason": "token_budget"})
+                continue
+            tokens_used += cost
+            to_summarize.append((article, cost))
+
+        def summarize(item):
+            article, _ = item
+            return get_or_create_summary(article["id"], article["content"], max_chars=self.max_article_chars)
+
+        summaries = []
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            for (article, _), summary in zip(to_summarize, executor.map(summarize, to_summarize)):
+                if is_failed_summary(summary):
+                    logger.warning(f"Skipping article {article['id']} in digest: {summary}")
+                    skipped.append({"id": article["id"], "reason": "summarization_failed"})
+                    continue
+                summaries.append({"article": article, "summary": summary})
+
+        logger.info(
+            f"Map stage summarized {len(summaries)} articles "
+            f"({len(skipped)} skipped, ~{tokens_used} tokens)."
+        )
+        return summaries, skipped, tokens_used
+
+    def reduce_summaries(self, topic, start, end, summaries):
+        """
+        Combines per-article summaries into a single digest with one Gemini call.
+        """
+        prompt = DIGEST_PROMPT.format(
+            topic=topic,
+            start=start.strftime("%d/%m/%Y %H:%M"),
+            end=end.strftime("%d/%m/%Y %H:%M"),
+        )
+        body = "\n\n".join(
+            f"{i}. {item['article']['title']} ({item['article']['source']}): {item['summary']}"
+            for i, item in enumerate(summaries, start=1)
+        )
+        tokens = estimate_tokens(prompt) + estimate_tokens(body) + MAX_OUTPUT_TOKENS
+        digest = summarize_article(body, prompt=prompt)
+        if is_failed_summary(digest):
+            raise RuntimeError(f"Failed to reduce summaries into a digest: {digest}")
+        return digest, tokens
+
+
+# Module-level singleton instance
+_digest_service_instance = None
+
+def get_digest_service():
+    """
+    Get or create the shared DigestService so its digest cache is reused across requests.
+    """
+    global _digest_service_instance
+    if _digest_service_instance is None:
+        _digest_service_instance = DigestService()
+    return _digest_service_instance
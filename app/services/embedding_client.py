@@ -0,0 +1,93 @@
+# app/services/embedding_client.py
+import base64
+import logging
+import os
+import threading
+import time
+import numpy as np
+import requests
+from services.projection import EMBEDDING_PROJECTION_PATH, EmbeddingProjection, ProjectedEmbedder
+
+logger = logging.getLogger(__name__)
+
+# When set, embeddings come from the shared embedding service (api/embedding_server.py)
+# instead of a PhoBERT model loaded in this process.
+EMBEDDING_SERVICE_URL = os.getenv("EMBEDDING_SERVICE_URL")
+EMBEDDING_TIMEOUT = float(os.getenv("EMBEDDING_TIMEOUT", "60"))
+EMBEDDING_RETRIES = 3
+
+
+class EmbeddingClient:
+    """
+    Client for the shared embedding service, with the same encode_text / encode_batch
+    interface as PhoBERTVectorizer.
+    """
+
+    def __init__(self, base_url, target_dim=768, timeout=EMBEDDING_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.target_dim = target_dim
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _post(self, texts):
+        for attempt in range(EMBEDDING_RETRIES):
+            try:
+                response = self.session.post(f"{self.base_url}/embed", json={"texts": texts}, timeout=self.timeout)
+                response.raise_for_status()
+                payload = response.json()["embeddings"]
+                embeddings = np.frombuffer(base64.b64decode(payload["data"]), dtype=np.float32)
+                return embeddings.reshape(payload["shape"])
+            except requests.ConnectionError as e:
+                # The service may still be loading the model; retry with backoff
+                if attempt == EMBEDDING_RETRIES - 1:
+                    raise
+                logger.warning(f"Embedding service unavailable ({e}); retrying.")
+                time.sleep(2 ** attempt)
+
+    def encode_text(self, text):
+        return self._post([text])[0]
+
+    def encode_batch(self, texts, batch_size=32):
+        """
+        Encodes many texts. Requests are split into chunks of a few batches each;
+        the service does its own batching.
+        """
+        if not texts:
+            return np.zeros((0, self.target_dim), dtype=np.float32)
+        chunk = max(batch_size, 1) * 8
+        return np.concatenate([self._post(list(texts[start:start + chunk])) for start in range(0, len(texts), chunk)])
+
+
+_embedder_instance = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder():
+    """
+    Returns the process-wide text encoder: an EmbeddingClient when EMBEDDING_SERVICE_URL is set,
+    otherwise the local PhoBERT vectorizer. When EMBEDDING_PROJECTION_PATH is set, the encoder
+    is wrapped so that its embeddings are projected to the fitted lower dimension.
+    """
+    global _embedder_instance
+    with _embedder_lock:
+        if _embedder_instance is None:
+            projection = None
+            if EMBEDDING_PROJECTION_PATH:
+                projection = EmbeddingProjection.load(EMBEDDING_PROJECTION_PATH)
+                logger.info(f"Projecting embeddings from {projection.input_dim} to {projection.output_dim} "
+                            f"dimensions ({EMBEDDING_PROJECTION_PATH}).")
+
+            if EMBEDDING_SERVICE_URL:
+                logger.info(f"Using the embedding service at {EMBEDDING_SERVICE_URL}.")
+                model_dim = projection.input_dim if projection else int(os.getenv("PINECONE_DIMENSION", "768"))
+                embedder = EmbeddingClient(EMBEDDING_SERVICE_URL, target_dim=model_dim)
+            else:
+                # Imported here so processes using the service never load torch
+                from services.vectorizer_service import get_vectorizer
+                embedder = get_vectorizer()
+
+            _embedder_instance = ProjectedEmbedder(embedder, projection) if projection else embedder
+        return _embedder_instance
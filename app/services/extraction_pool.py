@@ -0,0 +1,57 @@
+# app/services/extraction_pool.py
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from utils.extraction import extract_page
+import logging
+import multiprocessing
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+EXTRACT_PROCESSES = int(os.getenv("EXTRACT_PROCESSES", str(os.cpu_count() or 1)))
+
+# Module-level pool shared by all scrapers in this process
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool():
+    """
+    Get or create the process pool used for HTML parsing, keeping CPU-heavy parsing off the
+    threads that do network I/O and run the model.
+    The worker processes are started immediately; call this from the main thread before any
+    pipeline threads start so forking never happens while another thread holds a lock.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=EXTRACT_PROCESSES, mp_context=multiprocessing.get_context("fork")
+            )
+            _pool.submit(os.getpid).result()
+            logger.info(f"Started HTML extraction pool with {EXTRACT_PROCESSES} processes.")
+        return _pool
+
+
+def extract_in_pool(source_key, html_content, url=""):
+    """
+    Runs extract_page in the extraction pool and waits for the result.
+    Returns {"content": ..., "date": ...}.
+    """
+    global _pool
+    try:
+        return get_extraction_pool().submit(extract_page, source_key, html_content, url).result()
+    except BrokenProcessPool:
+        logger.error("Extraction pool broke (a worker died); restarting it.")
+        with _pool_lock:
+            _pool = None
+        return get_extraction_pool().submit(extract_page, source_key, html_content, url).result()
+
+
+def shutdown_extraction_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
@@ -0,0 +1,128 @@
+# app/services/extractive_summarizer.py
+import logging
+import math
+import re
+from collections import Counter
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Sentence boundaries: end punctuation followed by whitespace, or line breaks
+SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?…])\s+|\n+")
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Very short fragments (bylines, captions) are never picked as summary sentences
+MIN_SENTENCE_WORDS = 5
+
+
+class ExtractiveSummarizer:
+    """
+    CPU-only TextRank summarizer: sentences are scored by PageRank over a TF-IDF
+    cosine-similarity graph and the best ones are returned in document order.
+    """
+
+    def __init__(self, max_sentences=200, damping=0.85, max_iterations=50, tolerance=1e-4):
+        self.max_sentences = max_sentences  # Bounds the cost for very long articles
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+    def split_sentences(self, text):
+        """
+        Splits text into candidate sentences, dropping fragments that are too short.
+        """
+        sentences = []
+        for raw in SENTENCE_SPLIT_PATTERN.split(text or ""):
+            sentence = raw.strip()
+            if len(WORD_PATTERN.findall(sentence)) >= MIN_SENTENCE_WORDS:
+                sentences.append(sentence)
+            if len(sentences) >= self.max_sentences:
+                break
+        return sentences
+
+    def tfidf_matrix(self, sentences):
+        """
+        Builds an L2-normalized TF-IDF matrix (sentences x terms), treating each sentence as a document.
+        """
+        tokenized = [Counter(word.lower() for word in WORD_PATTERN.findall(sentence)) for sentence in sentences]
+        vocabulary = {}
+        document_frequency = Counter()
+        for counts in tokenized:
+            for term in counts:
+                vocabulary.setdefault(term, len(vocabulary))
+                document_frequency[term] += 1
+
+        n_sentences = len(sentences)
+        idf = np.zeros(len(vocabulary), dtype=np.float32)
+        for term, index in vocabulary.items():
+            idf[index] = math.log((1 + n_sentences) / (1 + document_frequency[term])) + 1.0
+
+        matrix = np.zeros((n_sentences, len(vocabulary)), dtype=np.float32)
+        for row, counts in enumerate(tokenized):
+            for term, count in counts.items():
+                matrix[row, vocabulary[term]] = 1.0 + math.log(count)
+        matrix *= idf
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def score_sentences(self, sentence_vectors):
+        """
+        Scores sentences with PageRank over their cosine-similarity graph.
+        sentence_vectors must be L2-normalized (TF-IDF rows or sentence embeddings).
+        """
+        n_sentences = sentence_vectors.shape[0]
+        similarity = sentence_vectors @ sentence_vectors.T
+        np.fill_diagonal(similarity, 0.0)
+        similarity = np.clip(similarity, 0.0, None)
+
+        row_sums = similarity.sum(axis=1, keepdims=True)
+        # Sentences with no edges link uniformly to all others
+        transition = np.where(row_sums > 0, similarity / np.where(row_sums == 0, 1.0, row_sums), 1.0 / n_sentences)
+
+        scores = np.full(n_sentences, 1.0 / n_sentences, dtype=np.float32)
+        teleport = (1.0 - self.damping) / n_sentences
+        for _ in range(self.max_iterations):
+            updated = teleport + self.damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < self.tolerance:
+                scores = updated
+                break
+            scores = updated
+        return scores
+
+    def summarize(self, text, num_sentences=4, sentence_vectors=None):
+        """
+        Returns a summary made of the num_sentences highest-ranked sentences, in their original order.
+        :param sentence_vectors: Optional precomputed, L2-normalized sentence embeddings
+                                 (one row per sentence from split_sentences). TF-IDF is used otherwise.
+        """
+        sentences = self.split_sentences(text)
+        if not sentences:
+            return (text or "").strip()
+        if len(sentences) <= num_sentences:
+            return " ".join(sentences)
+
+        if sentence_vectors is None:
+            sentence_vectors = self.tfidf_matrix(sentences)
+        scores = self.score_sentences(sentence_vectors)
+
+        # Light lead bias: news articles front-load the key facts
+        positions = np.arange(len(sentences), dtype=np.float32)
+        scores = scores * (1.0 + 0.5 / (1.0 + positions))
+
+        top_indices = sorted(np.argsort(-scores)[:num_sentences])
+        return " ".join(sentences[i] for i in top_indices)
+
+
+# Module-level singleton instance
+_summarizer_instance = None
+
+def get_extractive_summarizer():
+    """
+    Get or create the shared ExtractiveSummarizer instance.
+    """
+    global _summarizer_instance
+    if _summarizer_instance is None:
+        _summarizer_instance = ExtractiveSummarizer()
+    return _summarizer_instance
@@ -0,0 +1,112 @@
+# app/services/feed_state.py
+from utils.sqlite_helpers import data_path
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+FEED_MIN_INTERVAL = float(os.getenv("FEED_MIN_INTERVAL_MINUTES", "2")) * 60
+FEED_MAX_INTERVAL = float(os.getenv("FEED_MAX_INTERVAL_MINUTES", "60")) * 60
+FEED_INITIAL_INTERVAL = float(os.getenv("FEED_INITIAL_INTERVAL_MINUTES", "5")) * 60
+# Aim to find about this many new articles per poll
+FEED_TARGET_NEW_PER_POLL = float(os.getenv("FEED_TARGET_NEW_PER_POLL", "3"))
+# Weight of the latest observation in the publish-rate estimate
+RATE_SMOOTHING = 0.3
+
+
+class FeedState:
+    """
+    Polling state of one feed: the learned publish rate, the current interval
+    and the duration of recent runs.
+    """
+
+    def __init__(self, feed_id, interval=FEED_INITIAL_INTERVAL, rate=None, runs=0,
+                 last_poll=None, last_new=0, last_duration=None, avg_duration=None):
+        self.feed_id = feed_id
+        self.interval = interval
+        self.rate = rate  # New articles per second (None until the second poll)
+        self.runs = runs
+        self.last_poll = last_poll
+        self.last_new = last_new
+        self.last_duration = last_duration
+        self.avg_duration = avg_duration
+
+    def record_run(self, new_count, started_at, duration):
+        """
+        Updates the publish-rate estimate from one poll and picks the next interval.
+        """
+        if self.last_poll is not None:
+            elapsed = max(started_at - self.last_poll, 1.0)
+            observed = new_count / elapsed
+            self.rate = observed if self.rate is None else (
+                RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * self.rate
+            )
+
+        if self.rate:
+            interval = FEED_TARGET_NEW_PER_POLL / self.rate
+        else:
+            # Nothing published yet (or first poll): back off gradually
+            interval = self.interval * (1.5 if self.last_poll is not None else 1.0)
+        # A run that takes longer than the interval would start the next one late anyway
+        interval = max(interval, duration)
+        self.interval = min(max(interval, FEED_MIN_INTERVAL), FEED_MAX_INTERVAL)
+
+        self.runs += 1
+        self.last_poll = started_at
+        self.last_new = new_count
+        self.last_duration = duration
+        self.avg_duration = duration if self.avg_duration is None else 0.8 * self.avg_duration + 0.2 * duration
+
+    def to_dict(self):
+        return {
+            "interval": self.interval,
+            "rate": self.rate,
+            "runs": self.runs,
+            "last_poll": self.last_poll,
+            "last_new": self.last_new,
+            "last_duration": self.last_duration,
+            "avg_duration": self.avg_duration,
+        }
+
+
+class FeedStateStore:
+    """
+    Keeps the state of every feed and persists it to a JSON file, so learned rates
+    survive scheduler restarts.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("FEED_STATE_PATH") or data_path("feed_state.json")
+        self._lock = threading.Lock()
+        self.states = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    for feed_id, data in json.load(f).items():
+                        self.states[feed_id] = FeedState(feed_id, **data)
+                logger.info(f"Loaded polling state for {len(self.states)} feeds.")
+            except Exception as e:
+                logger.error(f"Failed to load feed state from {self.path}: {e}")
+
+    def get(self, feed_id):
+        with self._lock:
+            if feed_id not in self.states:
+                self.states[feed_id] = FeedState(feed_id)
+            return self.states[feed_id]
+
+    def save(self):
+        with self._lock:
+            snapshot = {feed_id: state.to_dict() for feed_id, state in self.states.items()}
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def summary(self):
+        """
+        Returns the polling statistics of every feed.
+        """
+        with self._lock:
+            return {feed_id: state.to_dict() for feed_id, state in self.states.items()}
@@ -0,0 +1,198 @@
+# app/services/html_archive.py
+from contextlib import closing
+from utils.sqlite_helpers import connect, data_path
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+HTML_ARCHIVE_ENABLED = os.getenv("HTML_ARCHIVE_ENABLED", "true").lower() in ("1", "true", "yes")
+HTML_ARCHIVE_SEGMENT_BYTES = int(os.getenv("HTML_ARCHIVE_SEGMENT_MB", "256")) * 1024 * 1024
+
+# Each record in a segment: 4-byte compressed length, 32-byte SHA-256 of the raw page, zlib data
+RECORD_HEADER = struct.Struct(">I32s")
+
+
+def content_hash(text):
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+
+class HtmlArchive:
+    """
+    Append-only, content-addressed archive of fetched pages.
+    Pages are zlib-compressed and appended to segment files; a SQLite index maps each page hash to
+    its segment and offset, and each URL to the hash of its latest page, the feed entry it came
+    from and a hash of the content extracted from it. Identical pages are stored once.
+    Several processes may write at once: appends are serialized with a file lock.
+    """
+
+    def __init__(self, root=None, segment_bytes=HTML_ARCHIVE_SEGMENT_BYTES):
+        self.root = root or os.getenv("HTML_ARCHIVE_DIR") or data_path("html_archive")
+        self.segment_bytes = segment_bytes
+        os.makedirs(self.root, exist_ok=True)
+        self.index_path = os.path.join(self.root, "index.db")
+        self.lock_path = os.path.join(self.root, "append.lock")
+        self._thread_lock = threading.Lock()
+        with closing(connect(self.index_path)) as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    sha256 TEXT PRIMARY KEY,
+                    segment INTEGER NOT NULL,
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    size INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    entry TEXT NOT NULL,
+                    content_sha1 TEXT,
+                    fetched_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_pages_source ON pages (source, fetched_at);
+                CREATE INDEX IF NOT EXISTS idx_pages_fetched ON pages (fetched_at, url);
+            """)
+
+    def _segment_path(self, segment):
+        return os.path.join(self.root, f"segment-{segment:05d}.seg")
+
+    def put(self, url, source, html_content, entry=None):
+        """
+        Archives a fetched page and records it as the latest page of the URL.
+        `entry` is the feed entry the page was fetched for (title, date, ...), kept so the
+        article can be rebuilt later. Returns the page's SHA-256.
+        """
+        if isinstance(html_content, str):
+            html_content = html_content.encode("utf-8")
+        digest = hashlib.sha256(html_content).hexdigest()
+        entry = {key: value for key, value in (entry or {}).items() if key != "html"}
+        entry_json = json.dumps(entry, ensure_ascii=False, default=lambda v: v.isoformat() if hasattr(v, "isoformat") else str(v))
+
+        with closing(connect(self.index_path)) as conn:
+            if conn.execute("SELECT 1 FROM blobs WHERE sha256 = ?", (digest,)).fetchone() is None:
+                self._append(conn, digest, html_content)
+            conn.execute(
+                """
+                INSERT INTO pages (url, source, sha256, entry, fetched_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET source = excluded.source, sha256 = excluded.sha256,
+                                                entry = excluded.entry, fetched_at = excluded.fetched_at
+                """,
+                (url, source, digest, entry_json, time.time()),
+            )
+        return digest
+
+    def _append(self, conn, digest, html_content):
+        compressed = zlib.compress(html_content, 6)
+        with self._thread_lock, open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Another process may have stored the same page while we waited for the lock
+                if conn.execute("SELECT 1 FROM blobs WHERE sha256 = ?", (digest,)).fetchone() is not None:
+                    return
+                row = conn.execute("SELECT MAX(segment) AS segment FROM blobs").fetchone()
+                segment = row["segment"] or 1
+                path = self._segment_path(segment)
+                if os.path.exists(path) and os.path.getsize(path) >= self.segment_bytes:
+                    segment += 1
+                    path = self._segment_path(segment)
+                with open(path, "ab") as f:
+                    offset = f.tell()
+                    f.write(RECORD_HEADER.pack(len(compressed), bytes.fromhex(digest)))
+                    f.write(compressed)
+                    f.flush()
+                    os.fsync(f.fileno())
+                conn.execute(
+                    "INSERT INTO blobs (sha256, segment, offset, length, size) VALUES (?, ?, ?, ?, ?)",
+                    (digest, segment, offset, len(compressed), len(html_content)),
+                )
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get(self, digest):
+        """
+        Returns the raw page stored under a SHA-256, or None.
+        """
+        with closing(connect(self.index_path)) as conn:
+            row = conn.execute("SELECT segment, offset, length FROM blobs WHERE sha256 = ?", (digest,)).fetchone()
+        if row is None:
+            return None
+        with open(self._segment_path(row["segment"]), "rb") as f:
+            f.seek(row["offset"])
+            length, stored_digest = RECORD_HEADER.unpack(f.read(RECORD_HEADER.size))
+            html_content = zlib.decompress(f.read(length))
+        if stored_digest.hex() != digest:
+            raise ValueError(f"Archive record at segment {row['segment']} offset {row['offset']} is corrupt.")
+        return html_content
+
+    def record_content(self, url, content):
+        """
+        Remembers the hash of the content extracted from a URL's latest page.
+        """
+        with closing(connect(self.index_path)) as conn:
+            conn.execute("UPDATE pages SET content_sha1 = ? WHERE url = ?", (content_hash(content), url))
+
+    def iter_pages(self, source=None, since=None, page_size=500):
+        """
+        Yields the latest archived page of every URL as a dict (url, source, sha256, entry, content_sha1).
+        Rows are read page_size at a time by keyset on (fetched_at, url), each page with its own
+        connection, so memory does not grow with the archive and no read stays open while the
+        caller works.
+        """
+        clauses, params = [], []
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if since:
+            clauses.append("fetched_at >= ?")
+            params.append(since)
+        last = None
+        while True:
+            page_clauses, page_params = list(clauses), list(params)
+            if last is not None:
+                page_clauses.append("fetched_at >= ? AND (fetched_at > ? OR url > ?)")
+                page_params.extend([last[0], last[0], last[1]])
+            query = "SELECT url, source, sha256, entry, content_sha1, fetched_at FROM pages"
+            if page_clauses:
+                query += " WHERE " + " AND ".join(page_clauses)
+            query += " ORDER BY fetched_at, url LIMIT ?"
+            with closing(connect(self.index_path)) as conn:
+                rows = conn.execute(query, page_params + [page_size]).fetchall()
+            for row in rows:
+                page = dict(row)
+                last = (page.pop("fetched_at"), page["url"])
+                page["entry"] = json.loads(page["entry"])
+                yield page
+            if len(rows) < page_size:
+                return
+
+    def stats(self):
+        with closing(connect(self.index_path)) as conn:
+            blobs = conn.execute("SELECT COUNT(*) AS n, SUM(size) AS raw, SUM(length) AS stored FROM blobs").fetchone()
+            pages = conn.execute("SELECT COUNT(*) AS n FROM pages").fetchone()
+        return {"pages": pages["n"], "blobs": blobs["n"], "raw_bytes": blobs["raw"] or 0,
+                "stored_bytes": blobs["stored"] or 0}
+
+
+_html_archive_instance = None
+_html_archive_lock = threading.Lock()
+
+
+def get_html_archive():
+    """
+    Get or create the process-wide archive, or None if archiving is disabled.
+    """
+    global _html_archive_instance
+    if not HTML_ARCHIVE_ENABLED:
+        return None
+    with _html_archive_lock:
+        if _html_archive_instance is None:
+            _html_archive_instance = HtmlArchive()
+        return _html_archive_instance
@@ -0,0 +1,203 @@
+# app/services/job_queue.py
+from contextlib import closing
+from utils.sqlite_helpers import connect, data_path
+import json
+import logging
+import os
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ("queued", "processing", "done", "failed")
+
+
+class JobQueue:
+    """
+    Durable job queue backed by a local SQLite file.
+    Workers lease jobs in batches; a lease that expires (for example because the worker died)
+    makes the job available again, up to max_attempts.
+    """
+
+    def __init__(self, path=None, lease_seconds=300, max_attempts=3):
+        self.path = path or os.getenv("INGEST_QUEUE_PATH") or data_path("ingest_queue.db")
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        with closing(connect(self.path)) as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+            """)
+
+    def enqueue(self, payload, kind="ingest"):
+        """
+        Adds a job and returns its ID.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with closing(connect(self.path)) as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(payload, ensure_ascii=False, default=str), now, now),
+            )
+        return job_id
+
+    def enqueue_many(self, payloads, kind="ingest"):
+        """
+        Adds several jobs in one transaction and returns their IDs, in order.
+        """
+        job_ids = [uuid.uuid4().hex for _ in payloads]
+        now = time.time()
+        with closing(connect(self.path)) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO jobs (id, kind, status, payload, created_at, updated_at) VALUES (?, ?, 'queued', ?, ?, ?)",
+                    [(job_id, kind, json.dumps(payload, ensure_ascii=False, default=str), now, now)
+                     for job_id, payload in zip(job_ids, payloads)],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return job_ids
+
+    def lease_batch(self, worker_id, batch_size=32, kind="ingest"):
+        """
+        Atomically leases up to batch_size queued (or lease-expired) jobs for a worker.
+        Lease-expired jobs that have used up max_attempts are marked failed instead.
+        Returns a list of (job_id, payload).
+        """
+        now = time.time()
+        with closing(connect(self.path)) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # A job whose lease expired on its last attempt most likely killed or hung its worker
+                conn.execute(
+                    """
+                    UPDATE jobs SET status = 'failed', error = 'Lease expired after the last attempt.',
+                                    lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                    WHERE kind = ? AND status = 'processing' AND lease_expires < ? AND attempts >= ?
+                    """,
+                    (now, kind, now, self.max_attempts),
+                )
+                rows = conn.execute(
+                    """
+                    SELECT id, payload FROM jobs
+                    WHERE kind = ? AND (status = 'queued'
+                                        OR (status = 'processing' AND lease_expires < ? AND attempts < ?))
+                    ORDER BY created_at
+                    LIMIT ?
+                    """,
+                    (kind, now, self.max_attempts, batch_size),
+                ).fetchall()
+                conn.executemany(
+                    """
+                    UPDATE jobs SET status = 'processing', lease_owner = ?, lease_expires = ?,
+                                    attempts = attempts + 1, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    [(worker_id, now + self.lease_seconds, now, row["id"]) for row in rows],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return [(row["id"], json.loads(row["payload"])) for row in rows]
+
+    def renew(self, worker_id, job_ids):
+        """
+        Extends the leases a worker still holds. Returns the IDs that are still leased to it.
+        """
+        now = time.time()
+        held = []
+        with closing(connect(self.path)) as conn:
+            for job_id in job_ids:
+                cursor = conn.execute(
+                    """
+                    UPDATE jobs SET lease_expires = ?, updated_at = ?
+                    WHERE id = ? AND status = 'processing' AND lease_owner = ?
+                    """,
+                    (now + self.lease_seconds, now, job_id, worker_id),
+                )
+                if cursor.rowcount:
+                    held.append(job_id)
+        return held
+
+    def complete(self, worker_id, job_id, result=None):
+        """
+        Marks a job leased by this worker as done and stores its result. Returns False if the lease was lost.
+        """
+        with closing(connect(self.path)) as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_expires = NULL, updated_at = ?
+                WHERE id = ? AND lease_owner = ? AND status = 'processing'
+                """,
+                (json.dumps(result, ensure_ascii=False, default=str), time.time(), job_id, worker_id),
+            )
+        return cursor.rowcount > 0
+
+    def fail(self, worker_id, job_id, error):
+        """
+        Records a failure of a job leased by this worker. The job is queued again unless it has
+        used up max_attempts. Returns False if the lease was lost.
+        """
+        with closing(connect(self.path)) as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END,
+                                error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                WHERE id = ? AND lease_owner = ? AND status = 'processing'
+                """,
+                (self.max_attempts, str(error), time.time(), job_id, worker_id),
+            )
+        return cursor.rowcount > 0
+
+    def get(self, job_id):
+        """
+        Returns a job's status as a dict, or None if it does not exist.
+        """
+        with closing(connect(self.path)) as conn:
+            row = conn.execute(
+                "SELECT id, kind, status, result, error, attempts, created_at, updated_at FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def counts(self):
+        """
+        Returns the number of jobs per status.
+        """
+        with closing(connect(self.path)) as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
+
+    def purge_finished(self, older_than_seconds=7 * 24 * 3600):
+        """
+        Deletes finished jobs older than the given age so the queue file does not grow without bound.
+        """
+        with closing(connect(self.path)) as conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated_at < ?",
+                (time.time() - older_than_seconds,),
+            )
+        return cursor.rowcount
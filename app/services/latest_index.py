@@ -0,0 +1,174 @@
+# app/services/latest_index.py
+from contextlib import closing
+from datetime import datetime, timezone
+from utils.common import parse_iso_datetime
+from utils.sqlite_helpers import connect, data_path
+import base64
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+LATEST_INDEX_ENABLED = os.getenv("LATEST_INDEX_ENABLED", "true").lower() in ("1", "true", "yes")
+# Characters of content kept per article for listings
+LATEST_SNIPPET_CHARS = int(os.getenv("LATEST_SNIPPET_CHARS", "300"))
+LATEST_MAX_LIMIT = 100
+
+
+def encode_cursor(date_ts, article_id):
+    return base64.urlsafe_b64encode(json.dumps([date_ts, article_id]).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """
+    Returns (date_ts, article_id) from a cursor; raises ValueError if it is malformed.
+    """
+    try:
+        date_ts, article_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(date_ts), str(article_id)
+    except Exception:
+        raise ValueError("Invalid cursor.")
+
+
+class LatestIndex:
+    """
+    Time-ordered index of stored articles in a local SQLite file, for browsing the newest
+    articles per source and category without a model pass or a vector-store call.
+    Ingestion adds every stored title record (ArticleProcessor ingest hooks). Pages are read
+    with keyset pagination on (date, id), using an index per filter, so each page costs the
+    same however deep the client scrolls.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("LATEST_INDEX_PATH") or data_path("latest.db")
+        self._local = threading.local()
+        with closing(connect(self.path)) as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS latest_articles (
+                    id TEXT PRIMARY KEY,
+                    date_ts REAL NOT NULL,
+                    date TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    source_url TEXT NOT NULL,
+                    snippet TEXT NOT NULL,
+                    ingested_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS latest_by_date ON latest_articles (date_ts, id);
+                CREATE INDEX IF NOT EXISTS latest_by_source ON latest_articles (source, date_ts, id);
+                CREATE INDEX IF NOT EXISTS latest_by_category ON latest_articles (category, date_ts, id);
+                CREATE INDEX IF NOT EXISTS latest_by_source_category ON latest_articles (source, category, date_ts, id);
+            """)
+
+    def _conn(self):
+        # One connection per thread; the API serves many small reads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    @staticmethod
+    def row_for(record, now):
+        metadata = record["metadata"]
+        # Undated articles are stored with date "None"; they are listed at their ingest time
+        parsed = parse_iso_datetime(metadata.get("date"))
+        date_ts = parsed.timestamp() if parsed else now
+        date = metadata["date"] if parsed else datetime.fromtimestamp(now, timezone.utc).isoformat()
+        return (
+            record["id"], date_ts, date,
+            metadata.get("source", ""), metadata.get("category", ""), metadata.get("title", ""),
+            metadata.get("source_url", ""), (metadata.get("content") or "")[:LATEST_SNIPPET_CHARS], now,
+        )
+
+    def add_records(self, records):
+        """
+        Adds or updates the articles of title records (as built by ArticleProcessor).
+        Returns the records whose article was not in the index before.
+        """
+        if not records:
+            return []
+        now = time.time()
+        ids = [record["id"] for record in records]
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            known = set()
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT id FROM latest_articles WHERE id IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                known.update(row["id"] for row in rows)
+            conn.executemany(
+                """
+                INSERT INTO latest_articles (id, date_ts, date, source, category, title, source_url, snippet, ingested_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    date_ts = excluded.date_ts, date = excluded.date, source = excluded.source,
+                    category = CASE WHEN excluded.category != '' THEN excluded.category ELSE category END,
+                    title = excluded.title, source_url = excluded.source_url, snippet = excluded.snippet
+                """,
+                [self.row_for(record, now) for record in records],
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return [record for record in records if record["id"] not in known]
+
+    def latest(self, source=None, category=None, date_from=None, date_to=None, limit=20, cursor=None):
+        """
+        Returns (articles, next cursor or None): the newest articles matching the filters,
+        newest first. source and category may be a single value or a list.
+        """
+        clauses, params = [], []
+        for column, values in (("source", source), ("category", category)):
+            if values:
+                values = [values] if isinstance(values, str) else list(values)
+                clauses.append(f"{column} IN ({','.join('?' * len(values))})")
+                params += values
+        if date_from is not None:
+            clauses.append("date_ts >= ?")
+            params.append(parse_iso_datetime(date_from).timestamp())
+        if date_to is not None:
+            clauses.append("date_ts <= ?")
+            params.append(parse_iso_datetime(date_to).timestamp())
+        if cursor:
+            # The plain range on date_ts lets SQLite seek to the cursor instead of scanning up to it
+            cursor_ts, cursor_id = decode_cursor(cursor)
+            clauses.append("date_ts <= ? AND (date_ts < ? OR id < ?)")
+            params += [cursor_ts, cursor_ts, cursor_id]
+
+        limit = max(1, min(limit, LATEST_MAX_LIMIT))
+        query = "SELECT id, date_ts, date, source, category, title, source_url, snippet FROM latest_articles"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY date_ts DESC, id DESC LIMIT ?"
+        rows = self._conn().execute(query, params + [limit + 1]).fetchall()
+
+        articles = [
+            {key: row[key] for key in ("id", "title", "source_url", "date", "source", "category", "snippet")}
+            for row in rows[:limit]
+        ]
+        next_cursor = encode_cursor(rows[limit - 1]["date_ts"], rows[limit - 1]["id"]) if len(rows) > limit else None
+        return articles, next_cursor
+
+    def count(self):
+        return self._conn().execute("SELECT COUNT(*) FROM latest_articles").fetchone()[0]
+
+
+# Module-level singleton instance
+_latest_index_instance = None
+_latest_index_lock = threading.Lock()
+
+
+def get_latest_index():
+    global _latest_index_instance
+    with _latest_index_lock:
+        if _latest_index_instance is None:
+            _latest_index_instance = LatestIndex()
+    return _latest_index_instance
@@ -0,0 +1,117 @@
+# app/services/local_index.py
+import logging
+import os
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STORAGE_DTYPES = ("float32", "float16", "int8")
+# Rows scored per matrix product during search, which bounds the temporary float32 copy
+SEARCH_BLOCK_ROWS = 65536
+
+
+def normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class LocalVectorIndex:
+    """
+    In-memory exact cosine-similarity index with compact storage.
+    Vectors are L2-normalized and stored as float32, float16 (half the memory) or int8 with a
+    per-vector scale (a quarter of the memory). Scores are computed block by block in float32.
+    """
+
+    def __init__(self, dim, dtype="float32"):
+        if dtype not in STORAGE_DTYPES:
+            raise ValueError(f"dtype must be one of {STORAGE_DTYPES}, got '{dtype}'.")
+        self.dim = dim
+        self.dtype = dtype
+        self.ids = []
+        self._blocks = []  # Appended (codes, scales) pairs, merged on first search
+        self._codes = np.zeros((0, dim), dtype=dtype)
+        self._scales = np.zeros(0, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        self._merge()
+        return self._codes.nbytes + (self._scales.nbytes if self.dtype == "int8" else 0)
+
+    def encode(self, vectors):
+        """
+        Normalizes vectors and converts them to the storage type. Returns (codes, scales).
+        """
+        vectors = normalize_rows(vectors)
+        if self.dtype == "int8":
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            codes = np.round(vectors / scales[:, None]).astype(np.int8)
+            return codes, scales.astype(np.float32)
+        return vectors.astype(self.dtype), np.ones(len(vectors), dtype=np.float32)
+
+    def add(self, ids, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        if len(ids) != len(vectors):
+            raise ValueError(f"Got {len(ids)} IDs for {len(vectors)} vectors.")
+        if not len(vectors):
+            return
+        self._blocks.append(self.encode(vectors))
+        self.ids.extend(ids)
+
+    def _merge(self):
+        if self._blocks:
+            self._codes = np.concatenate([self._codes] + [codes for codes, _ in self._blocks])
+            self._scales = np.concatenate([self._scales] + [scales for _, scales in self._blocks])
+            self._blocks = []
+
+    def search(self, queries, top_k=10):
+        """
+        Returns, for each query vector, up to top_k (id, score) pairs with the highest cosine
+        similarity, best first. queries may be one vector or a (n, dim) matrix.
+        """
+        self._merge()
+        queries = normalize_rows(np.asarray(queries, dtype=np.float32).reshape(-1, self.dim))
+        top_k = min(top_k, len(self.ids))
+        if not top_k:
+            return [[] for _ in range(len(queries))]
+
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        for start in range(0, len(self.ids), SEARCH_BLOCK_ROWS):
+            codes = self._codes[start:start + SEARCH_BLOCK_ROWS].astype(np.float32)
+            scores = (queries @ codes.T) * self._scales[start:start + SEARCH_BLOCK_ROWS]
+            rows = np.broadcast_to(np.arange(start, start + len(codes)), scores.shape)
+            # Keep the running top_k of everything seen so far
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_rows = np.concatenate([best_rows, rows], axis=1)
+            if best_scores.shape[1] > top_k:
+                keep = np.argpartition(-best_scores, top_k - 1, axis=1)[:, :top_k]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        return [
+            [(self.ids[row], float(score)) for row, score in zip(rows, scores)]
+            for rows, scores in zip(best_rows, best_scores)
+        ]
+
+    def save(self, path):
+        self._merge()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez(path, ids=np.array(self.ids, dtype=str), codes=self._codes, scales=self._scales,
+                 dtype=np.array(self.dtype))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            index = cls(data["codes"].shape[1], dtype=str(data["dtype"]))
+            index.ids = data["ids"].tolist()
+            index._codes = data["codes"]
+            index._scales = data["scales"]
+        return index
@@ -0,0 +1,81 @@
+# app/services/micro_batcher.py
+from concurrent.futures import Future
+from queue import Queue, Empty
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent encode requests into one batched call.
+    A background thread waits for the first request, then keeps collecting until max_batch_size
+    texts are waiting or max_wait_ms has passed, runs encode_fn once over all of them and hands
+    each caller its own rows. Under load, many batch-of-one queries become one forward pass.
+    """
+
+    def __init__(self, encode_fn, max_batch_size=32, max_wait_ms=5.0):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = Queue()
+        self.batches = 0
+        self.texts = 0
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts):
+        """
+        Queues texts for encoding. Returns a Future resolving to an array with one row per text.
+        """
+        future = Future()
+        self._queue.put((list(texts), future))
+        return future
+
+    def encode(self, texts, timeout=None):
+        return self.submit(texts).result(timeout=timeout)
+
+    def _collect(self):
+        requests = [self._queue.get()]
+        count = len(requests[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while count < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except Empty:
+                break
+            requests.append(request)
+            count += len(request[0])
+        return requests
+
+    def _run(self):
+        while True:
+            requests = self._collect()
+            texts = [text for request_texts, _ in requests for text in request_texts]
+            try:
+                embeddings = self.encode_fn(texts)
+            except Exception as e:
+                logger.error(f"Batched encoding of {len(texts)} texts failed: {e}")
+                for _, future in requests:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.texts += len(texts)
+            start = 0
+            for request_texts, future in requests:
+                future.set_result(embeddings[start:start + len(request_texts)])
+                start += len(request_texts)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "queued_requests": self._queue.qsize(),
+        }
@@ -0,0 +1,232 @@
+# app/services/namespace_registry.py
+from contextlib import closing
+from utils.sqlite_helpers import connect, data_path
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# How long a process keeps using a resolved namespace before reading the registry again
+NAMESPACE_REGISTRY_TTL_SECONDS = float(os.getenv("NAMESPACE_REGISTRY_TTL_SECONDS", "5"))
+
+
+class NamespaceRegistry:
+    """
+    Maps the logical namespaces the code uses ("title", "content") to the physical Pinecone
+    index and namespace that currently serve them, in a SQLite file shared by all processes.
+    A re-index writes into a new namespace and then switches one or more aliases in a single
+    transaction; the previous target is kept so the switch can be rolled back. Names that are
+    not registered resolve to themselves in the default index.
+    It also records the monthly partitions of time-partitioned namespaces (services/partitions.py).
+    """
+
+    def __init__(self, path=None, ttl=NAMESPACE_REGISTRY_TTL_SECONDS):
+        self.path = path or os.getenv("NAMESPACE_REGISTRY_PATH") or data_path("namespaces.db")
+        self.ttl = ttl
+        self._cache = None
+        self._cache_expires = 0.0
+        self._partition_cache = {}  # (index_name, base) -> (expires, rows)
+        self._known_partitions = {}  # Partitions this process registered recently -> re-check time
+        self._lock = threading.Lock()
+        with closing(connect(self.path)) as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS namespace_aliases (
+                    alias TEXT PRIMARY KEY,
+                    index_name TEXT,
+                    namespace TEXT NOT NULL,
+                    dimension INTEGER,
+                    previous_index_name TEXT,
+                    previous_namespace TEXT,
+                    previous_dimension INTEGER,
+                    switched_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS namespace_switches (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    alias TEXT NOT NULL,
+                    index_name TEXT,
+                    namespace TEXT NOT NULL,
+                    dimension INTEGER,
+                    details TEXT,
+                    switched_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS namespace_partitions (
+                    index_name TEXT NOT NULL,
+                    base TEXT NOT NULL,
+                    month TEXT NOT NULL,
+                    namespace TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (index_name, base, month)
+                );
+            """)
+
+    def entries(self):
+        """
+        Returns {alias: entry dict} for every registered alias, cached for ttl seconds.
+        """
+        with self._lock:
+            if self._cache is not None and time.monotonic() < self._cache_expires:
+                return self._cache
+        with closing(connect(self.path)) as conn:
+            rows = conn.execute("SELECT * FROM namespace_aliases").fetchall()
+        entries = {row["alias"]: dict(row) for row in rows}
+        with self._lock:
+            self._cache = entries
+            self._cache_expires = time.monotonic() + self.ttl
+        return entries
+
+    def resolve(self, alias, dimension=None):
+        """
+        Returns (index_name, namespace) serving an alias; index_name None means the default index.
+        When dimension is given and only the previous target has that dimension (a process still
+        running the old embedding settings after a switch), the previous target is returned.
+        """
+        entry = self.entries().get(alias)
+        if entry is None:
+            return None, alias
+        if (dimension and entry["dimension"] and entry["dimension"] != dimension
+                and entry["previous_namespace"] and entry["previous_dimension"] == dimension):
+            return entry["previous_index_name"], entry["previous_namespace"]
+        return entry["index_name"], entry["namespace"]
+
+    def switch(self, targets, details=None):
+        """
+        Points several aliases at new targets atomically.
+        targets maps alias -> (index_name, namespace, dimension).
+        """
+        now = time.time()
+        with closing(connect(self.path)) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for alias, (index_name, namespace, dimension) in targets.items():
+                    row = conn.execute("SELECT * FROM namespace_aliases WHERE alias = ?", (alias,)).fetchone()
+                    # Unregistered aliases were served by the namespace of the same name
+                    previous = (row["index_name"], row["namespace"], row["dimension"]) if row else (None, alias, None)
+                    conn.execute(
+                        """
+                        INSERT OR REPLACE INTO namespace_aliases
+                            (alias, index_name, namespace, dimension, previous_index_name, previous_namespace,
+                             previous_dimension, switched_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        (alias, index_name, namespace, dimension) + previous + (now,),
+                    )
+                    conn.execute(
+                        "INSERT INTO namespace_switches (alias, index_name, namespace, dimension, details, switched_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (alias, index_name, namespace, dimension, json.dumps(details or {}), now),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        self.invalidate()
+        logger.info(f"Switched namespaces: {targets}")
+
+    def rollback(self, aliases):
+        """
+        Points aliases back at their previous targets, atomically.
+        """
+        entries = self.entries()
+        targets = {}
+        for alias in aliases:
+            entry = entries.get(alias)
+            if entry is None or not entry["previous_namespace"]:
+                raise ValueError(f"Alias '{alias}' has no previous namespace to roll back to.")
+            targets[alias] = (entry["previous_index_name"], entry["previous_namespace"], entry["previous_dimension"])
+        self.switch(targets, details={"rollback": True})
+
+    def history(self, alias=None, limit=20):
+        query = "SELECT * FROM namespace_switches"
+        params = ()
+        if alias:
+            query += " WHERE alias = ?"
+            params = (alias,)
+        with closing(connect(self.path)) as conn:
+            rows = conn.execute(query + " ORDER BY id DESC LIMIT ?", params + (limit,)).fetchall()
+        return [dict(row, details=json.loads(row["details"] or "{}")) for row in rows]
+
+    def register_partition(self, index_name, base, month, namespace):
+        """
+        Records that a monthly partition holds vectors. A partition dropped by retention becomes
+        active again if late articles for its month arrive.
+        """
+        key = (index_name, base, month)
+        if self._known_partitions.get(key, 0.0) > time.monotonic():
+            return
+        with closing(connect(self.path)) as conn:
+            conn.execute(
+                """
+                INSERT INTO namespace_partitions (index_name, base, month, namespace, status, updated_at)
+                VALUES (?, ?, ?, ?, 'active', ?)
+                ON CONFLICT (index_name, base, month) DO UPDATE SET status = 'active', updated_at = excluded.updated_at
+                WHERE namespace_partitions.status != 'active'
+                """,
+                (index_name, base, month, namespace, time.time()),
+            )
+        with self._lock:
+            # Re-checked now and then, in case retention dropped the partition in another process
+            self._known_partitions[key] = time.monotonic() + self.ttl * 12
+            self._partition_cache.pop((index_name, base), None)
+
+    def partitions(self, index_name, base, status="active"):
+        """
+        Returns the partitions of a base namespace, oldest first, as dicts with month, namespace
+        and status. Active partitions are cached for ttl seconds; status=None returns all.
+        """
+        key = (index_name, base)
+        if status == "active":
+            with self._lock:
+                cached = self._partition_cache.get(key)
+                if cached and time.monotonic() < cached[0]:
+                    return cached[1]
+        query = "SELECT month, namespace, status FROM namespace_partitions WHERE index_name = ? AND base = ?"
+        params = (index_name, base)
+        if status:
+            query += " AND status = ?"
+            params += (status,)
+        with closing(connect(self.path)) as conn:
+            rows = [dict(row) for row in conn.execute(query + " ORDER BY month", params).fetchall()]
+        if status == "active":
+            with self._lock:
+                self._partition_cache[key] = (time.monotonic() + self.ttl, rows)
+        return rows
+
+    def partitioned_bases(self):
+        """
+        Returns (index_name, base) for every namespace that has monthly partitions.
+        """
+        with closing(connect(self.path)) as conn:
+            rows = conn.execute("SELECT DISTINCT index_name, base FROM namespace_partitions ORDER BY index_name, base")
+            return [(row["index_name"], row["base"]) for row in rows.fetchall()]
+
+    def set_partition_status(self, index_name, base, month, status):
+        with closing(connect(self.path)) as conn:
+            conn.execute(
+                "UPDATE namespace_partitions SET status = ?, updated_at = ? WHERE index_name = ? AND base = ? AND month = ?",
+                (status, time.time(), index_name, base, month),
+            )
+        with self._lock:
+            self._known_partitions.pop((index_name, base, month), None)
+            self._partition_cache.pop((index_name, base), None)
+
+    def invalidate(self):
+        with self._lock:
+            self._cache = None
+            self._partition_cache.clear()
+
+
+# Module-level singleton instance
+_registry_instance = None
+_registry_lock = threading.Lock()
+
+
+def get_namespace_registry():
+    global _registry_instance
+    with _registry_lock:
+        if _registry_instance is None:
+            _registry_instance = NamespaceRegistry()
+    return _registry_instance
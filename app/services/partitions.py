@@ -0,0 +1,138 @@
+# app/services/partitions.py
+"""
+Time partitioning of article namespaces. With TIME_PARTITIONS_ENABLED, vectors written to a
+partitioned namespace such as "title" land in one namespace per month of the article date,
+"title-2024-05", and reads fan out over the months they need. The months that exist are
+recorded in the namespace registry; retention drops or archives whole months.
+"""
+from datetime import datetime, timezone
+from services.namespace_registry import get_namespace_registry
+from services.snapshot import export_namespace
+from utils.common import parse_iso_datetime
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+TIME_PARTITIONS_ENABLED = os.getenv("TIME_PARTITIONS_ENABLED", "false").lower() in ("1", "true", "yes")
+# Namespace families split by month; versioned copies from a re-index ("title-v2") count as their family
+TIME_PARTITIONED_NAMESPACES = [
+    name.strip() for name in os.getenv("TIME_PARTITIONED_NAMESPACES", "title,content").split(",") if name.strip()
+]
+# Months kept by the retention job; 0 keeps everything
+TIME_PARTITION_RETENTION_MONTHS = int(os.getenv("TIME_PARTITION_RETENTION_MONTHS", "0"))
+# Expired partitions are written here before they are dropped; empty drops them outright
+TIME_PARTITION_ARCHIVE_DIR = os.getenv("TIME_PARTITION_ARCHIVE_DIR", "")
+
+PARTITION_SUFFIX_PATTERN = re.compile(r"-(\d{4}-\d{2})$")
+
+
+def is_partitioned(namespace):
+    """
+    True if writes to this (physical, base) namespace are split into monthly partitions.
+    """
+    if not TIME_PARTITIONS_ENABLED or PARTITION_SUFFIX_PATTERN.search(namespace):
+        return False
+    return namespace.split("-", 1)[0] in TIME_PARTITIONED_NAMESPACES
+
+
+def month_of(date_value):
+    """
+    Returns the "YYYY-MM" partition of an article date; undated articles go to the current month.
+    """
+    parsed = parse_iso_datetime(date_value) or datetime.now(timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime("%Y-%m")
+
+
+def partition_namespace(base, month):
+    return f"{base}-{month}"
+
+
+def month_in_range(month, date_from=None, date_to=None):
+    """
+    True if the month overlaps [date_from, date_to] (datetimes or ISO strings; either may be None).
+    The bounds are compared in UTC, the time zone partitions are keyed by (see month_of).
+    """
+    date_from, date_to = parse_iso_datetime(date_from), parse_iso_datetime(date_to)
+    if date_from is not None and month < date_from.astimezone(timezone.utc).strftime("%Y-%m"):
+        return False
+    if date_to is not None and month > date_to.astimezone(timezone.utc).strftime("%Y-%m"):
+        return False
+    return True
+
+
+def retention_cutoff(months=TIME_PARTITION_RETENTION_MONTHS, now=None):
+    """
+    Returns the oldest month kept ("YYYY-MM"), or None when retention is off.
+    """
+    if months <= 0:
+        return None
+    now = now or datetime.now(timezone.utc)
+    index = now.year * 12 + (now.month - 1) - (months - 1)
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def archive_partition(vector_db, index_name, namespace, archive_dir):
+    """
+    Writes every vector of a partition to a snapshot (services/snapshot.py) in
+    <archive_dir>/<index_name>/<namespace>. Returns (path, vector count).
+    """
+    path = os.path.join(archive_dir, index_name, namespace)
+    manifest = export_namespace(vector_db, namespace, path, index_name=index_name)
+    return path, manifest["count"]
+
+
+def apply_retention(vector_db, months=TIME_PARTITION_RETENTION_MONTHS, archive_dir=TIME_PARTITION_ARCHIVE_DIR,
+                    dry_run=False):
+    """
+    Drops every active monthly partition older than the retention window, one bulk namespace
+    delete per partition. With an archive_dir, each partition is written there first.
+    Returns the list of expired partitions handled.
+    """
+    cutoff = retention_cutoff(months)
+    if cutoff is None:
+        return []
+    registry = get_namespace_registry()
+    expired = []
+    for index_name, base in registry.partitioned_bases():
+        for partition in registry.partitions(index_name, base):
+            if partition["month"] >= cutoff:
+                continue
+            expired.append(partition["namespace"])
+            if dry_run:
+                logger.info(f"Would expire partition {partition['namespace']} ({index_name}).")
+                continue
+            status = "dropped"
+            if archive_dir:
+                path, count = archive_partition(vector_db, index_name, partition["namespace"], archive_dir)
+                logger.info(f"Archived {count} vectors of {partition['namespace']} to {path}.")
+                status = "archived"
+            vector_db.delete_namespace(partition["namespace"], index_name=index_name)
+            registry.set_partition_status(index_name, base, partition["month"], status)
+            logger.info(f"Partition {partition['namespace']} expired ({status}); retention keeps {cutoff} onwards.")
+    return expired
+
+
+def migrate_unpartitioned(vector_db, index_name, base, batch_size=100):
+    """
+    Moves the vectors written to a base namespace before partitioning was enabled into their
+    monthly partitions (stored values are reused, nothing is re-embedded). Returns the count moved.
+    """
+    index = vector_db.index_for(index_name)
+    moved = 0
+    for id_batch in index.list(namespace=base, limit=batch_size):
+        if not id_batch:
+            continue
+        results = index.fetch(ids=list(id_batch), namespace=base)
+        vectors = results.vectors if hasattr(results, 'vectors') else {}
+        records = [
+            {"id": vector_id, "values": vector["values"], "metadata": vector["metadata"] or {}}
+            for vector_id, vector in vectors.items()
+        ]
+        if records:
+            vector_db.upsert_vectors(records, namespace=base, index_name=index_name)
+            index.delete(ids=[record["id"] for record in records], namespace=base)
+            moved += len(records)
+            logger.info(f"Moved {moved} vectors of {base} into monthly partitions.")
+    return moved
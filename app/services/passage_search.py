@@ -0,0 +1,63 @@
+# app/services/passage_search.py
+import logging
+import os
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Passage matches requested from Pinecone per article wanted, since one article can match many times
+PASSAGE_CANDIDATES_PER_ARTICLE = int(os.getenv("PASSAGE_CANDIDATES_PER_ARTICLE", "4"))
+PASSAGES_PER_ARTICLE = int(os.getenv("PASSAGES_PER_ARTICLE", "3"))
+# Pinecone's top_k limit for queries that include metadata
+PASSAGE_MAX_TOP_K = 1000
+
+
+def passage_top_k(articles_wanted):
+    return min(PASSAGE_MAX_TOP_K, max(1, articles_wanted) * PASSAGE_CANDIDATES_PER_ARTICLE)
+
+
+def group_passages(matches, max_passages=PASSAGES_PER_ARTICLE):
+    """
+    Groups passage matches by article in one vectorized pass.
+    Returns one entry per article, best first: {"article_id", "score", "metadata", "passages"},
+    where score is the article's best passage score, metadata is that passage's metadata and
+    passages holds up to max_passages {"text", "chunk_index", "score"} dicts, best first.
+    """
+    if not matches:
+        return []
+
+    article_ids = np.array([
+        match["metadata"].get("article_id") or f"{match['metadata'].get('source_url', match['id'])}-title"
+        for match in matches
+    ])
+    scores = np.array([match["score"] for match in matches], dtype=np.float32)
+    groups, group_of = np.unique(article_ids, return_inverse=True)
+
+    # Order by article, then by descending score; the first row of each run is the article's best passage
+    order = np.lexsort((-scores, group_of))
+    sorted_groups = group_of[order]
+    run_starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    rank_in_group = np.arange(len(order)) - np.repeat(run_starts, np.diff(np.r_[run_starts, len(order)]))
+
+    best_rows = order[run_starts]
+    kept = order[rank_in_group < max_passages]
+    passages = {group: [] for group in range(len(groups))}
+    for row in kept:
+        metadata = matches[row]["metadata"]
+        passages[group_of[row]].append({
+            "text": metadata.get("text", ""),
+            "chunk_index": metadata.get("chunk_index"),
+            "score": float(scores[row]),
+        })
+
+    results = []
+    for row in best_rows[np.argsort(-scores[best_rows], kind="stable")]:
+        group = group_of[row]
+        results.append({
+            "article_id": str(groups[group]),
+            "score": float(scores[row]),
+            "metadata": matches[row]["metadata"],
+            "passages": passages[group],
+        })
+    logger.debug(f"Grouped {len(matches)} passage matches into {len(results)} articles.")
+    return results
@@ -0,0 +1,143 @@
+# app/services/phobert_tokenizer.py
+from transformers import AutoTokenizer, PreTrainedTokenizerFast
+from utils.sqlite_helpers import data_path
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+PHOBERT_FAST_TOKENIZER = os.getenv("PHOBERT_FAST_TOKENIZER", "true").lower() in ("1", "true", "yes")
+
+# Vietnamese sample checked against the slow tokenizer before a converted tokenizer is used
+PARITY_SAMPLES = [
+    "Hôm nay trời Hà Nội mưa to kéo dài từ sáng đến chiều",
+    "Giá vàng SJC tăng mạnh lên 85 triệu đồng mỗi lượng",
+    "Đội tuyển Việt Nam thắng Indonesia 3 0 tại vòng loại World Cup",
+    "Ngân hàng Nhà nước điều chỉnh lãi suất điều hành từ ngày 1 7",
+    "TP HCM khởi công tuyến metro số 2 Bến Thành Tham Lương",
+    "Thủ tướng chỉ đạo đẩy nhanh giải ngân vốn đầu tư công năm 2024",
+    "Học sinh lớp 12 bước vào kỳ thi tốt nghiệp THPT với 6 môn",
+    "Apple ra mắt iPhone mới với chip A18 và camera 48MP",
+    "Bão số 3 Yagi đổ bộ Quảng Ninh Hải Phòng gây thiệt hại nặng",
+    "Chỉ số VN Index giảm gần 20 điểm thanh khoản sụt giảm",
+]
+
+
+def fast_tokenizer_dir(model_name):
+    return os.getenv("PHOBERT_FAST_TOKENIZER_DIR") or data_path(f"tokenizers/{model_name.replace('/', '--')}-fast")
+
+
+def convert_slow_tokenizer(slow_tokenizer):
+    """
+    Builds a Rust (tokenizers) BPE tokenizer equivalent to PhoBERT's slow Python tokenizer.
+
+    PhoBERT uses subword-nmt BPE: inside merges the last piece of a word ends with "</w>", and in
+    the vocabulary non-final pieces end with "@@". Vocabulary tokens are renamed to the "</w>"
+    convention with their original IDs. Intermediate merge symbols missing from the vocabulary get
+    IDs past the model's vocabulary; map_unknown_ids turns them into <unk>, which is what the slow
+    tokenizer produces when such a piece is left over.
+    """
+    from tokenizers import Tokenizer, models, pre_tokenizers, processors, decoders
+
+    special_tokens = set(slow_tokenizer.all_special_tokens)
+    vocab = {}
+    for token, token_id in slow_tokenizer.get_vocab().items():
+        if token in special_tokens:
+            vocab[token] = token_id
+        elif token.endswith("@@"):
+            vocab[token[:-2]] = token_id
+        else:
+            vocab[token + "</w>"] = token_id
+
+    next_id = max(vocab.values()) + 1
+    merges = [pair for pair, _ in sorted(slow_tokenizer.bpe_ranks.items(), key=lambda item: item[1]) if len(pair) == 2]
+    for left, right in merges:
+        for symbol in (left, right, left + right):
+            if symbol not in vocab:
+                vocab[symbol] = next_id
+                next_id += 1
+
+    tokenizer = Tokenizer(models.BPE(
+        vocab=vocab, merges=merges, unk_token=slow_tokenizer.unk_token, end_of_word_suffix="</w>",
+    ))
+    # The slow tokenizer splits on whitespace only and does no normalization
+    tokenizer.pre_tokenizer = pre_tokenizers.WhitespaceSplit()
+    tokenizer.decoder = decoders.BPEDecoder(suffix="</w>")
+    bos, eos = slow_tokenizer.bos_token, slow_tokenizer.eos_token
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single=f"{bos} $A {eos}",
+        pair=f"{bos} $A {eos} {eos} $B {eos}",
+        special_tokens=[(bos, slow_tokenizer.bos_token_id), (eos, slow_tokenizer.eos_token_id)],
+    )
+    tokenizer.add_special_tokens(list(slow_tokenizer.all_special_tokens))
+
+    return PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer,
+        bos_token=bos, eos_token=eos, unk_token=slow_tokenizer.unk_token,
+        sep_token=slow_tokenizer.sep_token, cls_token=slow_tokenizer.cls_token,
+        pad_token=slow_tokenizer.pad_token, mask_token=slow_tokenizer.mask_token,
+        model_max_length=slow_tokenizer.model_max_length,
+    )
+
+
+def map_unknown_ids(input_ids, vocab_size, unk_id):
+    """
+    Replaces IDs of intermediate BPE symbols (>= vocab_size) with <unk>, in place.
+    Accepts a tensor or array; lists of lists are returned as new lists.
+    """
+    if hasattr(input_ids, "masked_fill_"):
+        return input_ids.masked_fill_(input_ids >= vocab_size, unk_id)
+    if hasattr(input_ids, "shape"):
+        input_ids[input_ids >= vocab_size] = unk_id
+        return input_ids
+    return [[unk_id if token_id >= vocab_size else token_id for token_id in ids] for ids in input_ids]
+
+
+def compare_tokenizers(slow_tokenizer, fast_tokenizer, texts, max_length=None):
+    """
+    Tokenizes texts with both tokenizers. Returns the list of texts whose input IDs differ.
+    """
+    kwargs = {"truncation": True, "max_length": max_length} if max_length else {}
+    slow_ids = [slow_tokenizer(text, **kwargs)["input_ids"] for text in texts]
+    fast_ids = map_unknown_ids(fast_tokenizer(list(texts), **kwargs)["input_ids"],
+                               len(slow_tokenizer), slow_tokenizer.unk_token_id)
+    return [text for text, slow, fast in zip(texts, slow_ids, fast_ids) if slow != fast]
+
+
+def load_tokenizer(model_name):
+    """
+    Returns PhoBERT's tokenizer, preferring a fast Rust tokenizer.
+    The fast tokenizer is converted from the slow one once, checked for identical output on
+    PARITY_SAMPLES and saved; later loads read the saved copy. If the conversion or the check
+    fails, the slow tokenizer is used.
+    """
+    if not PHOBERT_FAST_TOKENIZER:
+        return AutoTokenizer.from_pretrained(model_name)
+
+    saved_dir = fast_tokenizer_dir(model_name)
+    if os.path.exists(os.path.join(saved_dir, "tokenizer.json")):
+        try:
+            return PreTrainedTokenizerFast.from_pretrained(saved_dir)
+        except Exception as e:
+            logger.error(f"Failed to load the fast tokenizer from {saved_dir}: {e}")
+
+    slow_tokenizer = AutoTokenizer.from_pretrained(model_name)
+    if slow_tokenizer.is_fast:
+        return slow_tokenizer
+    try:
+        fast_tokenizer = convert_slow_tokenizer(slow_tokenizer)
+        mismatches = compare_tokenizers(slow_tokenizer, fast_tokenizer, PARITY_SAMPLES)
+    except Exception as e:
+        logger.error(f"Fast tokenizer conversion failed, using the slow tokenizer: {e}")
+        return slow_tokenizer
+    if mismatches:
+        logger.error(f"Fast tokenizer differs from the slow one on {len(mismatches)} samples "
+                     f"(e.g. '{mismatches[0]}'); using the slow tokenizer.")
+        return slow_tokenizer
+
+    try:
+        fast_tokenizer.save_pretrained(saved_dir)
+        logger.info(f"Saved fast PhoBERT tokenizer to {saved_dir}.")
+    except Exception as e:
+        logger.warning(f"Could not save the fast tokenizer: {e}")
+    return fast_tokenizer
@@ -0,0 +1,104 @@
+# app/services/projection.py
+from utils.sqlite_helpers import data_path
+import logging
+import os
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Fitted projection applied to every embedding when set (see cli/fit_projection.py)
+EMBEDDING_PROJECTION_PATH = os.getenv("EMBEDDING_PROJECTION_PATH")
+
+
+def default_projection_path(output_dim):
+    return data_path(f"projection-{output_dim}.npz")
+
+
+class PCAAccumulator:
+    """
+    Streams vectors into the sufficient statistics of PCA (count, sum and X^T X), so the
+    projection can be fitted over a whole namespace with memory independent of its size.
+    """
+
+    def __init__(self, dim):
+        self.count = 0
+        self.total = np.zeros(dim, dtype=np.float64)
+        self.gram = np.zeros((dim, dim), dtype=np.float64)
+
+    def add(self, vectors):
+        vectors = np.asarray(vectors, dtype=np.float64)
+        if not len(vectors):
+            return
+        self.count += len(vectors)
+        self.total += vectors.sum(axis=0)
+        self.gram += vectors.T @ vectors
+
+    def fit(self, output_dim):
+        """
+        Returns the EmbeddingProjection onto the top output_dim principal components.
+        """
+        if self.count < 2:
+            raise ValueError("At least two vectors are needed to fit a projection.")
+        mean = self.total / self.count
+        covariance = (self.gram - self.count * np.outer(mean, mean)) / (self.count - 1)
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        order = np.argsort(eigenvalues)[::-1][:output_dim]
+        explained = float(eigenvalues[order].sum() / max(eigenvalues.sum(), 1e-12))
+        return EmbeddingProjection(mean, eigenvectors[:, order].T, explained_variance=explained)
+
+
+class EmbeddingProjection:
+    """
+    Linear projection of embeddings onto principal components: (x - mean) @ components.T.
+    """
+
+    def __init__(self, mean, components, explained_variance=None):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)  # (output_dim, input_dim)
+        self.explained_variance = explained_variance
+
+    @property
+    def input_dim(self):
+        return self.components.shape[1]
+
+    @property
+    def output_dim(self):
+        return self.components.shape[0]
+
+    def transform(self, vectors):
+        """
+        Projects a vector or a (n, input_dim) matrix.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        return (vectors - self.mean) @ self.components.T
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez(path, mean=self.mean, components=self.components,
+                 explained_variance=np.float64(self.explained_variance or 0.0))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["mean"], data["components"], explained_variance=float(data["explained_variance"]))
+
+
+class ProjectedEmbedder:
+    """
+    Wraps an encoder (PhoBERTVectorizer or EmbeddingClient) so that every embedding is projected.
+    Same encode_text / encode_batch interface; target_dim is the projected dimension.
+    """
+
+    def __init__(self, embedder, projection):
+        self.embedder = embedder
+        self.projection = projection
+        self.target_dim = projection.output_dim
+
+    def encode_text(self, text):
+        embedding = self.embedder.encode_text(text)
+        return None if embedding is None else self.projection.transform(embedding)
+
+    def encode_batch(self, texts, batch_size=32):
+        if not texts:
+            return np.zeros((0, self.target_dim), dtype=np.float32)
+        return self.projection.transform(self.embedder.encode_batch(texts, batch_size=batch_size))
@@ -0,0 +1,242 @@
+# app/services/scrape_pipeline.py
+from queue import Queue, Empty
+from services.extraction_pool import EXTRACT_PROCESSES, get_extraction_pool
+from services.html_archive import get_html_archive
+import inspect
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Default worker counts and queue sizes for the scrape pipeline stages
+SCRAPE_QUEUE_SIZE = int(os.getenv("SCRAPE_QUEUE_SIZE", "64"))
+SCRAPE_POLL_WORKERS = int(os.getenv("SCRAPE_POLL_WORKERS", "2"))
+SCRAPE_FETCH_WORKERS = int(os.getenv("SCRAPE_FETCH_WORKERS", "8"))
+# Extract workers hand pages to the extraction process pool, so one thread per process is enough
+SCRAPE_EXTRACT_WORKERS = int(os.getenv("SCRAPE_EXTRACT_WORKERS", str(EXTRACT_PROCESSES)))
+SCRAPE_EMBED_BATCH_SIZE = int(os.getenv("SCRAPE_EMBED_BATCH_SIZE", "32"))
+SCRAPE_UPSERT_BATCH_SIZE = int(os.getenv("SCRAPE_UPSERT_BATCH_SIZE", "50"))
+
+_DONE = object()  # End-of-stream marker, one per downstream worker
+
+
+class PipelineStage:
+    def __init__(self, name, func, workers=1, queue_size=SCRAPE_QUEUE_SIZE, batch_size=None, batch_timeout=0.5):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.queue = Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        # Generator functions emit several items per input (e.g. one feed -> many entries)
+        self.fan_out = inspect.isgeneratorfunction(func)
+        self.processed = 0
+        self.emitted = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self._active_workers = workers
+        self._lock = threading.Lock()
+
+    def stats(self):
+        return {
+            "processed": self.processed,
+            "emitted": self.emitted,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 3),
+        }
+
+
+class Pipeline:
+    """
+    A chain of stages connected by bounded queues.
+    Each stage runs its own worker threads, so network-bound stages overlap with CPU-bound ones.
+    Because every queue is bounded, a slow stage blocks the stages before it instead of letting
+    items pile up in memory.
+
+    A stage function receives one item (or a list of up to batch_size items for batch stages) and
+    returns a result, a list of results (batch stages), or None to drop the item. Generator
+    functions may yield any number of results.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.stages = []
+
+    def add_stage(self, name, func, workers=1, queue_size=SCRAPE_QUEUE_SIZE, batch_size=None, batch_timeout=0.5):
+        self.stages.append(PipelineStage(name, func, workers, queue_size, batch_size, batch_timeout))
+        return self
+
+    def run(self, items):
+        """
+        Feeds items into the first stage and blocks until every stage has drained.
+        Returns per-stage statistics.
+        """
+        start = time.perf_counter()
+        threads = []
+        for index, stage in enumerate(self.stages):
+            next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            for worker in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._run_worker, args=(stage, next_stage),
+                    name=f"{self.name}-{stage.name}-{worker}", daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        first_stage = self.stages[0]
+        for item in items:
+            first_stage.queue.put(item)
+        for _ in range(first_stage.workers):
+            first_stage.queue.put(_DONE)
+
+        for thread in threads:
+            thread.join()
+
+        stats = {stage.name: stage.stats() for stage in self.stages}
+        logger.info(f"Pipeline '{self.name}' finished in {time.perf_counter() - start:.1f}s: {stats}")
+        return stats
+
+    def _run_worker(self, stage, next_stage):
+        while True:
+            if stage.batch_size:
+                payload, done = self._next_batch(stage)
+            else:
+                payload = stage.queue.get()
+                done = payload is _DONE
+                if done:
+                    payload = None
+
+            if payload:
+                self._process(stage, next_stage, payload)
+            if done:
+                break
+
+        with stage._lock:
+            stage._active_workers -= 1
+            last_worker = stage._active_workers == 0
+        if last_worker and next_stage is not None:
+            for _ in range(next_stage.workers):
+                next_stage.queue.put(_DONE)
+
+    @staticmethod
+    def _next_batch(stage):
+        """
+        Collects up to batch_size items, waiting at most batch_timeout after the first one.
+        Returns (batch, done).
+        """
+        first = stage.queue.get()
+        if first is _DONE:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + stage.batch_timeout
+        while len(batch) < stage.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = stage.queue.get(timeout=remaining)
+            except Empty:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    @staticmethod
+    def _process(stage, next_stage, payload):
+        started = time.perf_counter()
+        count = len(payload) if stage.batch_size else 1
+        try:
+            result = stage.func(payload)
+            if stage.fan_out or stage.batch_size:
+                outputs = result or []
+            else:
+                outputs = [] if result is None else [result]
+            emitted = 0
+            for output in outputs:
+                if output is None:
+                    continue
+                emitted += 1
+                if next_stage is not None:
+                    next_stage.queue.put(output)
+            with stage._lock:
+                stage.processed += count
+                stage.emitted += emitted
+        except Exception as e:
+            logger.error(f"Stage '{stage.name}' failed: {e}")
+            with stage._lock:
+                stage.errors += count
+        finally:
+            with stage._lock:
+                stage.busy_seconds += time.perf_counter() - started
+
+
+def archived_fetch(fetch, archive, source):
+    """
+    Wraps a fetch function so every downloaded page is also written to the raw HTML archive.
+    """
+    def fetch_and_archive(entry):
+        fetched = fetch(entry)
+        if fetched is not None:
+            try:
+                archive.put(fetched["link"], source, fetched["html"], fetched)
+            except Exception as e:
+                logger.error(f"Failed to archive {fetched['link']}: {e}")
+        return fetched
+    return fetch_and_archive
+
+
+def archived_upsert(upsert, archive):
+    """
+    Wraps an upsert function so the archive remembers which content was stored for each page.
+    """
+    def upsert_and_record(records):
+        upsert(records)
+        for record in records:
+            try:
+                archive.record_content(record["metadata"]["source_url"], record["metadata"]["content"])
+            except Exception as e:
+                logger.error(f"Failed to record archived content for {record['metadata']['source_url']}: {e}")
+    return upsert_and_record
+
+
+def categorized_extract(extract):
+    """
+    Wraps an extract function so every article carries the name of its feed as its category.
+    """
+    def extract_with_category(entry):
+        article = extract(entry)
+        if article is not None and entry.get("feed_name"):
+            article.setdefault("category", entry["feed_name"])
+        return article
+    return extract_with_category
+
+
+def run_scrape_pipeline(name, feeds, poll_feed, extract, article_processor, fetch):
+    """
+    Runs the standard scrape flow for one source as a streaming pipeline:
+    feed poll -> page fetch -> extract -> embed batch -> upsert.
+
+    :param feeds: Iterable of (feed_name, feed_url) pairs.
+    :param poll_feed: Generator function yielding entry dicts (at least a "link") for one feed.
+    :param extract: Function turning a fetched entry (with "html") into an article dict, or None.
+    :param fetch: Function downloading an entry's page and returning it with "html" set, or None.
+    """
+    get_extraction_pool()  # Fork the extraction processes before the stage threads start
+    archive = get_html_archive()
+    upsert = article_processor.upsert_records
+    if archive is not None:
+        fetch = archived_fetch(fetch, archive, name)
+        upsert = archived_upsert(upsert, archive)
+
+    pipeline = Pipeline(name)
+    pipeline.add_stage("poll", poll_feed, workers=SCRAPE_POLL_WORKERS)
+    pipeline.add_stage("fetch", fetch, workers=SCRAPE_FETCH_WORKERS)
+    pipeline.add_stage("extract", categorized_extract(extract), workers=SCRAPE_EXTRACT_WORKERS)
+    pipeline.add_stage("embed", article_processor.build_title_records, batch_size=SCRAPE_EMBED_BATCH_SIZE)
+    pipeline.add_stage("upsert", upsert, batch_size=SCRAPE_UPSERT_BATCH_SIZE)
+    stats = pipeline.run(feeds)
+    logger.info(f"{name}: {stats['upsert']['processed']} articles stored.")
+    return stats
@@ -0,0 +1,291 @@
+# app/services/snapshot.py
+"""
+Compact snapshots of a vector namespace: IDs, vectors and metadata in a directory of
+compressed .npz chunks plus a manifest.json.
+
+Vectors are stored as float32 (exact), float16 or int8 with one scale per vector. Metadata is
+stored by column: each field is one array per chunk. String fields are UTF-8 bytes plus offsets,
+numbers and booleans are typed arrays, and a validity mask marks missing values. This compresses
+far better than per-record JSON. Export fetches pages in parallel; restore decodes chunks in
+parallel and bulk-loads them into Pinecone or a LocalVectorIndex.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from services.local_index import LocalVectorIndex
+import json
+import logging
+import os
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_CHUNK_SIZE = int(os.getenv("SNAPSHOT_CHUNK_SIZE", "10000"))
+SNAPSHOT_DTYPES = ("float32", "float16", "int8")
+MANIFEST_NAME = "manifest.json"
+
+
+def column_kind(values):
+    """
+    Picks the storage kind of a metadata column from its non-missing values.
+    """
+    present = [value for value in values if value is not None]
+    if present and all(isinstance(value, bool) for value in present):
+        return "bool"
+    if present and all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+        return "int"
+    if present and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+        return "float"
+    if all(isinstance(value, str) for value in present):
+        return "str"
+    return "json"  # Lists of strings and anything else Pinecone accepts
+
+
+def encode_strings(values):
+    """
+    Encodes strings as one UTF-8 byte array and an offsets array (n + 1 entries).
+    """
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(value) for value in encoded])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def decode_strings(data, offsets):
+    raw = data.tobytes()
+    return [raw[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+
+def encode_metadata(metadata_list):
+    """
+    Turns a list of metadata dicts into ({array name: array}, column specs).
+    """
+    names = sorted({name for metadata in metadata_list for name in metadata})
+    arrays = {}
+    columns = []
+    for position, name in enumerate(names):
+        values = [metadata.get(name) for metadata in metadata_list]
+        kind = column_kind(values)
+        prefix = f"col{position}"
+        arrays[f"{prefix}_valid"] = np.array([value is not None for value in values], dtype=bool)
+        if kind == "bool":
+            arrays[f"{prefix}_data"] = np.array([bool(value) for value in values], dtype=bool)
+        elif kind == "int":
+            arrays[f"{prefix}_data"] = np.array([value or 0 for value in values], dtype=np.int64)
+        elif kind == "float":
+            arrays[f"{prefix}_data"] = np.array([value or 0.0 for value in values], dtype=np.float64)
+        else:
+            texts = [
+                "" if value is None else (value if kind == "str" else json.dumps(value, ensure_ascii=False))
+                for value in values
+            ]
+            arrays[f"{prefix}_data"], arrays[f"{prefix}_offsets"] = encode_strings(texts)
+        columns.append({"name": name, "kind": kind, "prefix": prefix})
+    return arrays, columns
+
+
+def decode_metadata(chunk, columns, count):
+    metadata_list = [{} for _ in range(count)]
+    for column in columns:
+        prefix, kind = column["prefix"], column["kind"]
+        valid = chunk[f"{prefix}_valid"]
+        if kind in ("str", "json"):
+            values = decode_strings(chunk[f"{prefix}_data"], chunk[f"{prefix}_offsets"])
+            if kind == "json":
+                values = [json.loads(value) if value else None for value in values]
+        else:
+            values = chunk[f"{prefix}_data"].tolist()
+        for metadata, is_valid, value in zip(metadata_list, valid, values):
+            if is_valid:
+                metadata[column["name"]] = value
+    return metadata_list
+
+
+class SnapshotWriter:
+    """
+    Writes records ({"id", "values", "metadata"}) to a snapshot directory, one compressed chunk
+    every chunk_size records, so memory is bounded by one chunk.
+    """
+
+    def __init__(self, path, dtype="float32", chunk_size=SNAPSHOT_CHUNK_SIZE, source=None):
+        if dtype not in SNAPSHOT_DTYPES:
+            raise ValueError(f"dtype must be one of {SNAPSHOT_DTYPES}, got '{dtype}'.")
+        self.path = path
+        self.dtype = dtype
+        self.chunk_size = chunk_size
+        self.source = source or {}
+        self.dim = None
+        self.count = 0
+        self.chunks = []
+        self._pending = []
+        os.makedirs(path, exist_ok=True)
+
+    def add(self, records):
+        for record in records:
+            self._pending.append(record)
+            if len(self._pending) >= self.chunk_size:
+                self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        records, self._pending = self._pending, []
+        vectors = np.asarray([record["values"] for record in records], dtype=np.float32)
+        self.dim = self.dim or vectors.shape[1]
+        arrays, columns = encode_metadata([record.get("metadata") or {} for record in records])
+        ids, id_offsets = encode_strings([record["id"] for record in records])
+        if self.dtype == "int8":
+            codes, scales = LocalVectorIndex(self.dim, dtype="int8").encode(vectors)
+            arrays.update(vectors=codes, scales=scales)
+        else:
+            arrays["vectors"] = vectors.astype(self.dtype)
+
+        name = f"chunk-{len(self.chunks):05d}.npz"
+        tmp_path = os.path.join(self.path, name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, ids=ids, id_offsets=id_offsets, **arrays)
+        os.replace(tmp_path, os.path.join(self.path, name))
+        self.chunks.append({"file": name, "count": len(records), "columns": columns,
+                            "bytes": os.path.getsize(os.path.join(self.path, name))})
+        self.count += len(records)
+
+    def close(self):
+        """
+        Writes the last chunk and the manifest. Returns the manifest.
+        """
+        self._flush()
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "created_at": datetime.now().isoformat(),
+            "dim": self.dim,
+            "dtype": self.dtype,
+            "count": self.count,
+            "bytes": sum(chunk["bytes"] for chunk in self.chunks),
+            "source": self.source,
+            "chunks": self.chunks,
+        }
+        tmp_path = os.path.join(self.path, MANIFEST_NAME + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, os.path.join(self.path, MANIFEST_NAME))
+        return manifest
+
+
+class SnapshotReader:
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_NAME), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest["format_version"] != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format {self.manifest['format_version']}.")
+
+    def read_chunk(self, position):
+        """
+        Returns the records of one chunk as (ids, float32 vectors, metadata list).
+        """
+        chunk_info = self.manifest["chunks"][position]
+        with np.load(os.path.join(self.path, chunk_info["file"])) as chunk:
+            ids = decode_strings(chunk["ids"], chunk["id_offsets"])
+            vectors = chunk["vectors"].astype(np.float32)
+            if self.manifest["dtype"] == "int8":
+                vectors *= chunk["scales"][:, None]
+            metadata = decode_metadata(chunk, chunk_info["columns"], chunk_info["count"])
+        return ids, vectors, metadata
+
+    def iter_chunks(self, workers=1):
+        """
+        Yields (ids, vectors, metadata) per chunk, in order; chunks are decoded by `workers` threads.
+        """
+        positions = range(len(self.manifest["chunks"]))
+        if workers <= 1:
+            for position in positions:
+                yield self.read_chunk(position)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from bounded_map(pool, self.read_chunk, positions, workers * 2)
+
+
+def bounded_map(pool, func, items, max_in_flight):
+    """
+    Like pool.map, but keeps at most max_in_flight tasks submitted, so a long input is not
+    materialized. Results come back in input order.
+    """
+    in_flight = deque()
+    for item in items:
+        in_flight.append(pool.submit(func, item))
+        if len(in_flight) >= max_in_flight:
+            yield in_flight.popleft().result()
+    while in_flight:
+        yield in_flight.popleft().result()
+
+
+def export_namespace(vector_db, namespace, path, dtype="float32", chunk_size=SNAPSHOT_CHUNK_SIZE,
+                     fetch_workers=8, page_size=100, index_name=None):
+    """
+    Streams every vector of a namespace (all its partitions) into a snapshot. ID pages are
+    listed one after another and fetched by fetch_workers threads. Returns the manifest.
+    """
+    writer = SnapshotWriter(path, dtype=dtype, chunk_size=chunk_size,
+                            source={"namespace": namespace, "index_name": index_name or vector_db.index_name})
+
+    def id_pages():
+        for index, physical in vector_db.targets(namespace, index_name=index_name):
+            for id_batch in index.list(namespace=physical, limit=page_size):
+                if id_batch:
+                    yield index, physical, list(id_batch)
+
+    def fetch(page):
+        index, physical, ids = page
+        results = index.fetch(ids=ids, namespace=physical)
+        vectors = results.vectors if hasattr(results, 'vectors') else {}
+        return [
+            {"id": vector_id, "values": vectors[vector_id]["values"], "metadata": vectors[vector_id]["metadata"] or {}}
+            for vector_id in ids if vector_id in vectors
+        ]
+
+    with ThreadPoolExecutor(max_workers=fetch_workers) as pool:
+        for records in bounded_map(pool, fetch, id_pages(), fetch_workers * 2):
+            writer.add(records)
+    return writer.close()
+
+
+def restore_to_pinecone(vector_db, path, namespace, workers=4, batch_size=100):
+    """
+    Upserts a snapshot into a namespace with `workers` parallel upserts. Returns the count restored.
+    """
+    reader = SnapshotReader(path)
+
+    def records(chunk):
+        ids, vectors, metadata = chunk
+        for start in range(0, len(ids), batch_size):
+            yield [
+                {"id": vector_id, "values": vector.tolist(), "metadata": fields}
+                for vector_id, vector, fields in zip(ids[start:start + batch_size], vectors[start:start + batch_size],
+                                                     metadata[start:start + batch_size])
+            ]
+
+    def upsert(batch):
+        vector_db.upsert_vectors(batch, namespace=namespace)
+        return len(batch)
+
+    restored = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        batches = (batch for chunk in reader.iter_chunks(workers=2) for batch in records(chunk))
+        for count in bounded_map(pool, upsert, batches, workers * 2):
+            restored += count
+    return restored
+
+
+def restore_to_local_index(path, dtype="float32", workers=4):
+    """
+    Loads a snapshot into a LocalVectorIndex with the given storage type.
+    Returns (index, metadata by ID).
+    """
+    reader = SnapshotReader(path)
+    index = LocalVectorIndex(reader.manifest["dim"], dtype=dtype)
+    metadata_by_id = {}
+    for ids, vectors, metadata in reader.iter_chunks(workers=workers):
+        index.add(ids, vectors)
+        metadata_by_id.update(zip(ids, metadata))
+    return index, metadata_by_id
@@ -0,0 +1,57 @@
+# app/services/summary_service.py
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from api.gemini_integration import get_or_create_summary, is_failed_summary, summary_cache, summary_cache_key
+from services.extractive_summarizer import get_extractive_summarizer
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_MODES = ("auto", "abstractive", "extractive")
+
+# Latency SLO for Gemini in "auto" mode, after which the extractive summary is returned instead
+SUMMARY_SLO_SECONDS = float(os.getenv("SUMMARY_SLO_SECONDS", "8"))
+
+# Gemini calls run here so a slow call can be abandoned without blocking the request.
+# A call that misses the SLO keeps running and still fills the summary cache for the next request.
+_gemini_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SUMMARY_MAX_CONCURRENCY", "8")), thread_name_prefix="gemini"
+)
+
+
+def extractive_summary(article_content):
+    start = time.perf_counter()
+    summary = get_extractive_summarizer().summarize(article_content)
+    logger.info(f"Extractive summary generated in {(time.perf_counter() - start) * 1000:.1f} ms.")
+    return summary
+
+
+def summarize_with_fallback(article_id, article_content, mode="auto", slo_seconds=None):
+    """
+    Summarizes an article and returns (summary, engine).
+    - "extractive": local TextRank summary only.
+    - "abstractive": Gemini only; errors are returned as-is.
+    - "auto": Gemini if it answers within the SLO, otherwise the extractive summary.
+    """
+    if mode == "extractive":
+        return extractive_summary(article_content), "extractive"
+
+    if mode == "abstractive":
+        return get_or_create_summary(article_id, article_content), "gemini"
+
+    cached = summary_cache.get(summary_cache_key(article_id, article_content))
+    if cached is not None:
+        return cached, "gemini"
+
+    timeout = SUMMARY_SLO_SECONDS if slo_seconds is None else slo_seconds
+    future = _gemini_executor.submit(get_or_create_summary, article_id, article_content)
+    try:
+        summary = future.result(timeout=timeout)
+        if not is_failed_summary(summary):
+            return summary, "gemini"
+        logger.warning(f"Gemini failed for article {article_id}, using extractive fallback: {summary}")
+    except FutureTimeoutError:
+        logger.warning(f"Gemini exceeded the {timeout}s SLO for article {article_id}, using extractive fallback.")
+
+    return extractive_summary(article_content), "extractive"
@@ -0,0 +1,235 @@
+# app/services/trending.py
+from contextlib import closing
+from utils.common import parse_iso_datetime
+from utils.sketches import CountMinSketch, SpaceSaving
+from utils.sqlite_helpers import connect, data_path
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+
+logger = logging.getLogger(__name__)
+
+TRENDING_ENABLED = os.getenv("TRENDING_ENABLED", "true").lower() in ("1", "true", "yes")
+TRENDING_BUCKET_MINUTES = int(os.getenv("TRENDING_BUCKET_MINUTES", "60"))
+# Longest window /api/trending accepts, and the longest baseline before it; older buckets are dropped
+TRENDING_MAX_WINDOW_HOURS = int(os.getenv("TRENDING_MAX_WINDOW_HOURS", "24"))
+TRENDING_BASELINE_HOURS = int(os.getenv("TRENDING_BASELINE_HOURS", "168"))
+TRENDING_SKETCH_WIDTH = int(os.getenv("TRENDING_SKETCH_WIDTH", "2048"))
+TRENDING_SKETCH_DEPTH = int(os.getenv("TRENDING_SKETCH_DEPTH", "4"))
+# Heavy-hitter counters kept per bucket; the candidates /api/trending scores
+TRENDING_HEAVY_HITTERS = int(os.getenv("TRENDING_HEAVY_HITTERS", "500"))
+# Characters of content read after the title (the lead paragraph)
+TRENDING_CONTENT_CHARS = int(os.getenv("TRENDING_CONTENT_CHARS", "400"))
+TRENDING_MIN_COUNT = int(os.getenv("TRENDING_MIN_COUNT", "3"))
+TRENDING_KINDS = ("terms", "entities")
+PRUNE_INTERVAL_SECONDS = 600
+
+# Function words that make a syllable pair a phrase fragment rather than a topic
+STOPWORDS = set("""
+    và của là có được cho với các những một trong khi đã sẽ này đó kia không để từ tại về theo sau
+    trước trên dưới ra vào đến như thì cũng mà nhưng vì do nếu hay hoặc tới qua rất đang vẫn còn chỉ
+    mới lại bị hơn nhiều nhất bằng cùng gì nào đây ấy thế sự việc cái con chiếc nhà người ông bà anh
+    chị em họ ta tôi mình chúng năm tháng ngày giờ phút lần ở nên hết làm
+""".split())
+SEGMENT_SPLIT_RE = re.compile(r"[.,;:!?()\[\]{}\"“”'‘’«»/|\n\r\t–—-]+")
+WORD_RE = re.compile(r"[^\W\d_]+")
+MAX_ENTITY_WORDS = 4
+
+
+def extract_topics(title, content=""):
+    """
+    Returns (terms, entities) of an article, each a set counted once per article.
+    Terms are lowercase syllable pairs (most Vietnamese words are two syllables) without
+    function words. Entities are runs of 2-4 capitalized syllables (names such as
+    "Hà Nội") and all-capital acronyms such as "SJC".
+    """
+    text = unicodedata.normalize("NFC", f"{title}\n{(content or '')[:TRENDING_CONTENT_CHARS]}")
+    terms, entities = set(), set()
+    for segment in SEGMENT_SPLIT_RE.split(text):
+        words = WORD_RE.findall(segment)
+        lowered = [word.lower() for word in words]
+        for first, second in zip(lowered, lowered[1:]):
+            if first not in STOPWORDS and second not in STOPWORDS and len(first) > 1 and len(second) > 1:
+                terms.add(f"{first} {second}")
+        run = []
+        for word in words + [""]:
+            if word and word[0].isupper():
+                run.append(word)
+                continue
+            if 2 <= len(run) <= MAX_ENTITY_WORDS:
+                entities.add(" ".join(run))
+            elif len(run) == 1 and len(run[0]) > 1 and run[0].isupper():
+                entities.add(run[0])
+            run = []
+    return terms, entities
+
+
+class TrendingTracker:
+    """
+    Streaming term and entity counts over time buckets, in a SQLite file shared by every
+    ingesting process. Each bucket of each kind holds a Count-Min Sketch of how many
+    articles mention each topic, plus Space-Saving heavy hitters that name the candidates.
+    Sketches have a fixed size and buckets older than the longest window plus the baseline
+    are dropped, so storage and query cost do not grow with the corpus.
+    Articles are bucketed by publication date (ingestion time when it is missing or ahead).
+    """
+
+    def __init__(self, path=None, bucket_minutes=TRENDING_BUCKET_MINUTES, width=TRENDING_SKETCH_WIDTH,
+                 depth=TRENDING_SKETCH_DEPTH, heavy_hitters=TRENDING_HEAVY_HITTERS):
+        self.path = path or os.getenv("TRENDING_PATH") or data_path("trending.db")
+        self.bucket_seconds = bucket_minutes * 60
+        self.width = width
+        self.depth = depth
+        self.heavy_hitters = heavy_hitters
+        self.horizon_seconds = (TRENDING_MAX_WINDOW_HOURS + TRENDING_BASELINE_HOURS) * 3600
+        self._next_prune = 0.0
+        self._local = threading.local()
+        with closing(connect(self.path)) as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS trending_buckets (
+                    kind TEXT NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    articles INTEGER NOT NULL,
+                    sketch BLOB NOT NULL,
+                    heavy TEXT NOT NULL,
+                    PRIMARY KEY (kind, bucket)
+                );
+            """)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def bucket_of(self, timestamp):
+        return int(timestamp // self.bucket_seconds) * self.bucket_seconds
+
+    def _sketch(self, data=None):
+        if data is None:
+            return CountMinSketch(self.width, self.depth)
+        return CountMinSketch.from_bytes(data, self.width, self.depth)
+
+    def record(self, records, now=None):
+        """
+        Counts the terms and entities of title records (as built by ArticleProcessor).
+        Each article should be passed once; ingestion passes only newly stored articles.
+        Returns the number of articles counted.
+        """
+        now = time.time() if now is None else now
+        buckets = {}  # bucket -> ([term sets], [entity sets])
+        for record in records:
+            metadata = record["metadata"]
+            parsed = parse_iso_datetime(metadata.get("date"))
+            timestamp = min(parsed.timestamp(), now) if parsed else now
+            if timestamp < now - self.horizon_seconds:
+                continue  # Older than any window or baseline
+            terms, entities = extract_topics(metadata.get("title", ""), metadata.get("content", ""))
+            topics = buckets.setdefault(self.bucket_of(timestamp), ([], []))
+            topics[0].append(terms)
+            topics[1].append(entities)
+        if not buckets:
+            return 0
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for bucket, per_kind in buckets.items():
+                for kind, topic_sets in zip(TRENDING_KINDS, per_kind):
+                    row = conn.execute(
+                        "SELECT articles, sketch, heavy FROM trending_buckets WHERE kind = ? AND bucket = ?",
+                        (kind, bucket),
+                    ).fetchone()
+                    sketch = self._sketch(row["sketch"] if row else None)
+                    heavy = SpaceSaving(self.heavy_hitters, json.loads(row["heavy"]) if row else None)
+                    items = [topic for topics in topic_sets for topic in topics]
+                    sketch.add(items)
+                    for item in items:
+                        heavy.add(item)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO trending_buckets (kind, bucket, articles, sketch, heavy) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (kind, bucket, (row["articles"] if row else 0) + len(topic_sets), sketch.to_bytes(),
+                         json.dumps(heavy.counters, ensure_ascii=False)),
+                    )
+            if now >= self._next_prune:
+                self._next_prune = now + PRUNE_INTERVAL_SECONDS
+                conn.execute("DELETE FROM trending_buckets WHERE bucket < ?",
+                             (self.bucket_of(now - self.horizon_seconds),))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return sum(len(per_kind[0]) for per_kind in buckets.values())
+
+    def trending(self, kind="terms", window_hours=6, baseline_hours=TRENDING_BASELINE_HOURS, limit=20,
+                 min_count=TRENDING_MIN_COUNT, now=None):
+        """
+        Returns the topics surging in the last window_hours compared with the baseline_hours
+        before it. A topic's expected count is its baseline share of articles times the
+        number of articles in the window; the burst score is how far the window count exceeds
+        that, in Poisson standard deviations. Returns a dict with the article counts of both
+        windows and the topics, highest score first.
+        """
+        if kind not in TRENDING_KINDS:
+            raise ValueError(f"Unknown kind '{kind}'; expected one of {', '.join(TRENDING_KINDS)}.")
+        now = time.time() if now is None else now
+        window_start = self.bucket_of(now - window_hours * 3600 + self.bucket_seconds)
+        baseline_start = window_start - baseline_hours * 3600
+        rows = self._conn().execute(
+            "SELECT bucket, articles, sketch, heavy FROM trending_buckets WHERE kind = ? AND bucket >= ?",
+            (kind, baseline_start),
+        ).fetchall()
+
+        window, baseline = self._sketch(), self._sketch()
+        window_articles = baseline_articles = 0
+        candidates = set()
+        for row in rows:
+            if row["bucket"] >= window_start:
+                window.merge(self._sketch(row["sketch"]))
+                window_articles += row["articles"]
+                candidates.update(json.loads(row["heavy"]))
+            else:
+                baseline.merge(self._sketch(row["sketch"]))
+                baseline_articles += row["articles"]
+
+        candidates = sorted(candidates)
+        topics = []
+        for topic, count, base in zip(candidates, window.estimate(candidates), baseline.estimate(candidates)):
+            if count < min_count:
+                continue
+            # Add-one smoothing: a topic absent from the baseline is expected about once per baseline
+            expected = (base + 1) / (baseline_articles + 1) * window_articles
+            score = (count - expected) / math.sqrt(expected + 1)
+            if score > 0:
+                topics.append({
+                    "topic": topic, "count": int(count), "baseline_count": int(base),
+                    "expected": round(expected, 2), "score": round(score, 3),
+                })
+        topics.sort(key=lambda topic: (-topic["score"], topic["topic"]))
+        return {
+            "kind": kind,
+            "window_hours": window_hours,
+            "baseline_hours": baseline_hours,
+            "window_articles": window_articles,
+            "baseline_articles": baseline_articles,
+            "topics": topics[:limit],
+        }
+
+
+# Module-level singleton instance
+_tracker_instance = None
+_tracker_lock = threading.Lock()
+
+
+def get_trending_tracker():
+    global _tracker_instance
+    with _tracker_lock:
+        if _tracker_instance is None:
+            _tracker_instance = TrendingTracker()
+    return _tracker_instance
@@ -1,14 +1,22 @@
 # app/services/vector_db_service.py
 from pinecone import Pinecone, ServerlessSpec
 from pinecone.exceptions import PineconeException, PineconeApiException
-from services.vectorizer_service import get_vectorizer
+from services.embedding_client import get_embedder
+from services.namespace_registry import get_namespace_registry
+from services.partitions import is_partitioned, month_in_range, month_of, partition_namespace
+from concurrent.futures import ThreadPoolExecutor
+import heapq
 import os
 import logging
 import re
+import threading
 import time
 
 logger = logging.getLogger(__name__)
 
+# Threads used to query the monthly partitions of a namespace in parallel
+PARTITION_QUERY_WORKERS = int(os.getenv("PARTITION_QUERY_WORKERS", "8"))
+
 class VectorDBService:
     _instance = None
     _initialized = False
@@ -25,46 +33,114 @@ class VectorDBService:
         # Only initialize once due to singleton pattern
         if VectorDBService._initialized:
             return
-            
-        # Initialize Pinecone
-        api_key = os.getenv("PINECONE_API_KEY")
-        index_name = os.getenv("PINECONE_INDEX_NAME", "aggsum")
-        dimension = int(os.getenv("PINECONE_DIMENSION", "768"))  # PhoBERT dimension
-        pinecone_region = os.getenv("PINECONE_REGION", "us-east-1")  # Default AWS region
-
-        if not api_key:
-            raise ValueError("PINECONE_API_KEY must be set in the environment variables.")
-
-        logger.info(f"Initializing Pinecone connection to index: {index_name}")
-        self.pinecone = Pinecone(api_key=api_key)
-        self.index_name = index_name
-        self.pinecone_region = pinecone_region
-        
-        # Check if index exists, create if it doesn't
-        self._ensure_index_exists(dimension)
-        
-        # Connect to the index
-        self.index = self.pinecone.Index(index_name)
 
-        # Initialize PhoBERT for encoding (singleton, so only loads once)
-        self.vectorizer = get_vectorizer()
+        # Pinecone settings. The connection, the index check and the model are all set up on
+        # first use, so importing and constructing this service is instant.
+        self.api_key = os.getenv("PINECONE_API_KEY")
+        self.index_name = os.getenv("PINECONE_INDEX_NAME", "aggsum")
+        self.dimension = int(os.getenv("PINECONE_DIMENSION", "768"))  # PhoBERT dimension
+        self.pinecone_region = os.getenv("PINECONE_REGION", "us-east-1")  # Default AWS region
+        self._pinecone = None
+        self._index = None
+        self._other_indexes = {}  # Handles of indexes other than index_name (re-index targets)
+        self._vectorizer = None
+        self._fan_out_pool = None
+        self._init_lock = threading.Lock()
         VectorDBService._initialized = True
-    
-    def _ensure_index_exists(self, dimension=768):
+
+    @property
+    def pinecone(self):
+        if self._pinecone is None:
+            if not self.api_key:
+                raise ValueError("PINECONE_API_KEY must be set in the environment variables.")
+            self._pinecone = Pinecone(api_key=self.api_key)
+        return self._pinecone
+
+    @property
+    def index(self):
+        """
+        The Pinecone index. Checked (and created if missing) on first use.
+        """
+        if self._index is None:
+            with self._init_lock:
+                if self._index is None:
+                    logger.info(f"Initializing Pinecone connection to index: {self.index_name}")
+                    # Check if index exists, create if it doesn't
+                    self._ensure_index_exists(self.dimension)
+                    self._index = self.pinecone.Index(self.index_name)
+        return self._index
+
+    def index_for(self, index_name=None):
+        """
+        Returns the handle of an index; None means the configured index (PINECONE_INDEX_NAME).
+        """
+        if not index_name or index_name == self.index_name:
+            return self.index
+        with self._init_lock:
+            if index_name not in self._other_indexes:
+                self._other_indexes[index_name] = self.pinecone.Index(index_name)
+            return self._other_indexes[index_name]
+
+    def resolve(self, namespace, index_name=None, dimension=None):
+        """
+        Returns (index name, physical namespace) for a namespace.
+        Logical names such as "title" are looked up in the namespace registry, so a re-index
+        switch moves reads and writes to the new namespace; given an index_name, the namespace
+        is taken as a physical namespace in that index.
+        """
+        if index_name is None:
+            index_name, namespace = get_namespace_registry().resolve(namespace, dimension=dimension)
+        return index_name or self.index_name, namespace
+
+    def target(self, namespace, index_name=None, dimension=None):
+        """
+        Returns (index handle, physical namespace) for a namespace; see resolve.
+        """
+        index_name, physical = self.resolve(namespace, index_name=index_name, dimension=dimension)
+        return self.index_for(index_name), physical
+
+    def targets(self, namespace, index_name=None, date_from=None, date_to=None, dimension=None):
+        """
+        Returns every (index handle, physical namespace) holding a namespace's vectors: the
+        physical namespace itself and, if it is time-partitioned, its active monthly partitions
+        that overlap [date_from, date_to].
+        """
+        index_name, physical = self.resolve(namespace, index_name=index_name, dimension=dimension)
+        index = self.index_for(index_name)
+        found = [(index, physical)]
+        if is_partitioned(physical):
+            found += [
+                (index, partition["namespace"])
+                for partition in get_namespace_registry().partitions(index_name, physical)
+                if month_in_range(partition["month"], date_from, date_to)
+            ]
+        return found
+
+    @property
+    def vectorizer(self):
+        """
+        PhoBERT encoder: the shared embedding service if configured, else a local model (loaded once).
+        """
+        if self._vectorizer is None:
+            self._vectorizer = get_embedder()
+        return self._vectorizer
+
+    def _ensure_index_exists(self, dimension=768, index_name=None):
         """
         Checks if the Pinecone index exists, and creates it if it doesn't.
         """
+        index_name = index_name or self.index_name
         try:
             # List all indexes
             existing_indexes = [idx.name for idx in self.pinecone.list_indexes()]
             
-            if self.index_name not in existing_indexes:
-                logger.info(f"Index '{self.index_name}' not found. Creating new index with dimension {dimension}...")
+            if index_name not in existing_indexes:
+                logger.info(f"Index '{index_name}' not found. Creating new index with dimension {dimension}...")
                 
                 # Create the index (serverless)
                 try:
                     self.pinecone.create_index(
-                        name=self.index_name,
+                        name=index_name,
                         dimension=dimension,
                         metric="cosine",
                         spec=ServerlessSpec(
@@ -72,13 +148,13 @@ class VectorDBService:
                             region=self.pinecone_region
                         )
                     )
-                    logger.info(f"Index '{self.index_name}' creation initiated (serverless). Waiting for it to be ready...")
-                    self._wait_for_index_ready()
+                    logger.info(f"Index '{index_name}' creation initiated (serverless). Waiting for it to be ready...")
+                    self._wait_for_index_ready(index_name=index_name)
                 except PineconeApiException as e:
                     # Check if index already exists (race condition or concurrent creation)
                     if hasattr(e, 'status_code') and e.status_code == 409:
-                        logger.info(f"Index '{self.index_name}' already exists (created concurrently or exists).")
-                        self._wait_for_index_ready()
+                        logger.info(f"Index '{index_name}' already exists (created concurrently or exists).")
+                        self._wait_for_index_ready(index_name=index_name)
                     else:
                         logger.error(f"Failed to create index: {e}")
                         logger.error("Please create the index manually in Pinecone console or check your API key permissions.")
@@ -87,30 +163,31 @@ class VectorDBService:
                     # Handle other exceptions
                     error_str = str(e).lower()
                     if "already exists" in error_str or "409" in error_str:
-                        logger.info(f"Index '{self.index_name}' already exists.")
-                        self._wait_for_index_ready()
+                        logger.info(f"Index '{index_name}' already exists.")
+                        self._wait_for_index_ready(index_name=index_name)
                     else:
                         logger.error(f"Failed to create index: {e}")
                         logger.warning("Attempting to proceed with existing index connection...")
             else:
-                logger.info(f"Index '{self.index_name}' already exists.")
+                logger.info(f"Index '{index_name}' already exists.")
                 # Verify index is ready
-                self._wait_for_index_ready()
+                self._wait_for_index_ready(index_name=index_name)
         except Exception as e:
             logger.error(f"Error checking/creating index: {e}")
             # If we can't create, try to connect anyway (might already exist)
             logger.warning("Attempting to connect to existing index...")
     
-    def _wait_for_index_ready(self, max_wait_time=300):
+    def _wait_for_index_ready(self, max_wait_time=300, index_name=None):
         """
         Waits for the index to be ready, polling every 5 seconds.
         """
+        index_name = index_name or self.index_name
         start_time = time.time()
         while time.time() - start_time < max_wait_time:
             try:
-                index_description = self.pinecone.describe_index(self.index_name)
+                index_description = self.pinecone.describe_index(index_name)
                 if hasattr(index_description, 'status') and index_description.status.get('ready', False):
-                    logger.info(f"Index '{self.index_name}' is ready!")
+                    logger.info(f"Index '{index_name}' is ready!")
                     return
                 elif hasattr(index_description, 'status'):
                     logger.info(f"Index status: {index_description.status}")
@@ -119,7 +196,13 @@ class VectorDBService:
             
             time.sleep(5)
         
-        logger.warning(f"Index '{self.index_name}' may not be ready yet, but proceeding anyway...")
+        logger.warning(f"Index '{index_name}' may not be ready yet, but proceeding anyway...")
+
+    def create_index(self, index_name, dimension):
+        """
+        Creates another index (e.g. for a re-index with a new dimension) unless it exists.
+        """
+        self._ensure_index_exists(dimension, index_name=index_name)
 
     @staticmethod
     def clean_text(text):
@@ -146,22 +229,78 @@ class VectorDBService:
             logger.error(f"Error cleaning text: {e}")
             return text
 
-    def upsert_vectors(self, vectors, namespace="default"):
+    def _fan_out(self, func, targets):
+        """
+        Calls func(index, namespace) for every target, in parallel when there are several.
+        """
+        if len(targets) == 1:
+            return [func(*targets[0])]
+        with self._init_lock:
+            if self._fan_out_pool is None:
+                self._fan_out_pool = ThreadPoolExecutor(max_workers=PARTITION_QUERY_WORKERS)
+        return list(self._fan_out_pool.map(lambda target: func(*target), targets))
+
+    @staticmethod
+    def _is_missing_namespace(error):
+        # A partitioned base namespace may never have been written; Pinecone answers 404 for it
+        return "404" in str(error) or "not found" in str(error).lower()
+
+    def upsert_vectors(self, vectors, namespace="default", batch_size=None, index_name=None):
         """
         Upserts a batch of vectors to Pinecone.
+        If batch_size is given, the vectors are sent in chunks of that size to stay under request size limits.
+        Vectors for a time-partitioned namespace go to the monthly partition of their metadata date.
         """
         if not vectors:
             logger.warning("No vectors to upsert.")
             return
         try:
-            logger.info(f"Upserting {len(vectors)} vectors to namespace '{namespace}'...")
-            response = self.index.upsert(vectors=vectors, namespace=namespace)
-            logger.info(f"Upsert successful. Response: {response}")
+            index_name, namespace = self.resolve(namespace, index_name=index_name, dimension=len(vectors[0]["values"]))
+            index = self.index_for(index_name)
+            if is_partitioned(namespace):
+                groups = {}
+                for vector in vectors:
+                    groups.setdefault(month_of((vector.get("metadata") or {}).get("date")), []).append(vector)
+                registry = get_namespace_registry()
+                batches = []
+                for month, group in sorted(groups.items()):
+                    partition = partition_namespace(namespace, month)
+                    registry.register_partition(index_name, namespace, month, partition)
+                    batches.append((partition, group))
+            else:
+                batches = [(namespace, vectors)]
+
+            for physical, group in batches:
+                logger.info(f"Upserting {len(group)} vectors to namespace '{physical}'...")
+                if batch_size:
+                    response = index.upsert(vectors=group, namespace=physical, batch_size=batch_size)
+                else:
+                    response = index.upsert(vectors=group, namespace=physical)
+                logger.info(f"Upsert successful. Response: {response}")
         except Exception as e:
             logger.error(f"Upsert failed: {e}")
             raise
 
-    def query_vectors(self, query, namespace="default", top_k=5):
+    def query_vector(self, vector, namespace="default", top_k=5, date_from=None, date_to=None):
+        """
+        Queries every partition of a namespace that overlaps [date_from, date_to] (all of them
+        when no range is given) in parallel and merges the matches by score.
+        """
+        targets = self.targets(namespace, date_from=date_from, date_to=date_to, dimension=len(vector))
+
+        def query(index, physical):
+            response = index.query(vector=vector, top_k=top_k, include_metadata=True, namespace=physical)
+            return response.get("matches", [])
+
+        matches = [
+            {"id": match["id"], "score": match["score"], "metadata": match["metadata"]}
+            for matches in self._fan_out(query, targets) for match in matches
+        ]
+        if len(targets) > 1:
+            matches = heapq.nlargest(top_k, matches, key=lambda match: match["score"])
+        return matches
+
+    def query_vectors(self, query, namespace="default", top_k=5, date_from=None, date_to=None):
         """
         Queries the Pinecone index for top-k similar vectors.
         """
@@ -172,34 +311,33 @@ class VectorDBService:
                 logger.error("Failed to vectorize the query.")
                 return []
 
-            query_vector = query_vector.tolist()
-
             logger.info(f"Querying Pinecone with cleaned query: '{query[:200]}...' (namespace: {namespace})")
-            response = self.index.query(
-                vector=query_vector,
-                top_k=top_k,
-                include_metadata=True,
-                namespace=namespace,
-            )
-
-            matches = [
-                {"id": match["id"], "score": match["score"], "metadata": match["metadata"]}
-                for match in response.get("matches", [])
-            ]
+            matches = self.query_vector(query_vector.tolist(), namespace=namespace, top_k=top_k,
+                                        date_from=date_from, date_to=date_to)
             logger.info(f"Found {len(matches)} matches.")
             return matches
         except Exception as e:
             logger.error(f"Query failed: {e}")
             raise
 
+    def encode_queries(self, queries, batch_size=32):
+        """
+        Cleans and encodes many query texts with batched forward passes.
+        Returns one vector (list) per query, equal to what query_vectors would use.
+        """
+        cleaned = [self.clean_text(query) for query in queries]
+        return [vector.tolist() for vector in self.vectorizer.encode_batch(cleaned, batch_size=batch_size)]
+
     def query_by_id(self, article_id, namespace="default"):
         """
         Fetches metadata for a specific article ID.
         """
         try:
             logger.info(f"Fetching vector for ID: {article_id} (namespace: {namespace})")
-            results = self.index.fetch(ids=[article_id], namespace=namespace)
-            vectors = results.vectors if hasattr(results, 'vectors') else {}
+            vectors = {}
+            for results in self._fan_out(lambda index, physical: index.fetch(ids=[article_id], namespace=physical),
+                                         self.targets(namespace)):
+                vectors.update(results.vectors if hasattr(results, 'vectors') else {})
             if not vectors:
                 logger.warning(f"No results found for ID: {article_id}")
                 return []
@@ -219,33 +357,118 @@ class VectorDBService:
                 logger.error("Failed to vectorize the title.")
                 return []
 
-            title_vector = title_vector.tolist()
-
             logger.info(f"Querying Pinecone with title vector for: '{title[:200]}...' (namespace: {namespace})")
-            response = self.index.query(
-                vector=title_vector,
-                top_k=top_k,
-                include_metadata=True,
-                namespace=namespace,
-            )
-
-            matches = [
-                {"id": match["id"], "score": match["score"], "metadata": match["metadata"]}
-                for match in response.get("matches", [])
-            ]
+            matches = self.query_vector(title_vector.tolist(), namespace=namespace, top_k=top_k)
             logger.info(f"Found {len(matches)} matches for title query.")
             return matches
         except Exception as e:
             logger.error(f"Title query failed: {e}")
             raise
 
+    def fetch_metadata(self, ids, namespace="default", index_name=None):
+        """
+        Fetches the metadata of several vectors in one request per partition.
+        Returns {id: metadata} for the IDs found.
+        """
+        if not ids:
+            return {}
+        try:
+            metadata = {}
+            for results in self._fan_out(lambda index, physical: index.fetch(ids=list(ids), namespace=physical),
+                                         self.targets(namespace, index_name=index_name)):
+                vectors = results.vectors if hasattr(results, 'vectors') else {}
+                metadata.update({vector_id: vector["metadata"] or {} for vector_id, vector in vectors.items()})
+            return metadata
+        except Exception as e:
+            logger.error(f"Error fetching metadata of {len(ids)} vectors: {e}")
+            raise
+
+    def list_ids(self, prefix=None, namespace="default", index_name=None):
+        """
+        Returns the IDs in a namespace (across its partitions), or only those that start with prefix.
+        """
+        try:
+            ids = []
+            for index, physical in self.targets(namespace, index_name=index_name):
+                pages = index.list(prefix=prefix, namespace=physical) if prefix else index.list(namespace=physical)
+                ids.extend(vector_id for id_batch in pages for vector_id in id_batch)
+            return ids
+        except Exception as e:
+            logger.error(f"Failed to list IDs with prefix '{prefix}' in namespace '{namespace}': {e}")
+            raise
+
+    def delete_vectors(self, ids, namespace="default"):
+        """
+        Deletes the given vector IDs from a namespace (from every partition).
+        """
+        if not ids:
+            return
+
+        def delete(index, physical):
+            try:
+                index.delete(ids=list(ids), namespace=physical)
+            except Exception as e:
+                if not self._is_missing_namespace(e):
+                    raise
+
+        try:
+            logger.info(f"Deleting {len(ids)} vectors from namespace '{namespace}'...")
+            self._fan_out(delete, self.targets(namespace))
+        except Exception as e:
+            logger.error(f"Failed to delete vectors from namespace '{namespace}': {e}")
+            raise
+
+    def iter_vectors(self, namespace="default", batch_size=100, limit=None, index_name=None):
+        """
+        Iterates over the stored vectors of a namespace (partition by partition), yielding dicts
+        with id, values and metadata.
+        IDs are paged with `list` and fetched in batches, so memory stays bounded by batch_size.
+        """
+        yielded = 0
+        try:
+            for index, physical in self.targets(namespace, index_name=index_name):
+                for id_batch in index.list(namespace=physical, limit=batch_size):
+                    if not id_batch:
+                        continue
+                    results = index.fetch(ids=list(id_batch), namespace=physical)
+                    vectors = results.vectors if hasattr(results, 'vectors') else {}
+                    for vector_id in id_batch:
+                        vector = vectors.get(vector_id)
+                        if vector is None:
+                            continue
+                        yield {"id": vector_id, "values": vector["values"], "metadata": vector["metadata"] or {}}
+                        yielded += 1
+                        if limit is not None and yielded >= limit:
+                            return
+        except Exception as e:
+            logger.error(f"Failed to iterate vectors in namespace '{namespace}': {e}")
+            raise
+
+    def delete_namespace(self, namespace, index_name=None):
+        """
+        Deletes one physical namespace (e.g. an expired monthly partition) in a single request.
+        """
+        try:
+            logger.info(f"Deleting namespace '{namespace}'...")
+            self.index_for(index_name).delete(delete_all=True, namespace=namespace)
+        except Exception as e:
+            if not self._is_missing_namespace(e):
+                logger.error(f"Failed to delete namespace '{namespace}': {e}")
+                raise
+
     def delete_all(self, namespace="default"):
         """
-        Deletes all vectors in a given namespace using the Pinecone `delete` method.
+        Deletes all vectors in a given namespace, including all its monthly partitions.
         """
         try:
             logger.info(f"Deleting all vectors in namespace '{namespace}'...")
-            self.index.delete(delete_all=True, namespace=namespace)
+            index_name, physical = self.resolve(namespace)
+            self.delete_namespace(physical, index_name=index_name)
+            if is_partitioned(physical):
+                registry = get_namespace_registry()
+                for partition in registry.partitions(index_name, physical):
+                    self.delete_namespace(partition["namespace"], index_name=index_name)
+                    registry.set_partition_status(index_name, physical, partition["month"], "dropped")
             logger.info(f"Successfully deleted all vectors in namespace '{namespace}'.")
         except Exception as e:
             logger.error(f"Failed to delete all vectors in namespace '{namespace}': {e}")
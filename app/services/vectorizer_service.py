@@ -1,14 +1,17 @@
 #app/services/vectorizer_service.py
-from transformers import AutoTokenizer, AutoModel
+from transformers import AutoModel
+from services.phobert_tokenizer import load_tokenizer, map_unknown_ids
 import torch
 import numpy as np
 import re
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
 # Module-level singleton instance
 _vectorizer_instance = None
+_vectorizer_lock = threading.Lock()
 
 def get_vectorizer(model_name='vinai/phobert-base', target_dim=768):
     """
@@ -16,8 +19,9 @@ def get_vectorizer(model_name='vinai/phobert-base', target_dim=768):
     This ensures the model is only loaded once across the entire application.
     """
     global _vectorizer_instance
-    if _vectorizer_instance is None:
-        _vectorizer_instance = PhoBERTVectorizer(model_name, target_dim)
+    with _vectorizer_lock:
+        if _vectorizer_instance is None:
+            _vectorizer_instance = PhoBERTVectorizer(model_name, target_dim)
     return _vectorizer_instance
 
 class PhoBERTVectorizer:
@@ -28,27 +32,75 @@ class PhoBERTVectorizer:
         """
         print("Loading PhoBERT model... This may take a few minutes.")
         logger.info("Loading PhoBERT model... This may take a few minutes.")
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.tokenizer = load_tokenizer(model_name)  # Fast Rust tokenizer when the conversion checks out
         self.model = AutoModel.from_pretrained(model_name)
         self.target_dim = target_dim  # Target dimension for embeddings
+        self.vocab_size = self.model.config.vocab_size
+        # RoBERTa position IDs start after the padding index, so PhoBERT fits 256 tokens, not 512
+        self.max_length = min(512, self.model.config.max_position_embeddings - 2)
         print("PhoBERT model loaded successfully.")
         logger.info("PhoBERT model loaded successfully.")
 
+    @staticmethod
+    def preprocess(text):
+        """
+        Light cleaning applied to every text before tokenization.
+        """
+        text = re.sub(r"[^\w\s]", " ", text)  # Example cleaning
+        return re.sub(r"\s+", " ", text).strip()
+
     def encode_text(self, text):
         """
         Encodes a piece of text into a vector using PhoBERT and pads or resizes it.
         """
         # Clean text directly here (if needed)
-        text = re.sub(r"[^\w\s]", " ", text)  # Example cleaning
-        text = re.sub(r"\s+", " ", text).strip()
+        text = self.preprocess(text)
 
-        inputs = self.tokenizer(text, truncation=True, max_length=512, return_tensors='pt')
-        with torch.no_grad():
+        inputs = self.tokenizer(text, truncation=True, max_length=self.max_length, return_tensors='pt')
+        map_unknown_ids(inputs['input_ids'], self.vocab_size, self.tokenizer.unk_token_id)
+        with torch.inference_mode():
             outputs = self.model(**inputs)
             # Use [CLS] token's embedding (first token) for simplicity
             cls_embedding = outputs.last_hidden_state[:, 0, :].squeeze().cpu().numpy()
         return self.pad_or_resize_embedding(cls_embedding)
 
+    def tokenize_batch(self, texts):
+        """
+        Preprocesses and tokenizes many texts in one call (in parallel, in Rust, with the fast
+        tokenizer). Returns one unpadded list of input IDs per text.
+        """
+        cleaned = [self.preprocess(text) for text in texts]
+        input_ids = self.tokenizer(cleaned, truncation=True, max_length=self.max_length)['input_ids']
+        return map_unknown_ids(input_ids, self.vocab_size, self.tokenizer.unk_token_id)
+
+    def encode_tokenized(self, input_ids, batch_size=32):
+        """
+        Runs the model over texts tokenized by tokenize_batch. Returns an array of shape
+        (len(input_ids), target_dim). Texts are sorted by token count before batching so each
+        batch carries as little padding as possible.
+        """
+        embeddings = np.zeros((len(input_ids), self.target_dim), dtype=np.float32)
+        order = sorted(range(len(input_ids)), key=lambda i: len(input_ids[i]))
+
+        for start in range(0, len(order), batch_size):
+            batch_indices = order[start:start + batch_size]
+            inputs = self.tokenizer.pad({'input_ids': [input_ids[i] for i in batch_indices]}, return_tensors='pt')
+            with torch.inference_mode():
+                outputs = self.model(**inputs)
+                # [CLS] is the first token, so right padding does not change it
+                cls_embeddings = outputs.last_hidden_state[:, 0, :].cpu().numpy()
+            for row, index in enumerate(batch_indices):
+                embeddings[index] = self.pad_or_resize_embedding(cls_embeddings[row])
+        return embeddings
+
+    def encode_batch(self, texts, batch_size=32):
+        """
+        Encodes many texts with batched forward passes. Returns an array of shape (len(texts), target_dim)
+        whose rows match encode_text for the same inputs.
+        """
+        if not texts:
+            return np.zeros((0, self.target_dim), dtype=np.float32)
+        return self.encode_tokenized(self.tokenize_batch(texts), batch_size=batch_size)
 
     def pad_or_resize_embedding(self, embedding):
         """
@@ -0,0 +1,75 @@
+# app/services/warmup.py
+from services.vector_db_service import VectorDBService
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "10"))
+# Text encoded once at startup so the first real query does not pay for lazy kernel setup
+WARMUP_TEXT = "tin tức mới nhất"
+
+_status = {"model": "pending", "index": "pending"}
+_errors = {}
+_status_lock = threading.Lock()
+_warmup_thread = None
+
+
+def _set_status(component, status, error=None):
+    with _status_lock:
+        _status[component] = status
+        if error is None:
+            _errors.pop(component, None)
+        else:
+            _errors[component] = str(error)
+
+
+def _warm_up(component, check):
+    """
+    Runs a check until it succeeds, retrying every WARMUP_RETRY_SECONDS.
+    """
+    _set_status(component, "loading")
+    while True:
+        start = time.perf_counter()
+        try:
+            check()
+            _set_status(component, "ready")
+            logger.info(f"{component.capitalize()} ready after {time.perf_counter() - start:.1f}s.")
+            return
+        except Exception as e:
+            logger.error(f"{component.capitalize()} warm-up failed, retrying in {WARMUP_RETRY_SECONDS:.0f}s: {e}")
+            _set_status(component, "failed", e)
+            time.sleep(WARMUP_RETRY_SECONDS)
+
+
+def _run_warmup():
+    vector_db = VectorDBService()
+    _warm_up("model", lambda: vector_db.vectorizer.encode_text(WARMUP_TEXT))
+    _warm_up("index", lambda: vector_db.index.describe_index_stats())
+
+
+def start_warmup():
+    """
+    Loads the model and checks the Pinecone index in a background thread, so the server
+    starts accepting connections immediately. Safe to call more than once.
+    """
+    global _warmup_thread
+    with _status_lock:
+        if _warmup_thread is not None:
+            return
+        _warmup_thread = threading.Thread(target=_run_warmup, name="warmup", daemon=True)
+    _warmup_thread.start()
+
+
+def readiness():
+    """
+    Returns (ready, details): ready once the model and the index have both been warmed up.
+    """
+    with _status_lock:
+        details = {"components": dict(_status)}
+        if _errors:
+            details["errors"] = dict(_errors)
+    ready = all(status == "ready" for status in details["components"].values())
+    return ready, details
@@ -0,0 +1,74 @@
+# app/utils/chunking.py
+import os
+import re
+
+# Passage size in words. Vietnamese syllables are mostly a single PhoBERT token, so 160 words
+# stays inside the model's 256-token window with room for <s>, </s> and rare splits.
+CONTENT_CHUNK_WORDS = int(os.getenv("CONTENT_CHUNK_WORDS", "160"))
+# Words repeated from the end of one passage at the start of the next
+CONTENT_CHUNK_OVERLAP_WORDS = int(os.getenv("CONTENT_CHUNK_OVERLAP_WORDS", "32"))
+# Upper bound on passages per article, so very long articles cost a bounded amount of work
+CONTENT_MAX_CHUNKS = int(os.getenv("CONTENT_MAX_CHUNKS", "64"))
+
+# A sentence runs up to end punctuation followed by whitespace, or up to a line break
+SENTENCE_PATTERN = re.compile(r"[^\n]+?(?:[.!?…]+(?=\s)|$)", re.MULTILINE)
+
+
+def iter_sentences(text):
+    """
+    Yields the sentences of text one at a time, without building a list of them.
+    """
+    for match in SENTENCE_PATTERN.finditer(text or ""):
+        sentence = match.group().strip()
+        if sentence:
+            yield sentence
+
+
+def iter_chunks(text, max_words=CONTENT_CHUNK_WORDS, overlap_words=CONTENT_CHUNK_OVERLAP_WORDS,
+                max_chunks=CONTENT_MAX_CHUNKS):
+    """
+    Streams overlapping passages of at most max_words words out of text.
+    Passages end on sentence boundaries; a sentence longer than max_words is split on words.
+    Each passage after the first starts with the last sentences of the previous one, up to
+    overlap_words words (or the tail of its last sentence when that sentence is longer).
+    Only the passage being built is held in memory.
+    """
+    overlap_words = min(overlap_words, max_words // 2)
+    current = []  # Sentences of the passage being built, as word lists
+    current_words = 0
+    emitted = 0
+
+    def pieces():
+        for sentence in iter_sentences(text):
+            words = sentence.split()
+            for start in range(0, len(words), max_words):
+                yield words[start:start + max_words]
+
+    for words in pieces():
+        if current_words + len(words) > max_words and current:
+            yield " ".join(word for sentence in current for word in sentence)
+            emitted += 1
+            if emitted >= max_chunks:
+                return
+
+            # Carry trailing sentences into the next passage as overlap
+            carried = []
+            carried_words = 0
+            for sentence in reversed(current):
+                if carried_words + len(sentence) > overlap_words:
+                    break
+                carried.insert(0, sentence)
+                carried_words += len(sentence)
+            if not carried and overlap_words:
+                # The last sentence is longer than the overlap; carry its tail instead
+                carried = [current[-1][-overlap_words:]]
+                carried_words = len(carried[0])
+            if carried_words + len(words) > max_words:
+                carried, carried_words = [], 0
+            current, current_words = carried, carried_words
+
+        current.append(words)
+        current_words += len(words)
+
+    if current and emitted < max_chunks:
+        yield " ".join(word for sentence in current for word in sentence)
@@ -1,6 +1,7 @@
 #app/utils/common.py
 import unicodedata
 import re
+from datetime import datetime, timezone
 
 def normalize_text(text):
     """
@@ -10,3 +11,21 @@ def normalize_text(text):
     normalized_text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('utf-8').lower()
     sanitized_text = re.sub(r'[^\w\s]', '', normalized_text)
     return sanitized_text.strip()
+
+def parse_iso_datetime(value):
+    """
+    Parses an ISO 8601 date string (as stored in article metadata) into a timezone-aware datetime.
+    Naive values are assumed to be UTC. Returns None if the value cannot be parsed.
+    """
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        if not value or not isinstance(value, str):
+            return None
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
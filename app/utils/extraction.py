@@ -0,0 +1,151 @@
+# app/utils/extraction.py
+import logging
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+from utils.scraper_helpers import HTML_PARSER, clean_html, parse_publish_date
+
+logger = logging.getLogger(__name__)
+
+# Per-source extraction rules. These are the selectors the live scrapers use, kept in one place
+# so archived pages can be re-extracted without importing the scrapers (which load the model).
+SOURCES = {
+    "vnexpress.net": {
+        "source": "VNExpress",
+        "content_selector": "article.fck_detail p.Normal",
+    },
+    "vietnamnet.vn": {
+        "source": "VietnamNet",
+        "content_selector": "div.contentDetail__main-reading",
+    },
+    "tuoitre.vn": {
+        "source": "Tuổi Trẻ",
+        "content_selector": "div.detail-content.afcbc-body",
+    },
+    "dantri.com.vn": {
+        "source": "Dân Trí",
+        "content_selectors": ["div.singular-content", "div.e-magazine__body"],
+    },
+    "thanhnien.vn": {
+        "source": "Thanh Niên",
+        "sapo": ("h2", "detail-sapo"),
+        "content_div": ("div", "detail-content.afcbc-body"),
+    },
+}
+
+TITLE_SELECTORS = [
+    'meta[property="og:title"]',
+    'h1',
+    'title',
+]
+
+URL_SELECTORS = [
+    'link[rel="canonical"]',
+    'meta[property="og:url"]',
+]
+
+
+def make_soup(html_content, parser=None):
+    return BeautifulSoup(html_content, parser or HTML_PARSER)
+
+
+def source_config_for_url(url):
+    """
+    Returns the extraction rules for the site an article URL belongs to, or None if it is unknown.
+    """
+    host = (urlparse(url or "").hostname or "").lower()
+    for domain, config in SOURCES.items():
+        if host == domain or host.endswith("." + domain):
+            return config
+    return None
+
+
+def extract_content(soup, config):
+    """
+    Extracts the article body from a parsed page using a source's rules.
+    Mirrors what each scraper does for live pages.
+    """
+    if "content_selector" in config:
+        element = soup.select_one(config["content_selector"])
+        return element.get_text(separator="\n").strip() if element else None
+
+    if "content_selectors" in config:
+        for selector in config["content_selectors"]:
+            element = soup.select_one(selector)
+            if element:
+                return clean_html(element.get_text())
+        return None
+
+    sapo_tag, sapo_class = config["sapo"]
+    sapo = soup.find(sapo_tag, class_=sapo_class)
+    sapo_text = sapo.get_text(strip=True) if sapo else ''
+    content_tag, content_class = config["content_div"]
+    content_div = soup.find(content_tag, class_=content_class)
+    content = "\n".join([p.get_text(strip=True) for p in content_div.find_all('p')]) if content_div else ''
+    full_content = f"{sapo_text}\n\n{content}"
+    return full_content if full_content.strip() else None
+
+
+def extract_title(soup):
+    for selector in TITLE_SELECTORS:
+        element = soup.select_one(selector)
+        if element is None:
+            continue
+        title = element.get('content') if element.name == 'meta' else element.get_text(strip=True)
+        if title and title.strip():
+            return clean_html(title.strip())
+    return None
+
+
+def extract_canonical_url(soup):
+    for selector in URL_SELECTORS:
+        element = soup.select_one(selector)
+        if element is not None:
+            url = element.get('href') or element.get('content')
+            if url:
+                return url.strip()
+    return None
+
+
+def extract_article(html_content, url=None):
+    """
+    Extracts an article dict (title, content, date, source, source_url) from a saved page.
+    The URL is taken from the page's canonical link when not given. Returns None if the
+    page belongs to an unknown source or has no content. The date is None if the page has none.
+    """
+    try:
+        soup = make_soup(html_content)
+        url = url or extract_canonical_url(soup)
+        config = source_config_for_url(url)
+        if config is None:
+            logger.warning(f"No extraction rules for {url}.")
+            return None
+
+        content = extract_content(soup, config)
+        if not content or not content.strip():
+            logger.warning(f"Content not found for {url}")
+            return None
+
+        return {
+            "title": extract_title(soup),
+            "content": content,
+            "date": parse_publish_date(soup),
+            "source": config["source"],
+            "source_url": url,
+        }
+    except Exception as e:
+        logger.error(f"Error extracting article from {url}: {e}")
+        return None
+
+
+def extract_page(source_key, html_content, url="", parser=None):
+    """
+    Parses a fetched page once and extracts its content and publication date with the rules of
+    SOURCES[source_key]. Returns {"content": ..., "date": ...}; either may be None.
+    This is the unit of work sent to the extraction process pool, so it only takes picklable arguments.
+    """
+    soup = make_soup(html_content, parser)
+    content = extract_content(soup, SOURCES[source_key])
+    if not content or not content.strip():
+        logger.warning(f"Content not found for {url}")
+        content = None
+    return {"content": content, "date": parse_publish_date(soup)}
@@ -1,12 +1,23 @@
 # app/utils/scraper_helpers.py
 import html
 import logging
+import os
+import threading
+import time
 from bs4 import BeautifulSoup
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from utils.sqlite_helpers import connect, data_path
+import feedparser
 import requests
 
 logger = logging.getLogger(__name__)
 
+# BeautifulSoup tree builder. lxml's C parser is several times faster than the pure-Python "html.parser".
+HTML_PARSER = os.getenv("HTML_PARSER", "lxml")
+
 def clean_html(html_content):
     """
     Cleans HTML content by removing tags and returning plain text.
@@ -18,7 +29,7 @@ def clean_html(html_content):
         return ""
 
     # Parse the HTML content using BeautifulSoup
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = BeautifulSoup(html_content, HTML_PARSER)
 
     # Get the text and decode HTML entities
     clean_text = soup.get_text(separator="\n").strip()
@@ -27,67 +38,327 @@ def clean_html(html_content):
     return clean_text
 
 
-def fetch_article_content_and_date(url, content_selector):
+DATE_SELECTORS = [
+    'div.publish-date',
+    'time',
+    'meta[property="article:published_time"]',
+    'meta[name="pubdate"]', 'meta[name="og:pubdate"]',
+]
+
+DATE_FORMATS = [
+    '%a, %d %b %Y %H:%M:%S %z',  # RSS common format
+    '%a, %d %b %y %H:%M:%S %z',
+    '%Y-%m-%dT%H:%M:%S%z',       # ISO 8601 format
+    '%Y-%m-%dT%H:%M:%S.%fZ',     # ISO format with milliseconds
+    '%d/%m/%Y %H:%M',            # VN format with time
+    '%d-%m-%Y %H:%M',            # VN format with time
+    '%d/%m/%Y',                  # VN format without time
+    '%d-%m-%Y',                  # VN format without time
+    '%d/%m/%Y  -  %H:%M'         # For format like '03/10/2024 - 09:10'
+]
+
+def parse_publish_date(soup):
+    """
+    Extracts the publication date from a parsed article page.
+    Returns None if the page has no date or it cannot be parsed.
+    """
+    pub_date_str = None
+    for selector in DATE_SELECTORS:
+        date_element = soup.select_one(selector)
+        if date_element:
+            if date_element.name == 'meta':
+                pub_date_str = date_element.get('content')
+            else:
+                pub_date_str = date_element.get_text(strip=True)
+            if pub_date_str:
+                break
+
+    if not pub_date_str:
+        return None
+
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(pub_date_str.strip(), fmt)
+        except ValueError:
+            continue
+    logger.warning(f"Date parsing failed for {pub_date_str}.")
+    return None
+
+
+def extract_content_and_date(html_content, content_selector, url=""):
+    """
+    Extracts (content, publication date) from an article page with a single CSS selector.
+    The date falls back to the current datetime.
+    """
+    soup = BeautifulSoup(html_content, HTML_PARSER)
+
+    # Extract article content
+    article_content = soup.select_one(content_selector)
+    if not article_content:
+        raise ValueError(f"Content not found for {url}")
+
+    content = article_content.get_text(separator="\n").strip()
+
+    # Extract publication date
+    pub_date = parse_publish_date(soup)
+    if pub_date is None:
+        logger.warning(f"Date not found for {url}, using current datetime.")
+        pub_date = datetime.now()
+
+    return content, pub_date
+
+
+# Politeness settings, per host
+CRAWL_RATE_PER_HOST = float(os.getenv("CRAWL_RATE_PER_HOST", "2"))  # Requests per second
+CRAWL_BURST = float(os.getenv("CRAWL_BURST", "4"))
+CRAWL_MIN_RATE = float(os.getenv("CRAWL_MIN_RATE", "0.1"))
+# Responses slower than this are taken as a sign the site is struggling
+CRAWL_SLOW_RESPONSE_SECONDS = float(os.getenv("CRAWL_SLOW_RESPONSE_SECONDS", "5"))
+CRAWL_MAX_RETRIES = int(os.getenv("CRAWL_MAX_RETRIES", "2"))
+CRAWL_MAX_RETRY_AFTER = float(os.getenv("CRAWL_MAX_RETRY_AFTER", "300"))
+# Requests per second regained after every successful response
+CRAWL_RATE_RECOVERY_STEP = 0.05
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value):
+    """
+    Parses a Retry-After header (seconds or an HTTP date) into a delay in seconds, or None.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # Extract article content
-        article_content = soup.select_one(content_selector)
-        if not article_content:
-            raise ValueError(f"Content not found for {url}")
-        
-        content = article_content.get_text(separator="\n").strip()
-
-        # Extract publication date
-        pub_date_str = None
-        pub_date = None
-        
-        date_selectors = [
-            'div.publish-date',  
-            'time', 
-            'meta[property="article:published_time"]',
-            'meta[name="pubdate"]', 'meta[name="og:pubdate"]',
-        ]
-
-        for selector in date_selectors:
-            date_element = soup.select_one(selector)
-            if date_element:
-                if date_element.name == 'meta':
-                    pub_date_str = date_element.get('content')
-                else:
-                    pub_date_str = date_element.get_text(strip=True)
-                if pub_date_str:
-                    break
-        
-        # If no date found, log and return current datetime
-        if not pub_date_str:
-            logger.warning(f"Date not found for {url}, using current datetime.")
-            pub_date = datetime.now()
-        else:
-            date_formats = [
-                '%a, %d %b %Y %H:%M:%S %z',  # RSS common format
-                '%a, %d %b %y %H:%M:%S %z',
-                '%Y-%m-%dT%H:%M:%S%z',       # ISO 8601 format
-                '%Y-%m-%dT%H:%M:%S.%fZ',     # ISO format with milliseconds
-                '%d/%m/%Y %H:%M',            # VN format with time
-                '%d-%m-%Y %H:%M',            # VN format with time
-                '%d/%m/%Y',                  # VN format without time
-                '%d-%m-%Y',                  # VN format without time
-                '%d/%m/%Y  -  %H:%M'         # For format like '03/10/2024 - 09:10'
-            ]
-            for fmt in date_formats:
-                try:
-                    pub_date = datetime.strptime(pub_date_str.strip(), fmt)
-                    break
-                except ValueError:
-                    continue
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostState:
+    """
+    Request statistics of one host, as seen by this process.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.avg_latency = None
+        self.recent = deque()  # Monotonic times of requests in the last minute
+
+
+class HostRateLimiter:
+    """
+    Per-host token-bucket rate limiter for the scrapers' HTTP requests.
+    Each host starts at CRAWL_RATE_PER_HOST requests per second. A 429 or 503 response halves
+    the host's rate and pauses it for Retry-After seconds; a slow response reduces the rate a
+    little. Every successful response then adds the rate back in small steps, up to the
+    configured maximum.
+    The buckets, rates and pauses live in a SQLite file in DATA_DIR shared by every process
+    (scheduler, crawl workers and their replicas, backfill), so the per-host limit holds for
+    the whole deployment and one process being throttled slows all of them down.
+    Request statistics are kept per process.
+    """
+
+    def __init__(self, rate=CRAWL_RATE_PER_HOST, burst=CRAWL_BURST, min_rate=CRAWL_MIN_RATE,
+                 slow_response_seconds=CRAWL_SLOW_RESPONSE_SECONDS, path=None):
+        self.max_rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.slow_response_seconds = slow_response_seconds
+        self.path = path
+        self.hosts = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _conn(self):
+        # Opened on first use, so importing the scrapers does not touch DATA_DIR
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.path is None:
+                self.path = os.getenv("CRAWL_RATE_LIMIT_PATH") or data_path("host_rate_limits.db")
+            conn = self._local.conn = connect(self.path)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS host_limits (
+                    host TEXT PRIMARY KEY,
+                    rate REAL NOT NULL,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    blocked_until REAL NOT NULL
+                )
+            """)
+        return conn
+
+    def _host(self, host):
+        if host not in self.hosts:
+            self.hosts[host] = HostState()
+        return self.hosts[host]
+
+    def _update(self, host, change):
+        """
+        Runs change(rate, tokens, blocked_until, now) on the host's shared bucket (refilled to now)
+        in one transaction and stores the (rate, tokens, blocked_until) it returns.
+        Returns the result of change as well.
+        """
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute(
+                "SELECT rate, tokens, updated, blocked_until FROM host_limits WHERE host = ?", (host,)
+            ).fetchone()
+            if row is None:
+                rate, tokens, blocked_until = self.max_rate, self.burst, 0.0
+            else:
+                rate, blocked_until = row["rate"], row["blocked_until"]
+                tokens = min(self.burst, row["tokens"] + max(0.0, now - row["updated"]) * rate)
+            result = change(rate, tokens, blocked_until, now)
+            conn.execute(
+                "INSERT OR REPLACE INTO host_limits (host, rate, tokens, updated, blocked_until) VALUES (?, ?, ?, ?, ?)",
+                (host, result[0], result[1], now, result[2]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def acquire(self, host):
+        """
+        Blocks until a request to the host is allowed.
+        """
+        def take(rate, tokens, blocked_until, now):
+            if now < blocked_until:
+                return rate, tokens, blocked_until, blocked_until - now
+            if tokens >= 1:
+                return rate, tokens - 1, blocked_until, 0.0
+            return rate, tokens, blocked_until, (1 - tokens) / rate
+
+        while True:
+            wait = self._update(host, take)[3]
+            if wait <= 0:
+                with self._lock:
+                    self._host(host).recent.append(time.monotonic())
+                return
+            time.sleep(wait)
+
+    def record(self, host, status_code, latency, retry_after=None):
+        """
+        Records the outcome of a request and adapts the host's rate.
+        status_code is None when the request failed without a response.
+        """
+        with self._lock:
+            state = self._host(host)
+            state.requests += 1
+            state.avg_latency = latency if state.avg_latency is None else 0.8 * state.avg_latency + 0.2 * latency
+            if status_code in THROTTLE_STATUS_CODES:
+                state.throttled += 1
+            if status_code in THROTTLE_STATUS_CODES or status_code is None or status_code >= 500:
+                state.errors += 1
+
+        def adapt(rate, tokens, blocked_until, now):
+            if status_code in THROTTLE_STATUS_CODES:
+                rate = max(self.min_rate, rate / 2)
+                pause = min(retry_after if retry_after is not None else 1 / rate, CRAWL_MAX_RETRY_AFTER)
+                blocked_until = max(blocked_until, now + pause)
+                logger.warning(f"{host} throttled us (HTTP {status_code}); pausing {pause:.1f}s, "
+                               f"rate lowered to {rate:.2f} req/s.")
+            elif status_code is None or status_code >= 500 or latency > self.slow_response_seconds:
+                rate = max(self.min_rate, rate * 0.8)
             else:
-                logger.warning(f"Date parsing failed for {pub_date_str}, using current datetime.")
-                pub_date = datetime.now()
+                rate = min(self.max_rate, rate + CRAWL_RATE_RECOVERY_STEP)
+            return rate, tokens, blocked_until
+
+        self._update(host, adapt)
+
+    def stats(self):
+        """
+        Returns this process's request rate (last minute), error rate and latency per host,
+        with the host's current shared limit and pause.
+        """
+        shared = {
+            row["host"]: row for row in self._conn().execute(
+                "SELECT host, rate, blocked_until FROM host_limits"
+            ).fetchall()
+        }
+        with self._lock:
+            now = time.monotonic()
+            wall_now = time.time()
+            result = {}
+            for host, state in self.hosts.items():
+                while state.recent and state.recent[0] < now - 60:
+                    state.recent.popleft()
+                limits = shared.get(host)
+                result[host] = {
+                    "requests": state.requests,
+                    "requests_per_second": round(len(state.recent) / 60, 3),
+                    "error_rate": round(state.errors / state.requests, 3) if state.requests else 0.0,
+                    "throttled": state.throttled,
+                    "avg_latency": round(state.avg_latency, 3) if state.avg_latency is not None else None,
+                    "rate_limit": round(limits["rate"], 3) if limits else self.max_rate,
+                    "paused_for": round(max(0.0, limits["blocked_until"] - wall_now), 1) if limits else 0.0,
+                }
+            return result
+
+
+rate_limiter = HostRateLimiter()
+
+
+def polite_get(url, timeout=10, max_retries=CRAWL_MAX_RETRIES, **kwargs):
+    """
+    requests.get through the per-host rate limiter.
+    Retries 429/503 responses after the pause the server asked for, up to max_retries times.
+    Returns the last response; connection errors are raised as with requests.get.
+    """
+    host = (urlparse(url).hostname or "").lower()
+    for attempt in range(max_retries + 1):
+        rate_limiter.acquire(host)
+        started = time.monotonic()
+        try:
+            response = requests.get(url, timeout=timeout, **kwargs)
+        except requests.RequestException:
+            rate_limiter.record(host, None, time.monotonic() - started)
+            raise
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        rate_limiter.record(host, response.status_code, time.monotonic() - started, retry_after)
+        if response.status_code not in THROTTLE_STATUS_CODES:
+            break
+    return response
+
+
+def fetch_feed(feed_url, timeout=10):
+    """
+    Downloads an RSS feed through the rate limiter and parses it with feedparser.
+    """
+    response = polite_get(feed_url, timeout=timeout)
+    response.raise_for_status()
+    return feedparser.parse(response.content)
+
+
+def fetch_page(entry, timeout=10):
+    """
+    Downloads the article page of a feed entry for the scrape pipeline.
+    Returns the entry with its raw "html" added, or None if the download failed.
+    """
+    try:
+        response = polite_get(entry['link'], timeout=timeout)
+        response.raise_for_status()
+        return dict(entry, html=response.content)
+    except Exception as e:
+        logger.error(f"Error fetching content for {entry['link']}: {e}")
+        return None
 
-        return content, pub_date
+
+def fetch_article_content_and_date(url, content_selector):
+    try:
+        response = polite_get(url)
+        response.raise_for_status()
+        return extract_content_and_date(response.content, content_selector, url)
 
     except Exception as e:
         logger.error(f"Error fetching content for {url}: {e}")
@@ -0,0 +1,88 @@
+# app/utils/sketches.py
+import hashlib
+import numpy as np
+
+
+def item_hashes(items):
+    """
+    Returns two independent 32-bit hashes per item (as uint64 arrays), stable across processes.
+    """
+    digests = [hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest() for item in items]
+    values = np.frombuffer(b"".join(digests), dtype=np.uint64) if digests else np.zeros(0, dtype=np.uint64)
+    return values & np.uint64(0xFFFFFFFF), values >> np.uint64(32)
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch: approximate counts of any number of distinct items in a fixed depth x width
+    table. Estimates never undercount; they overcount by at most about e/width of the total with
+    high probability. Sketches with the same shape add up, so time buckets can be merged.
+    """
+
+    def __init__(self, width=2048, depth=4, table=None):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.int32) if table is None else table
+
+    def _columns(self, items):
+        # Double hashing: row i uses h1 + i * h2
+        h1, h2 = item_hashes(items)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((h1[None, :] + rows * h2[None, :]) % np.uint64(self.width)).astype(np.int64)
+
+    def add(self, items, counts=None):
+        if not items:
+            return
+        counts = np.ones(len(items), dtype=np.int32) if counts is None else np.asarray(counts, dtype=np.int32)
+        columns = self._columns(items)
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], counts)
+
+    def estimate(self, items):
+        """
+        Returns the estimated count of every item, as an int array.
+        """
+        if not items:
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(items)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0).astype(np.int64)
+
+    def merge(self, other):
+        self.table += other.table
+        return self
+
+    def to_bytes(self):
+        return self.table.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, width=2048, depth=4):
+        return cls(width, depth, np.frombuffer(data, dtype=np.int32).reshape(depth, width).copy())
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitters: keeps at most k (item, count) counters. Any item whose true count
+    exceeds total / k is guaranteed to be kept; a newcomer replaces the smallest counter and
+    inherits its count as possible overestimate (error).
+    """
+
+    def __init__(self, k=100, counters=None):
+        self.k = k
+        self.counters = counters or {}  # item -> [count, error]
+
+    def add(self, item, count=1):
+        counter = self.counters.get(item)
+        if counter is not None:
+            counter[0] += count
+        elif len(self.counters) < self.k:
+            self.counters[item] = [count, 0]
+        else:
+            smallest = min(self.counters, key=lambda key: self.counters[key][0])
+            floor = self.counters.pop(smallest)[0]
+            self.counters[item] = [floor + count, floor]
+
+    def items(self):
+        """
+        Returns the kept items, most frequent first.
+        """
+        return sorted(self.counters, key=lambda key: -self.counters[key][0])
@@ -0,0 +1,31 @@
+# app/utils/sqlite_helpers.py
+import os
+import sqlite3
+
+# Directory for local state shared by the backend, scheduler and worker containers
+DATA_DIR = os.getenv("DATA_DIR", os.path.join(os.getcwd(), "data"))
+
+
+def data_path(filename):
+    """
+    Returns the path of a file inside DATA_DIR, creating the directory if needed.
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, filename)
+
+
+def connect(path, timeout=30.0):
+    """
+    Opens a SQLite connection configured for several processes sharing one database file:
+    WAL journaling so readers never block the writer, and a busy timeout instead of immediate lock errors.
+    Transactions are managed explicitly (BEGIN IMMEDIATE / COMMIT).
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+    return conn